@@ -18,6 +18,7 @@ def get_prefix(ai):
 class IOAI():
     def __init__(self,col,row,p,**kwargs):
         command = kwargs['ai_path']
+        self.ai_path = command
         command = get_prefix(command)
         command = command + " " + str(col) + " " + str(row) + " " + str(p) + " " + " t"
         self.communicator = Communicator(command,kwargs['time'])
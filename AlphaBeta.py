@@ -0,0 +1,228 @@
+"""
+This module has the AlphaBetaSearch Class, the negamax alpha-beta engine StudentAI can use instead of MCTS.
+
+The search deepens iteratively one ply at a time until its time budget runs out, and get_move plays the best
+move of the last iteration that finished. Iterations after the first start with an aspiration window around
+the previous score and only fall back to a full window when the score lands outside it. Positions are cached
+in a TranspositionTable keyed by the board's Zobrist key, which also provides the first move to try. The key does
+not include tie_counter, so table scores are only stored and used where the search cannot reach the tie limit,
+and win/loss scores are stored as distances from the node rather than from the root.
+Capture sequences are searched to the end past the nominal depth, since captures are mandatory.
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+import time
+from TranspositionTable import TranspositionTable, EXACT, LOWER, UPPER
+
+WIN_SCORE = 100000
+MATE_BOUND = WIN_SCORE - 1000 # scores beyond this are wins or losses, WIN_SCORE minus their distance in plies
+
+
+def _to_table(value, ply):
+    """
+    Internal helper. Converts a score to the form stored in the table, wins and losses counted from the node
+    @param value: score of a node
+    @param ply: distance of the node from the root
+    @return : the value to store
+    """
+    if value >= MATE_BOUND:
+        return value + ply
+    if value <= -MATE_BOUND:
+        return value - ply
+    return value
+
+
+def _from_table(value, ply):
+    """
+    Internal helper. Converts a stored score back to one counted from the root, the inverse of _to_table
+    @param value: stored value
+    @param ply: distance of the probing node from the root
+    @return : the score of the node
+    """
+    if value >= MATE_BOUND:
+        return value - ply
+    if value <= -MATE_BOUND:
+        return value + ply
+    return value
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class AlphaBetaSearch:
+    """
+    This class describes the alpha-beta searcher
+    """
+    def __init__(self, tt_megabytes=32, aspiration_window=50, max_depth=64):
+        """
+        Intializes the searcher
+        @param tt_megabytes: memory budget of the transposition table
+        @param aspiration_window: half width of the aspiration window, in evaluation units (a man is 100)
+        @param max_depth: deepest iteration to run when time allows
+        @return :
+        """
+        self.table = TranspositionTable(tt_megabytes)
+        self.aspiration_window = aspiration_window
+        self.max_depth = max_depth
+        self.deadline = 0.0
+        self.nodes = 0
+        self.completed_depth = 0
+        self.score = 0 # score of the deepest completed iteration, for the player to move
+
+    def search(self, board, color, time_limit):
+        """
+        Searches the position until time_limit runs out
+        @param board: Board or BitBoard, it is restored before returning
+        @param color: player to move, 1 (black) or 2 (white)
+        @param time_limit: seconds the search may take
+        @return move: best move of the deepest completed iteration, None if there is no legal move
+        """
+        moves = [m for checker_moves in board.get_all_possible_moves(color) for m in checker_moves]
+        if not moves:
+            return None
+        self.table.new_search()
+        self.deadline = time.time() + time_limit
+        self.nodes = 0
+        self.completed_depth = 0
+        self.score = 0
+        best_move = moves[0]
+        if len(moves) == 1:
+            return best_move
+        score = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                if depth == 1:
+                    score, move = self._root(board, color, depth, moves, -WIN_SCORE - 1, WIN_SCORE + 1)
+                else:
+                    alpha = score - self.aspiration_window
+                    beta = score + self.aspiration_window
+                    score, move = self._root(board, color, depth, moves, alpha, beta)
+                    if score <= alpha or score >= beta:
+                        score, move = self._root(board, color, depth, moves, -WIN_SCORE - 1, WIN_SCORE + 1)
+            except SearchTimeout:
+                break
+            best_move = move
+            self.completed_depth = depth
+            self.score = score
+            if abs(score) >= WIN_SCORE - self.max_depth:
+                break  # forced win or loss found, deeper iterations cannot change it
+        return best_move
+
+    def _root(self, board, color, depth, moves, alpha, beta):
+        """
+        Internal helper for search. Searches every root move and returns the best one
+        @param board: board to search
+        @param color: player to move
+        @param depth: iteration depth
+        @param moves: legal root moves, reordered so the best move of this iteration comes first next time
+        @param alpha: lower bound of the window
+        @param beta: upper bound of the window
+        @return (score, move): score of the best move and the move itself
+        """
+        best_score = -WIN_SCORE - 1
+        best_index = 0
+        for i, move in enumerate(moves):
+            board.make_move_fast(move, color)
+            try:
+                score = -self._negamax(board, 3 - color, depth - 1, -beta, -max(alpha, best_score), 1)
+            finally:
+                board.undo()
+            if score > best_score:
+                best_score = score
+                best_index = i
+                if score >= beta:
+                    break
+        moves.insert(0, moves.pop(best_index))
+        if board.tie_counter + depth < board.tie_max:
+            self.table.store(board.zobrist, moves[0], best_score, depth,
+                             EXACT if alpha < best_score < beta else (LOWER if best_score >= beta else UPPER))
+        return best_score, moves[0]
+
+    def _negamax(self, board, color, depth, alpha, beta, ply):
+        """
+        Internal helper for search. Negamax alpha-beta with transposition table cutoffs.
+        @param board: board to search
+        @param color: player to move
+        @param depth: remaining depth, captures keep being searched when it reaches 0
+        @param alpha: lower bound of the window
+        @param beta: upper bound of the window
+        @param ply: distance from the root, used to prefer faster wins
+        @return score: score of the position for color
+        @raise SearchTimeout: when the time budget ran out
+        """
+        self.nodes += 1
+        if time.time() >= self.deadline:
+            raise SearchTimeout
+        if board.tie_counter >= board.tie_max:
+            return 0
+        moves = board.get_all_possible_moves(color)
+        if not moves:
+            return -WIN_SCORE + ply
+        first = moves[0][0].seq
+        is_capture = abs(first[0][0] - first[1][0]) == 2
+        if depth <= 0 and not is_capture:
+            return self.evaluate(board, color)
+
+        key = board.zobrist
+        entry = self.table.probe(key)
+        tt_move = None
+        if entry is not None:
+            tt_move, value, _, entry_depth, bound = entry
+            # the entry's search saw no tie, which only holds here if this node cannot reach one within its depth
+            if entry_depth >= depth and board.tie_counter + entry_depth < board.tie_max:
+                value = _from_table(value, ply)
+                if bound == EXACT:
+                    return value
+                if bound == LOWER and value > alpha:
+                    alpha = value
+                elif bound == UPPER and value < beta:
+                    beta = value
+                if alpha >= beta:
+                    return value
+
+        ordered = [m for checker_moves in moves for m in checker_moves]
+        if tt_move is not None:
+            for i, move in enumerate(ordered):
+                if move.seq == tt_move.seq:
+                    ordered.insert(0, ordered.pop(i))
+                    break
+
+        original_alpha = alpha
+        best_score = -WIN_SCORE - 1
+        best_move = None
+        for move in ordered:
+            board.make_move_fast(move, color)
+            try:
+                score = -self._negamax(board, 3 - color, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.undo()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        if best_score <= original_alpha:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        if board.tie_counter + max(depth, 0) < board.tie_max:
+            self.table.store(key, best_move, _to_table(best_score, ply), max(depth, 0), bound)
+        return best_score
+
+    def evaluate(self, board, color):
+        """
+        Static evaluation of a quiet position
+        @param board: board to evaluate
+        @param color: player the score is for
+        @return score: the board's evaluation, a man is worth Evaluation.MAN_VALUE
+        """
+        return board.evaluate(color)
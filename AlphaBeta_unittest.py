@@ -0,0 +1,87 @@
+import unittest
+from BoardClasses import Board
+from AlphaBeta import AlphaBetaSearch, WIN_SCORE
+from Perft import load_position, position_string
+from StudentAI import StudentAI
+from Move import Move
+
+
+class TestAlphaBetaSearch(unittest.TestCase):
+
+    def minimax(self, searcher, board, color, depth, ply):
+        """Plain negamax without pruning or the table, with the same capture extension and scores."""
+        if board.tie_counter >= board.tie_max:
+            return 0
+        moves = [m for checker_moves in board.get_all_possible_moves(color) for m in checker_moves]
+        if not moves:
+            return -WIN_SCORE + ply
+        if depth <= 0 and abs(moves[0].seq[0][0] - moves[0].seq[1][0]) != 2:
+            return searcher.evaluate(board, color)
+        best = -WIN_SCORE - 1
+        for move in moves:
+            board.make_move_fast(move, color)
+            best = max(best, -self.minimax(searcher, board, 3 - color, depth - 1, ply + 1))
+            board.undo()
+        return best
+
+    def test_matches_plain_minimax(self):
+        """Pruning, aspiration windows and the table must not change the score of a fixed depth search."""
+        for position, color in (("......./.....b./..b..../...w.../..w...b/...B.w./....w..", 1),
+                                (".b...W../..b...../.b.b..../w......./...b...w/w.w.w.../......../..w.w...", 2)):
+            board = Board(len(position.split("/")[0]), len(position.split("/")), 2)
+            board.initialize_game()
+            load_position(board, position)
+            searcher = AlphaBetaSearch(tt_megabytes=1, max_depth=4)
+            searcher.search(board, color, 60)
+            self.assertEqual(searcher.completed_depth, 4)
+            self.assertEqual(searcher.score, self.minimax(searcher, board, color, 4, 0))
+
+    def test_table_respects_the_tie_limit(self):
+        """Scores cached far from the tie limit must not be reused when the tie is within reach."""
+        board = Board(8, 8, 2)
+        board.initialize_game()
+        load_position(board, "/".join([".B......"] + ["........"] * 2 + ["...b...."] + ["........"] * 3 + ["......w."]))
+        searcher = AlphaBetaSearch(tt_megabytes=1, max_depth=4)
+        searcher.search(board, 1, 60)
+        self.assertGreater(searcher.score, 0)
+        board.tie_counter = board.tie_max - 4
+        searcher.search(board, 1, 60)
+        self.assertEqual(searcher.score, self.minimax(searcher, board, 1, 4, 0))
+        self.assertEqual(searcher.score, 0)
+
+    def test_win_distance_survives_the_table(self):
+        """A win found by an earlier search keeps its distance from the new root."""
+        board = Board(8, 8, 2)
+        board.initialize_game()
+        load_position(board, "/".join([".B......"] + ["........"] * 2 + ["....w..."] + ["........"] * 4))
+        searcher = AlphaBetaSearch(tt_megabytes=1, max_depth=20)
+        board.make_move(searcher.search(board, 1, 60), 1)
+        board.make_move(searcher.search(board, 2, 60), 2)
+        searcher.search(board, 1, 60)
+        fresh = AlphaBetaSearch(tt_megabytes=1, max_depth=20)
+        fresh.search(board, 1, 60)
+        self.assertGreaterEqual(fresh.score, WIN_SCORE - 20)
+        self.assertEqual(searcher.score, fresh.score)
+
+    def test_board_restored_after_timeout(self):
+        board = Board(8, 8, 3)
+        board.initialize_game()
+        before = position_string(board), board.zobrist, board.tie_counter
+        searcher = AlphaBetaSearch(tt_megabytes=1)
+        move = searcher.search(board, 1, 0.2)
+        self.assertEqual((position_string(board), board.zobrist, board.tie_counter), before)
+        legal = [m.seq for moves in board.get_all_possible_moves(1) for m in moves]
+        self.assertIn(move.seq, legal)
+        self.assertGreaterEqual(searcher.completed_depth, 1)
+
+    def test_student_ai_engine_flag(self):
+        ai = StudentAI(8, 8, 2, engine="alphabeta")
+        ai.simulation_time = 0.2
+        move = ai.get_move(Move([]))
+        self.assertEqual(ai.board.board[move.seq[-1][0]][move.seq[-1][1]].color, "B")
+        with self.assertRaises(ValueError):
+            StudentAI(8, 8, 2, engine="minimax")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+"""
+This module has the BatchRollout Class, which plays many rollouts from the same position at once with NumPy.
+
+Every game is one row of a small int array with one cell per square (plus an always blocked cell that stands
+for "off the board"), and every ply is played for all unfinished games together: the legal steps and jumps of
+every piece in every game are found with a few array lookups through the step/jump tables of Geometry, one
+(square, direction) is picked per game, and all the picks are applied with fancy indexing. Finished games are
+dropped from the arrays, so the work per ply shrinks as games end.
+
+Capture sequences are played one jump per ply: after a jump the same piece has to keep jumping while it can,
+and the turn only passes once it cannot, which gives the same positions as the multi-jump moves of
+get_all_possible_moves. Captures are mandatory, a man that gets promoted stops, and tie_counter works as in
+BoardClasses.Board.
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+import numpy as np
+from BitBoard import BitBoard, iter_squares
+from Geometry import get_geometry, MAN_DIRECTIONS, KING_DIRECTIONS
+import Evaluation
+
+# cell codes, code - 1 is the Zobrist/Evaluation piece kind
+EMPTY = 0
+BLACK_MAN = 1
+WHITE_MAN = 2
+BLACK_KING = 3
+WHITE_KING = 4
+WALL = 5
+
+
+class BatchRollout:
+    """
+    This class describes the batched rollout engine of one board size
+    """
+    def __init__(self, col, row, greedy=0.0):
+        """
+        Builds the NumPy lookup tables
+        @param col: number of columns in the board
+        @param row: number of rows in the board
+        @param greedy: 0 picks uniformly among the legal moves, larger values weight the pick towards the moves
+                       that gain the most evaluation (1 makes a man's worth of gain outweigh the random part)
+        @return :
+        """
+        self.col = col
+        self.row = row
+        self.greedy = greedy
+        size = col * row
+        self.size = size
+        geometry = get_geometry(col, row)
+        # off-board neighbours point at the WALL cell, index size
+        self.step_to = np.array([[size if t < 0 else t for t in steps] for steps in geometry.step], dtype=np.intp)
+        self.jump_over = np.array([[size if j is None else j[0] for j in jumps] for jumps in geometry.jump],
+                                  dtype=np.intp)
+        self.jump_land = np.array([[size if j is None else j[1] for j in jumps] for jumps in geometry.jump],
+                                  dtype=np.intp)
+        self.square_row = np.array([r for r, _ in geometry.coords] + [-1], dtype=np.intp)
+        # directions each cell code may move in
+        self.dir_ok = np.zeros((6, 4), dtype=bool)
+        for code, dirs in ((BLACK_MAN, MAN_DIRECTIONS["B"]), (WHITE_MAN, MAN_DIRECTIONS["W"]),
+                           (BLACK_KING, KING_DIRECTIONS["B"]), (WHITE_KING, KING_DIRECTIONS["W"])):
+            self.dir_ok[code, list(dirs)] = True
+        # evaluation of a cell code on a square, black's point of view, zero for empty cells and the wall
+        values = Evaluation.get_table(col, row).piece
+        self.values = np.zeros((size + 1, 6))
+        for sq, (r, c) in enumerate(geometry.coords):
+            self.values[sq, 1:5] = values[r][c]
+
+    def encode(self, board):
+        """
+        Returns the cells of a board
+        @param board: Board or BitBoard
+        @return cells: int8 array of size + 1 cell codes
+        """
+        cells = np.zeros(self.size + 1, dtype=np.int8)
+        cells[self.size] = WALL
+        if isinstance(board, BitBoard):
+            for sq in iter_squares(board.black):
+                cells[sq] = BLACK_MAN
+            for sq in iter_squares(board.white):
+                cells[sq] = WHITE_MAN
+            for sq in iter_squares(board.kings):
+                cells[sq] += 2
+        else:
+            for r in range(self.row):
+                for c in range(self.col):
+                    checker = board.board[r][c]
+                    if checker.color != ".":
+                        cells[r * self.col + c] = (BLACK_MAN if checker.color == "B" else WHITE_MAN) + 2 * checker.is_king
+        return cells
+
+    def play(self, board, player, games, max_plies=1000, rng=None):
+        """
+        Plays games rollouts from a position
+        @param board: Board or BitBoard, left untouched
+        @param player: player to move, 1 (black) or 2 (white)
+        @param games: number of rollouts
+        @param max_plies: jumps and steps a rollout may play before it is counted as a draw
+        @param rng: numpy Generator, a new unseeded one when None
+        @return winners: int array of games results, 1 or 2 for a win, 0 for a draw
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        cells = np.tile(self.encode(board), (games, 1))
+        turn = np.full(games, player, dtype=np.int8)
+        tie = np.full(games, board.tie_counter, dtype=np.intp)
+        chain = np.full(games, -1, dtype=np.intp)  # square of the piece in the middle of a capture, or -1
+        alive = np.arange(games)  # index in winners of every row still being played
+        winners = np.zeros(games, dtype=np.int8)
+        squares = np.arange(self.size)
+
+        for _ in range(max_plies):
+            if not len(alive):
+                break
+            # tie_counter only reaches tie_max between moves, never in the middle of a capture
+            tied = tie >= board.tie_max
+            if tied.any():
+                keep = ~tied
+                cells, turn, tie, chain, alive = cells[keep], turn[keep], tie[keep], chain[keep], alive[keep]
+                if not len(alive):
+                    break
+            pieces = cells[:, :self.size]
+            own = (pieces == turn[:, None]) | (pieces == turn[:, None] + 2)
+            enemy = 3 - turn[:, None]
+            enemy_cells = (cells == enemy) | (cells == enemy + 2)
+            empty_cells = cells == EMPTY
+            allowed = own[:, :, None] & self.dir_ok[pieces]
+            jumps = allowed & enemy_cells[:, self.jump_over] & empty_cells[:, self.jump_land]
+            in_chain = chain >= 0
+            if in_chain.any():
+                jumps &= ((chain[:, None] < 0) | (squares[None, :] == chain[:, None]))[:, :, None]
+            has_jump = jumps.any(axis=(1, 2))
+            candidates = jumps | (allowed & empty_cells[:, self.step_to] & ~has_jump[:, None, None])
+            has_move = candidates.any(axis=(1, 2))
+
+            if not has_move.all():
+                # the player to move is stuck and loses
+                stuck = ~has_move
+                winners[alive[stuck]] = 3 - turn[stuck]
+                keep = has_move
+                cells, turn, tie, chain, alive = cells[keep], turn[keep], tie[keep], chain[keep], alive[keep]
+                pieces, candidates, has_jump = pieces[keep], candidates[keep], has_jump[keep]
+                if not len(alive):
+                    break
+
+            scores = rng.random(candidates.shape)
+            if self.greedy:
+                scores += self.greedy * self._gains(cells, pieces, turn, has_jump) / Evaluation.MAN_VALUE
+            scores[~candidates] = -np.inf
+            pick = scores.reshape(len(alive), -1).argmax(axis=1)
+            src = pick // 4
+            d = pick % 4
+            rows = np.arange(len(alive))
+
+            dst = np.where(has_jump, self.jump_land[src, d], self.step_to[src, d])
+            code = cells[rows, src]
+            cells[rows, src] = EMPTY
+            cells[rows[has_jump], self.jump_over[src[has_jump], d[has_jump]]] = EMPTY
+            promoted = (code <= WHITE_MAN) & (self.square_row[dst] == np.where(turn == 1, self.row - 1, 0))
+            code = code + 2 * promoted
+            cells[rows, dst] = code
+
+            # a jump that did not promote goes on while the piece can take again
+            chain[:] = -1
+            going_on = has_jump & ~promoted
+            if going_on.any():
+                idx = rows[going_on]
+                at = dst[going_on]
+                their = 3 - turn[idx, None]
+                over = cells[idx[:, None], self.jump_over[at]]
+                land = cells[idx[:, None], self.jump_land[at]]
+                more = (self.dir_ok[code[going_on]] & ((over == their) | (over == their + 2)) & (land == EMPTY)).any(axis=1)
+                chain[idx[more]] = at[more]
+            # tie_counter goes up with every move and back to 0 on any capture
+            tie = np.where(has_jump, 0, tie + 1)
+            turn = np.where(chain >= 0, turn, 3 - turn).astype(np.int8)
+        return winners
+
+    def _gains(self, cells, pieces, turn, has_jump):
+        """
+        Internal helper for play. Evaluation gain of every (square, direction) for the player to move.
+        @param cells: cell codes of the games
+        @param pieces: the cells without the wall
+        @param turn: player to move in every game
+        @param has_jump: if the player to move has to capture in every game
+        @return gains: float array shaped like the candidates
+        """
+        dest = np.where(has_jump[:, None, None], self.jump_land, self.step_to)
+        code = pieces[:, :, None].astype(np.intp)
+        promote = (code >= BLACK_MAN) & (code <= WHITE_MAN) & \
+            (self.square_row[dest] == np.where(turn == 1, self.row - 1, 0)[:, None, None])
+        gain = self.values[dest, code + 2 * promote] - self.values[np.arange(self.size)[:, None], code]
+        over = np.where(has_jump[:, None, None], self.jump_over, self.size)
+        gain -= self.values[over, cells[np.arange(len(cells))[:, None, None], over]]
+        return np.where(turn == 1, 1.0, -1.0)[:, None, None] * gain
@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+from BoardClasses import Board
+from BitBoard import BitBoard
+from BatchRollout import BatchRollout
+from Perft import load_position, position_string
+
+
+def position(rows):
+    board = BitBoard(8, 8, 2)
+    board.initialize_game()
+    load_position(board, "/".join(rows))
+    return board
+
+
+class TestBatchRollout(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = BatchRollout(8, 8)
+        self.rng = np.random.default_rng(0)
+
+    def test_stuck_player_loses(self):
+        board = position(["W......."] + ["........"] * 6 + ["b......."])
+        winners = self.engine.play(board, 1, 16, rng=self.rng)
+        self.assertTrue((winners == 2).all())
+
+    def test_capture_is_forced(self):
+        """Ensure black has to take the last white piece instead of stepping away."""
+        board = position(["........", ".b......", "..w....."] + ["........"] * 5)
+        winners = self.engine.play(board, 1, 16, rng=self.rng)
+        self.assertTrue((winners == 1).all())
+
+    def test_tie_counter_draws(self):
+        board = position(["B......."] + ["........"] * 6 + [".......W"])
+        board.tie_counter = board.tie_max - 1
+        winners = self.engine.play(board, 1, 16, rng=self.rng)
+        self.assertTrue((winners == 0).all())
+
+    def test_board_and_bitboard_encode_alike(self):
+        board = Board(8, 8, 3)
+        board.initialize_game()
+        bitboard = BitBoard(8, 8, 3)
+        bitboard.initialize_game()
+        for move, turn in (("(2,1)-(3,2)", 1), ("(5,2)-(4,3)", 2)):
+            chosen = [m for moves in board.get_all_possible_moves(turn) for m in moves if str(m) == move][0]
+            board.make_move(chosen, turn)
+            bitboard.make_move(chosen, turn)
+        self.assertEqual(position_string(board), position_string(bitboard))
+        self.assertTrue(np.array_equal(self.engine.encode(board), self.engine.encode(bitboard)))
+
+    def test_greedy_rollouts_finish(self):
+        board = Board(8, 8, 3)
+        board.initialize_game()
+        engine = BatchRollout(8, 8, greedy=1.0)
+        winners = engine.play(board, 1, 32, rng=self.rng)
+        self.assertEqual(len(winners), 32)
+        self.assertTrue(np.isin(winners, (0, 1, 2)).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
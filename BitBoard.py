@@ -0,0 +1,596 @@
+"""
+This module has the BitBoard Class which is a bitboard-backed drop-in replacement for BoardClasses.Board.
+
+Squares are numbered row-major (square = row * col + column). The position is packed into three integer
+bitmasks: black pieces, white pieces and kings. Move detection is done for every piece at once by shifting
+and masking those integers, and only the pieces that can actually move are expanded into Move objects.
+The public API (make_move, undo, get_all_possible_moves, is_win, show_board, ...) and the order of the
+returned moves are the same as BoardClasses.Board, so the two can be swapped with a constructor flag.
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+import copy
+from BoardClasses import InvalidMoveError, InvalidParameterError
+from Move import Move
+import Checker
+import Zobrist
+import Geometry
+from Geometry import MAN_DIRECTIONS, KING_DIRECTIONS
+import Evaluation
+
+def _back(mask, shift):
+    """
+    Maps every set bit of mask to the square it would be reached from by moving shift squares.
+    @param mask: bitmask of target squares
+    @param shift: signed square offset of the direction
+    @return : bitmask of source squares
+    """
+    return mask >> shift if shift > 0 else mask << -shift
+
+
+def iter_squares(mask):
+    """
+    Yields the set squares of a bitmask in ascending (row-major) order.
+    @param mask: bitmask to iterate
+    @return : generator of square indexes
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitBoard:
+    """
+    This class describes a bitboard-backed Board
+    """
+    opponent = {"W": "B", "B": "W"}
+
+    def __init__(self, col, row, p):
+        """
+        Intializes an empty bitboard. See BoardClasses.Board for the meaning of the variables.
+        @param col: number of columns in the board
+        @param row: number of rows in the board
+        @param p: number of rows to be filled with checker pieces at the start
+        @return :
+        @raise :
+        """
+        self.tie_counter = 0
+        self.tie_max = 40
+        self.row = row
+        self.col = col
+        self.p = p
+        self.black = 0
+        self.white = 0
+        self.kings = 0
+        self.saved_move = []
+        self.black_count = 0
+        self.white_count = 0
+        self.geometry = Geometry.get_geometry(col, row)
+        self.zobrist_keys = Zobrist.get_keys(col, row)
+        self.zobrist_pieces = 0
+        self.side_to_move = "B"
+        self.zobrist_tie_bucket = None
+        self.eval_table = Evaluation.get_table(col, row)
+        self.eval_score = 0
+
+    def __deepcopy__(self, memo):
+        # the bitmasks and saved tuples are immutable and the geometry tables are shared, so a shallow copy with its
+        # own undo list is a full copy
+        new = copy.copy(self)
+        new.saved_move = list(self.saved_move)
+        return new
+
+    def initialize_game(self):
+        """
+        Intializes game. Places the pieces exactly where BoardClasses.Board.initialize_game does.
+        @param :
+        @return :
+        @raise InvalidParameterError: raised by check_initial_variable
+        """
+        self.check_initial_variable()
+        col = self.col
+        for i in reversed(range(self.p)):
+            for j in range((self.p - i - 1) % 2, self.col, 2):
+                i_white = self.row - self.p + i
+                self.white |= 1 << (i_white * col + j)
+                if (self.row % 2 + self.p % 2) % 2:
+                    if i % 2:
+                        if j - 1 >= 0:
+                            self.black |= 1 << (i * col + j - 1)
+                        if j == self.col - 2 and not self.col % 2:
+                            self.black |= 1 << (i * col + self.col - 1)
+                    else:
+                        if j + 1 <= self.col - 1:
+                            self.black |= 1 << (i * col + j + 1)
+                        if (j == self.col - 1 or j == self.col - 2) and not self.p % 2:
+                            self.black |= 1 << (i * col)
+                else:
+                    self.black |= 1 << (i * col + j)
+                self.white_count += 1
+                self.black_count += 1
+        self.compute_zobrist()
+        self.compute_evaluation()
+
+    def compute_zobrist(self):
+        """
+        Computes the piece part of the Zobrist key from scratch, see BoardClasses.Board.compute_zobrist
+        @return zobrist_pieces: the new piece key
+        """
+        key = 0
+        coords = self.geometry.coords
+        for sq in iter_squares(self.black | self.white):
+            r, c = coords[sq]
+            key ^= self.zobrist_keys.piece[r][c][self._kind(sq)]
+        self.zobrist_pieces = key
+        return key
+
+    def compute_evaluation(self):
+        """
+        Computes eval_score from scratch, see BoardClasses.Board.compute_evaluation
+        @return eval_score: the new score
+        """
+        score = 0
+        coords = self.geometry.coords
+        for sq in iter_squares(self.black | self.white):
+            r, c = coords[sq]
+            score += self.eval_table.piece[r][c][self._kind(sq)]
+        self.eval_score = score
+        return score
+
+    def evaluate(self, color):
+        """
+        Evaluates the position, see BoardClasses.Board.evaluate
+        @param color: player the score is for, 1/2 or 'B'/'W'
+        @return score: an int, positive when color is ahead
+        """
+        return self.eval_score if color == 1 or color == "B" else -self.eval_score
+
+    def evaluate_move(self, move, color):
+        """
+        Returns how much a legal move changes evaluate(color) without making it, see
+        BoardClasses.Board.evaluate_move
+        @param move: a legal Move object
+        @param color: player making the move, 1/2 or 'B'/'W'
+        @return delta: an int
+        """
+        move_list = move.seq
+        start = move_list[0]
+        end = move_list[-1]
+        values = self.eval_table.piece
+        col = self.col
+        kind = self._kind(start[0] * col + start[1])
+        end_kind = kind
+        if kind < 2 and end[0] == (0 if kind else self.row - 1):
+            end_kind += 2
+        delta = values[end[0]][end[1]][end_kind] - values[start[0]][start[1]][kind]
+        if abs(start[0] - move_list[1][0]) == 2:
+            for t in range(len(move_list) - 1):
+                r = (move_list[t][0] + move_list[t + 1][0]) // 2
+                c = (move_list[t][1] + move_list[t + 1][1]) // 2
+                delta -= values[r][c][self._kind(r * col + c)]
+        return delta if color == 1 or color == "B" else -delta
+
+    @property
+    def zobrist(self):
+        """
+        64-bit Zobrist key of the position, see BoardClasses.Board.zobrist
+        @return key: an int
+        """
+        key = self.zobrist_pieces
+        if self.side_to_move == "W":
+            key ^= self.zobrist_keys.white_to_move
+        if self.zobrist_tie_bucket:
+            key ^= self.zobrist_keys.tie[min(self.tie_counter // self.zobrist_tie_bucket, Zobrist.TIE_BUCKETS - 1)]
+        return key
+
+    def _kind(self, sq):
+        """
+        Returns the Zobrist/Evaluation piece kind of an occupied square
+        @param sq: square index
+        @return : piece kind index
+        """
+        return bool(self.white >> sq & 1) + 2 * (self.kings >> sq & 1)
+
+    def _update_incremental(self, black, white, kings):
+        """
+        Internal helper for make_move. Updates the piece key and eval_score for the squares that changed since
+        the given masks.
+        @param black: black mask before the move
+        @param white: white mask before the move
+        @param kings: kings mask before the move
+        """
+        keys = self.zobrist_keys.piece
+        values = self.eval_table.piece
+        coords = self.geometry.coords
+        key = self.zobrist_pieces
+        score = self.eval_score
+        for sq in iter_squares((black ^ self.black) | (white ^ self.white) | (kings ^ self.kings)):
+            r, c = coords[sq]
+            if (black | white) >> sq & 1:
+                kind = bool(white >> sq & 1) + 2 * (kings >> sq & 1)
+                key ^= keys[r][c][kind]
+                score -= values[r][c][kind]
+            if (self.black | self.white) >> sq & 1:
+                kind = self._kind(sq)
+                key ^= keys[r][c][kind]
+                score += values[r][c][kind]
+        self.zobrist_pieces = key
+        self.eval_score = score
+
+    def check_initial_variable(self):
+        """
+        Checks the integrity of the initial board variables provided (M,N,P,Q)
+        @param :
+        @return :
+        @raise InvalidParameterError: raises this exception if there is a problem with the provided variables
+        """
+        if self.row - 2 * self.p <= 0:
+            raise InvalidParameterError("Q <= 0")
+        elif self.col * self.p % 2 != 0:
+            raise InvalidParameterError("N*P is odd -- must be even")
+
+    def color_at(self, row, col):
+        """
+        Returns the color of the piece on a square
+        @param row: row of the square
+        @param col: col of the square
+        @return : 'B', 'W' or '.'
+        """
+        bit = 1 << (row * self.col + col)
+        if self.black & bit:
+            return "B"
+        if self.white & bit:
+            return "W"
+        return "."
+
+    def is_king_at(self, row, col):
+        """
+        Returns if the piece on a square is a king
+        @param row: row of the square
+        @param col: col of the square
+        @return : a bool
+        """
+        return bool(self.kings >> (row * self.col + col) & 1)
+
+    @property
+    def board(self):
+        """
+        Builds a grid of Checker objects equivalent to BoardClasses.Board.board. This is only here so code
+        written against the list of lists keeps working; it is rebuilt on every access and should be kept out
+        of hot loops.
+        @return grid: list of lists of Checker objects
+        """
+        grid = []
+        for r in range(self.row):
+            grid.append([])
+            for c in range(self.col):
+                checker = Checker.Checker(self.color_at(r, c), [r, c])
+                checker.is_king = self.is_king_at(r, c)
+                grid[r].append(checker)
+        return grid
+
+    def is_in_board(self, pos_x, pos_y):
+        """
+        Checks if the coordinate provided is in board. Is an internal function
+        @param pos_x: x coordinte of the object to check for
+        @param pos_y: y coordinte of the object to check for
+        @return: a bool to describe if object is in the board or not
+        """
+        return 0 <= pos_x < self.row and 0 <= pos_y < self.col
+
+    def is_valid_move(self, chess_row, chess_col, target_row, target_col, turn):
+        """
+        checks if a proposed single step or single jump is valid or not. Same rules as BoardClasses.Board.
+        @param chess_row: row of the object whose move we are checking
+        @param chess_col: col of the object whose move we are checking
+        @param target_row: row where the object would end up
+        @param target_col: col where the object would end up
+        @param turn: 'B' or 'W'
+        @return: a bool which is True if valid, False otherwise
+        """
+        if not self.is_in_board(target_row, target_col) or not self.is_in_board(chess_row, chess_col):
+            return False
+        col = self.col
+        src = chess_row * col + chess_col
+        dst = target_row * col + target_col
+        occupied = self.black | self.white
+        if occupied >> dst & 1:
+            return False
+        own = self.black if turn == "B" else self.white
+        if not own >> src & 1:
+            return False
+        diff_row = target_row - chess_row
+        diff_col = target_col - chess_col
+        if abs(diff_row) != abs(diff_col) or abs(diff_row) not in (1, 2):
+            return False
+        if not self.kings >> src & 1 and (diff_row > 0) != (turn == "B"):
+            return False
+        if abs(diff_row) == 2:
+            over = (chess_row + diff_row // 2) * col + chess_col + diff_col // 2
+            opp = self.white if turn == "B" else self.black
+            return bool(opp >> over & 1)
+        return True
+
+    def make_move(self, move, turn):
+        """
+        Makes Move on the board
+        @param move: Move object provided by the StudentAI, Uses this parameter to make the move on the board
+        @param turn: this parameter tracks the current turn. either player 1 (black) or player 2 (white)
+        @return:
+        @raise InvalidMoveError: raises this objection if the move provided isn't valid on the current board
+        """
+        if type(turn) is int:
+            if turn == 1:
+                turn = 'B'
+            elif turn == 2:
+                turn = 'W'
+            else:
+                raise InvalidMoveError
+        move_list = move.seq
+        if len(move_list) < 2:
+            raise InvalidMoveError
+        saved = (self.black, self.white, self.kings, self.tie_counter, self.black_count, self.white_count,
+                 self.zobrist_pieces, self.side_to_move, self.eval_score)
+        col = self.col
+        start_sq = move_list[0][0] * col + move_list[0][1]
+        is_start_checker_king = bool(self.kings >> start_sq & 1)
+        promotion_row = self.row - 1 if turn == 'B' else 0
+        self.tie_counter += 1
+        for t in range(len(move_list) - 1):
+            start = move_list[t]
+            target = move_list[t + 1]
+            if not self.is_valid_move(start[0], start[1], target[0], target[1], turn):
+                (self.black, self.white, self.kings, self.tie_counter, self.black_count, self.white_count,
+                 self.zobrist_pieces, self.side_to_move, self.eval_score) = saved
+                raise InvalidMoveError
+            src = 1 << (start[0] * col + start[1])
+            dst = 1 << (target[0] * col + target[1])
+            if self.kings & src:
+                self.kings ^= src | dst
+            if turn == 'B':
+                self.black ^= src | dst
+            else:
+                self.white ^= src | dst
+            if abs(start[0] - target[0]) == 2:
+                # capture happened
+                self.tie_counter = 0
+                over = ~(1 << ((start[0] + target[0]) // 2 * col + (start[1] + target[1]) // 2))
+                self.kings &= over
+                if turn == 'B':
+                    self.white &= over
+                    self.white_count -= 1
+                else:
+                    self.black &= over
+                    self.black_count -= 1
+            if target[0] == promotion_row:
+                self.kings |= dst
+                if not is_start_checker_king:
+                    break
+        self._update_incremental(saved[0], saved[1], saved[2])
+        self.side_to_move = self.opponent[turn]
+        self.saved_move.append(saved)
+
+    def make_move_fast(self, move, turn):
+        """
+        Makes a Move that is known to be legal, e.g. one returned by get_all_possible_moves, without validating
+        its steps. The move is undone with undo like any other move.
+        @param move: a legal Move object
+        @param turn: player making the move, 1/2 or 'B'/'W'
+        @return:
+        """
+        move_list = move.seq
+        col = self.col
+        saved = (self.black, self.white, self.kings, self.tie_counter, self.black_count, self.white_count,
+                 self.zobrist_pieces, self.side_to_move, self.eval_score)
+        self.saved_move.append(saved)
+        start, end = move_list[0], move_list[-1]
+        src = 1 << (start[0] * col + start[1])
+        dst = 1 << (end[0] * col + end[1])
+        self.tie_counter += 1
+        if abs(start[0] - move_list[1][0]) == 2:
+            self.tie_counter = 0
+            captured = 0
+            for t in range(len(move_list) - 1):
+                a, b = move_list[t], move_list[t + 1]
+                captured |= 1 << ((a[0] + b[0]) // 2 * col + (a[1] + b[1]) // 2)
+            self.kings &= ~captured
+            if turn == 1 or turn == 'B':
+                self.white &= ~captured
+                self.white_count -= len(move_list) - 1
+            else:
+                self.black &= ~captured
+                self.black_count -= len(move_list) - 1
+        is_king = self.kings & src
+        self.kings &= ~src
+        if turn == 1 or turn == 'B':
+            self.black = (self.black & ~src) | dst
+            promoted = end[0] == self.row - 1
+            self.side_to_move = "W"
+        else:
+            self.white = (self.white & ~src) | dst
+            promoted = end[0] == 0
+            self.side_to_move = "B"
+        if is_king or promoted:
+            self.kings |= dst
+        self._update_incremental(saved[0], saved[1], saved[2])
+
+    def undo(self):
+        """
+        Undoes the last move made with make_move or make_move_fast
+        @return :
+        @raise Exception: if there is no move to undo
+        """
+        if not self.saved_move:
+            raise Exception("Cannot undo operation")
+        (self.black, self.white, self.kings, self.tie_counter, self.black_count, self.white_count,
+         self.zobrist_pieces, self.side_to_move, self.eval_score) = self.saved_move.pop()
+
+    def get_all_possible_moves(self, color):
+        """
+        this function returns the all possible moves of the player whose turn it is
+        @param color: color of the player whose turn it is
+        @return result: a list of lists of Move objects, one list per movable piece in row-major order
+        @raise :
+        """
+        if type(color) is int:
+            if color == 1:
+                color = 'B'
+            elif color == 2:
+                color = 'W'
+        geometry = self.geometry
+        if color == 'B':
+            own, opp = self.black, self.white
+        else:
+            own, opp = self.white, self.black
+        empty = geometry.full & ~(own | opp)
+        own_kings = own & self.kings
+        forward = MAN_DIRECTIONS[color]
+        shift = geometry.shift
+        jump_src = geometry.jump_src
+        capturers = 0
+        for d in range(4):
+            pieces = own if d in forward else own_kings
+            capturers |= pieces & jump_src[d] & _back(opp, shift[d]) & _back(empty, 2 * shift[d])
+        coords = geometry.coords
+        result = []
+        if capturers:
+            for sq in iter_squares(capturers):
+                dirs = KING_DIRECTIONS[color] if own_kings >> sq & 1 else forward
+                moves = []
+                self._jump_paths(sq, dirs, opp, empty | (1 << sq), moves)
+                result.append(moves)
+            return result
+        step_src = geometry.step_src
+        movers = 0
+        for d in range(4):
+            pieces = own if d in forward else own_kings
+            movers |= pieces & step_src[d] & _back(empty, shift[d])
+        step = geometry.step
+        for sq in iter_squares(movers):
+            dirs = KING_DIRECTIONS[color] if own_kings >> sq & 1 else forward
+            origin = coords[sq]
+            steps = step[sq]
+            moves = []
+            for d in dirs:
+                target = steps[d]
+                if target >= 0 and empty >> target & 1:
+                    moves.append(Move([origin, coords[target]]))
+            result.append(moves)
+        return result
+
+    def _jump_paths(self, origin, dirs, opp, empty, out):
+        """
+        Internal helper for get_all_possible_moves. Collects every maximal capture sequence from a square in the
+        order Checker.capture_paths finds them: captured pieces are removed as soon as they are jumped. Uses an
+        explicit stack of (square, captured mask, path) states instead of recursion.
+        @param origin: square the moving piece starts from
+        @param dirs: direction indexes the piece may jump in
+        @param opp: bitmask of opponent pieces
+        @param empty: bitmask of empty squares, including the origin
+        @param out: list the finished Move objects are appended to
+        """
+        jump = self.geometry.jump
+        coords = self.geometry.coords
+        stack = [(origin, 0, (coords[origin],))]
+        while stack:
+            sq, captured, path = stack.pop()
+            children = []
+            for d in dirs:
+                pair = jump[sq][d]
+                if pair is not None and (opp & ~captured) >> pair[0] & 1 and (empty | captured) >> pair[1] & 1:
+                    children.append((pair[1], captured | 1 << pair[0], path + (coords[pair[1]],)))
+            if children:
+                stack.extend(reversed(children))
+            elif len(path) > 1:
+                out.append(Move(list(path)))
+
+    def is_win(self, turn):
+        """
+        this function tracks if any player has won. Same result as BoardClasses.Board.is_win
+        @param turn: the player who just moved, 1/2 or 'B'/'W'
+        @return : 1 or 2 for the winner, -1 for a tie, 0 if the game goes on
+        @raise :
+        """
+        return self.game_state(turn)[0]
+
+    def game_state(self, turn):
+        """
+        this function returns the result of is_win together with the moves of the player to move, see
+        BoardClasses.Board.game_state
+        @param turn: the player who just moved, 1/2 or 'B'/'W'
+        @return result, moves: result as is_win returns it, and get_all_possible_moves of the player to move
+                               ([] for a tie)
+        @raise :
+        """
+        if turn == "W":
+            turn = 2
+        elif turn == "B":
+            turn = 1
+        if self.tie_counter >= self.tie_max:
+            return -1, []
+        moves = self.get_all_possible_moves(3 - turn)
+        if not moves:
+            if turn == 2:
+                return 2, moves
+            # white is stuck, but it only loses if black can still move
+            if self.has_any_move(1):
+                return 1, moves
+        if not self.white:
+            return 2, moves
+        elif not self.black:
+            return 1, moves
+        return 0, moves
+
+    def has_any_move(self, color):
+        """
+        this function tells if a player has at least one legal move, from the same masks as get_all_possible_moves
+        @param color: color of the player, 1/2 or 'B'/'W'
+        @return : True if get_all_possible_moves(color) would not be empty
+        @raise :
+        """
+        if type(color) is int:
+            if color == 1:
+                color = 'B'
+            elif color == 2:
+                color = 'W'
+        geometry = self.geometry
+        if color == 'B':
+            own, opp = self.black, self.white
+        else:
+            own, opp = self.white, self.black
+        empty = geometry.full & ~(own | opp)
+        own_kings = own & self.kings
+        forward = MAN_DIRECTIONS[color]
+        shift = geometry.shift
+        for d in range(4):
+            pieces = own if d in forward else own_kings
+            if pieces & geometry.step_src[d] & _back(empty, shift[d]):
+                return True
+            if pieces & geometry.jump_src[d] & _back(opp, shift[d]) & _back(empty, 2 * shift[d]):
+                return True
+        return False
+
+    def show_board(self, fh=None):
+        """
+        prints board to console or to file, in the same format as BoardClasses.Board.show_board
+        @param fh: file object, incase we need to print to file
+        @return :
+        @raise :
+        """
+        print("   ", end="", file=fh)
+        print(*range(0, self.col), sep="  ", file=fh)
+        for i in range(self.row):
+            print(i, end="", file=fh)
+            for j in range(self.col):
+                color = self.color_at(i, j)
+                if self.is_king_at(i, j):
+                    print("%3s" % color.upper(), end="", file=fh)
+                else:
+                    print("%3s" % color.lower(), end="", file=fh)
+            print(file=fh)
+        print('----------------------', file=fh)
@@ -0,0 +1,80 @@
+import random
+import unittest
+from BoardClasses import Board, InvalidMoveError
+from BitBoard import BitBoard
+from Move import Move
+
+
+def move_strings(moves):
+    return [[str(m) for m in sublist] for sublist in moves]
+
+
+def grid(board):
+    return [[(piece.color, piece.is_king) for piece in row] for row in board.board]
+
+
+class TestBitBoardMatchesBoard(unittest.TestCase):
+
+    def play_random_games(self, col, row, p, games=10, plies=150):
+        """Plays random games on both engines and checks they agree after every ply."""
+        for seed in range(games):
+            rng = random.Random(seed)
+            board = Board(col, row, p)
+            bitboard = BitBoard(col, row, p)
+            board.initialize_game()
+            bitboard.initialize_game()
+            turn = 1
+            for _ in range(plies):
+                moves = board.get_all_possible_moves(turn)
+                self.assertEqual(move_strings(moves), move_strings(bitboard.get_all_possible_moves(turn)))
+                self.assertEqual(grid(board), grid(bitboard))
+                self.assertEqual((board.black_count, board.white_count),
+                                 (bitboard.black_count, bitboard.white_count))
+                if not moves:
+                    break
+                move = rng.choice(rng.choice(moves))
+                self.assertEqual(board.evaluate_move(move, turn), bitboard.evaluate_move(move, turn))
+                board.make_move(move, turn)
+                bitboard.make_move(move, turn)
+                self.assertEqual(board.is_win(turn), bitboard.is_win(turn))
+                for color in (1, 2):
+                    self.assertEqual(board.has_any_move(color), bitboard.has_any_move(color))
+                self.assertEqual(board.eval_score, bitboard.eval_score)
+                turn = 3 - turn
+
+    def test_7x7_2(self):
+        self.play_random_games(7, 7, 2)
+
+    def test_8x8_3(self):
+        self.play_random_games(8, 8, 3)
+
+    def test_10x10_3(self):
+        self.play_random_games(10, 10, 3, games=5)
+
+    def test_undo_restores_position(self):
+        """Ensure undo brings back the exact position after a capture."""
+        bitboard = BitBoard(8, 8, 2)
+        bitboard.initialize_game()
+        before = grid(bitboard)
+        for move, turn in ((Move([(1, 2), (2, 3)]), 1), (Move([(6, 5), (5, 4)]), 2),
+                           (Move([(2, 3), (3, 4)]), 1), (Move([(5, 4), (4, 3)]), 2),
+                           (Move([(3, 4), (5, 2)]), 1)):
+            bitboard.make_move(move, turn)
+        self.assertEqual(bitboard.white_count, 7)
+        self.assertEqual(bitboard.tie_counter, 0)
+        for _ in range(5):
+            bitboard.undo()
+        self.assertEqual(grid(bitboard), before)
+        self.assertEqual(bitboard.white_count, 8)
+
+    def test_invalid_move_leaves_board_untouched(self):
+        bitboard = BitBoard(8, 8, 2)
+        bitboard.initialize_game()
+        before = grid(bitboard)
+        with self.assertRaises(InvalidMoveError):
+            bitboard.make_move(Move([(1, 2), (3, 4)]), 1)
+        self.assertEqual(grid(bitboard), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,6 @@ We are following the javadoc docstring format which is:
 """
 
 
-import copy
 import re
 from Move import Move
 class InvalidMoveError(Exception):
@@ -18,6 +17,9 @@ class InvalidParameterError(Exception):
     pass
 
 import Checker
+import Zobrist
+import Evaluation
+import Geometry
 
 class Board:
     """
@@ -45,7 +47,15 @@ class Board:
         self.col = col
         self.p = p
         self.board = []
-        self.saved_move = [ ]#self.saved_move = [Move([]),[],False]
+        self.undo_stack = [[0, 0, 0, 0, False, False, 0, [], 0, "B", 0] for _ in range(64)] # preallocated undo records, see _push_undo_record
+        self.undo_top = 0 # number of records in use
+        self.zobrist_keys = Zobrist.get_keys(col, row)
+        self.zobrist_pieces = 0 # XOR of the keys of every piece on the board
+        self.side_to_move = "B" # black always moves first, then it flips with every make_move
+        self.zobrist_tie_bucket = None # set to a number of moves to also hash tie_counter // zobrist_tie_bucket
+        self.eval_table = Evaluation.get_table(col, row)
+        self.eval_score = 0 # sum of the eval_table values of every piece on the board, black's point of view
+        self.geometry = Geometry.get_geometry(col, row) # neighbour and jump tables shared by every board of this size
         for row in range(self.row):
             self.board.append([])
             for col in range(self.col):
@@ -87,8 +97,84 @@ class Board:
                     self.board[i][j] = Checker.Checker("B", [i,j])
                 self.white_count += 1
                 self.black_count += 1
+        self.compute_zobrist()
+        self.compute_evaluation()
 
+    def compute_zobrist(self):
+        """
+        Computes the piece part of the Zobrist key from scratch. make_move and undo keep it up to date, so this
+        only has to be called after pieces were placed on self.board directly.
+        @return zobrist_pieces: the new piece key
+        """
+        key = 0
+        for row in self.board:
+            for checker in row:
+                if checker.color != ".":
+                    key ^= self.zobrist_keys.piece[checker.row][checker.col][Zobrist.piece_kind(checker.color, checker.is_king)]
+        self.zobrist_pieces = key
+        return key
+
+    @property
+    def zobrist(self):
+        """
+        64-bit Zobrist key of the position: pieces, kings, side to move and, if zobrist_tie_bucket is set, the
+        tie_counter bucket.
+        @return key: an int
+        """
+        key = self.zobrist_pieces
+        if self.side_to_move == "W":
+            key ^= self.zobrist_keys.white_to_move
+        if self.zobrist_tie_bucket:
+            key ^= self.zobrist_keys.tie[min(self.tie_counter // self.zobrist_tie_bucket, Zobrist.TIE_BUCKETS - 1)]
+        return key
+
+    def compute_evaluation(self):
+        """
+        Computes eval_score from scratch. make_move and undo keep it up to date, so like compute_zobrist this
+        only has to be called after pieces were placed on self.board directly.
+        @return eval_score: the new score
+        """
+        score = 0
+        for row in self.board:
+            for checker in row:
+                if checker.color != ".":
+                    score += self.eval_table.piece[checker.row][checker.col][Zobrist.piece_kind(checker.color, checker.is_king)]
+        self.eval_score = score
+        return score
+
+    def evaluate(self, color):
+        """
+        Evaluates the position: material, advancement, back rank and center control, see Evaluation
+        @param color: player the score is for, 1/2 or 'B'/'W'
+        @return score: an int, positive when color is ahead
+        """
+        return self.eval_score if color == 1 or color == "B" else -self.eval_score
 
+    def evaluate_move(self, move, color):
+        """
+        Returns how much a legal move changes evaluate(color), without making the move: the captured pieces, a
+        promotion, and the positional terms of the squares the piece leaves and lands on.
+        @param move: a legal Move object
+        @param color: player making the move, 1/2 or 'B'/'W'
+        @return delta: an int
+        """
+        move_list = move.seq
+        start = move_list[0]
+        end = move_list[-1]
+        values = self.eval_table.piece
+        checker = self.board[start[0]][start[1]]
+        kind = (checker.color == "W") + 2 * checker.is_king
+        end_kind = kind
+        if not checker.is_king and end[0] == (self.row - 1 if checker.color == "B" else 0):
+            end_kind += 2
+        delta = values[end[0]][end[1]][end_kind] - values[start[0]][start[1]][kind]
+        if abs(start[0] - move_list[1][0]) == 2:
+            for t in range(len(move_list) - 1):
+                row = (move_list[t][0] + move_list[t + 1][0]) // 2
+                col = (move_list[t][1] + move_list[t + 1][1]) // 2
+                captured = self.board[row][col]
+                delta -= values[row][col][(captured.color == "W") + 2 * captured.is_king]
+        return delta if color == 1 or color == "B" else -delta
 
     def make_move(self, move, turn):
         """
@@ -98,7 +184,6 @@ class Board:
         @return:
         @raise InvalidMoveError: raises this objection if the move provided isn't valid on the current board
         """
-        temp_saved_move = [Move([]),[],False]
         if type(turn) is int:
             if turn == 1:
                 turn = 'B'
@@ -107,75 +192,148 @@ class Board:
             else:
                 raise InvalidMoveError
         move_list = move.seq
-        move_to_check = []
         ultimate_start = move_list[0]
-        ultimate_end = move_list[-1]
-        is_start_checker_king = self.board[ultimate_start[0]][ultimate_start[1]].is_king
-        past_positions = [ultimate_start]
-        capture_positions = []
-        for i in range(len(move_list)-1):
-            move_to_check.append((move_list[i],move_list[i + 1]))
+        start_checker = self.board[ultimate_start[0]][ultimate_start[1]]
+        is_start_checker_king = start_checker.is_king
+        record = self._push_undo_record(ultimate_start, is_start_checker_king)
+        captured = record[7]
+        promotion_row = self.row - 1 if turn == 'B' else 0
+        keys = self.zobrist_keys.piece
+        values = self.eval_table.piece
         # e.g move = Move((0,0)-(2,2)-(0,4))
-        #     move_to_check = [((0,0),(2,2)),((2,2),(0,4))]
+        #     steps checked: ((0,0),(2,2)) then ((2,2),(0,4))
         if_capture = False
         self.tie_counter += 1
-        saved_enemy_position = []
-        for t in range(len(move_to_check)):
-            start = move_to_check[t][0] # e.g. (0,0)
-            target= move_to_check[t][1] # e.g. (2,2)
+        for t in range(len(move_list) - 1):
+            start = move_list[t] # e.g. (0,0)
+            target = move_list[t + 1] # e.g. (2,2)
             if self.is_valid_move(start[0],start[1],target[0],target[1],turn) or (if_capture and abs(start[0]-target[0]) == 1):
                 # invailid move or attempting to make a single move after capture
-                self.board[start[0]][start[1]].color = "."
-                self.board[target[0]][target[1]].color = turn
-                self.board[target[0]][target[1]].is_king = self.board[start[0]][start[1]].is_king
-                self.board[start[0]][start[1]].become_man()
-                past_positions.append(target)
+                start_checker = self.board[start[0]][start[1]]
+                target_checker = self.board[target[0]][target[1]]
+                kind = (turn == "W") + 2 * start_checker.is_king
+                self.zobrist_pieces ^= keys[start[0]][start[1]][kind] ^ keys[target[0]][target[1]][kind]
+                self.eval_score += values[target[0]][target[1]][kind] - values[start[0]][start[1]][kind]
+                start_checker.color = "."
+                target_checker.color = turn
+                target_checker.is_king = start_checker.is_king
+                start_checker.become_man()
+                record[2] = target[0]
+                record[3] = target[1]
                 if abs(start[0]-target[0]) == 2:
                     # capture happened
                     if_capture = True
                     self.tie_counter = 0
-                    capture_position = ((start[0] + (target[0]-start[0])//2), (start[1] + (target[1]-start[1])//2))
-                    # calculate capture position
-                    capture_positions.append(capture_position)
-                    # record capture position
-                    saved_enemy_position.append((capture_position[0],capture_position[1],self.board[capture_position[0]][capture_position[1]].color,self.board[capture_position[0]][capture_position[1]].is_king))
-                    self.board[capture_position[0]][capture_position[1]] = Checker.Checker(".", [capture_position[0], capture_position[1]])
-                    # capture
-                    if turn == "B":
-                        self.white_count -= 1
-                    else:
-                        self.black_count -= 1
-                if (turn == 'B' and target[0] == self.row - 1):# and not self.board[target[0]][target[1]].is_king):
-                    if not is_start_checker_king:
-                        temp_saved_move[2] = True
-                    self.board[target[0]][target[1]].become_king()
-                    #self.saved_move[2] = True
+                    self._capture((start[0] + target[0]) // 2, (start[1] + target[1]) // 2, captured)
+                if target[0] == promotion_row:
+                    if not target_checker.is_king:
+                        self.zobrist_pieces ^= keys[target[0]][target[1]][kind] ^ keys[target[0]][target[1]][kind + 2]
+                        self.eval_score += values[target[0]][target[1]][kind + 2] - values[target[0]][target[1]][kind]
+                    target_checker.become_king()
                     if not is_start_checker_king:
+                        record[5] = True
                         break
-
-                elif (turn == 'W' and target[0] == 0):# and not self.board[target[0]][target[1]].is_king):
-                    if not is_start_checker_king:
-                        temp_saved_move[2] = True
-                    self.board[target[0]][target[1]].become_king()
-                     #self.saved_move[2] = True
-                    if not is_start_checker_king:
-                        break
-                else:
-                    temp_saved_move[2] = False #self.saved_move[2] = False
-
             else:
-                for failed_capture in capture_positions:
-                    # recover failed captures
-                    self.board[failed_capture[0]][failed_capture[1]] = Checker.Checker(self.opponent[turn],[failed_capture[0],failed_capture[1]])
-                for failed_position in past_positions:
-                    # recover failed moves
-                    self.board[failed_position[0]][failed_position[1]] = Checker.Checker(".", [failed_position[0],failed_position[1]])
-                self.board[ultimate_start[0]][ultimate_start[1]] = Checker.Checker(turn, [ultimate_start[0],ultimate_start[1]])
+                # put back the steps made so far
+                self.undo()
                 raise InvalidMoveError
+        self.side_to_move = self.opponent[turn]
+
+    def make_move_fast(self, move, turn):
+        """
+        Makes a Move that is known to be legal, e.g. one returned by get_all_possible_moves. Unlike make_move
+        the steps are not validated, so this is the one to use in search code doing many make/undo pairs.
+        The move is undone with undo like any other move.
+        @param move: a legal Move object
+        @param turn: player making the move, 1/2 or 'B'/'W'
+        @return:
+        """
+        if turn == 1:
+            turn = 'B'
+        elif turn == 2:
+            turn = 'W'
+        move_list = move.seq
+        ultimate_start = move_list[0]
+        ultimate_end = move_list[-1]
+        start_checker = self.board[ultimate_start[0]][ultimate_start[1]]
+        is_king = start_checker.is_king
+        record = self._push_undo_record(ultimate_start, is_king)
+        record[2] = ultimate_end[0]
+        record[3] = ultimate_end[1]
+        self.tie_counter += 1
+        if abs(ultimate_start[0] - move_list[1][0]) == 2:
+            self.tie_counter = 0
+            captured = record[7]
+            for t in range(len(move_list) - 1):
+                start = move_list[t]
+                target = move_list[t + 1]
+                self._capture((start[0] + target[0]) // 2, (start[1] + target[1]) // 2, captured)
+        start_checker.color = "."
+        start_checker.is_king = False
+        end_checker = self.board[ultimate_end[0]][ultimate_end[1]]
+        end_checker.color = turn
+        end_checker.is_king = is_king
+        if not is_king and ultimate_end[0] == (self.row - 1 if turn == 'B' else 0):
+            end_checker.is_king = True
+            record[5] = True
+        keys = self.zobrist_keys.piece
+        kind = (turn == "W") + 2 * is_king
+        end_kind = kind + 2 * (end_checker.is_king and not is_king)
+        self.zobrist_pieces ^= keys[ultimate_start[0]][ultimate_start[1]][kind] ^ \
+            keys[ultimate_end[0]][ultimate_end[1]][end_kind]
+        values = self.eval_table.piece
+        self.eval_score += values[ultimate_end[0]][ultimate_end[1]][end_kind] - \
+            values[ultimate_start[0]][ultimate_start[1]][kind]
+        self.side_to_move = self.opponent[turn]
+
+    def _push_undo_record(self, start, is_king):
+        """
+        Internal helper for make_move. Takes the next preallocated undo record and fills in the parts known
+        before the move is played. Records are lists of
+        [start row, start col, end row, end col, start was king, promoted, previous tie_counter, captured,
+         previous zobrist_pieces, previous side_to_move, previous eval_score]
+        where captured is a flat list of (row, col, was king) triples. The records and their captured lists
+        are reused, so make/undo pairs do not allocate.
+        @param start: (row, col) the moving piece starts on
+        @param is_king: if the moving piece is a king
+        @return record: the undo record
+        """
+        if self.undo_top == len(self.undo_stack):
+            self.undo_stack.extend([0, 0, 0, 0, False, False, 0, [], 0, "B", 0] for _ in range(len(self.undo_stack)))
+        record = self.undo_stack[self.undo_top]
+        self.undo_top += 1
+        record[0] = record[2] = start[0]
+        record[1] = record[3] = start[1]
+        record[4] = is_king
+        record[5] = False
+        record[6] = self.tie_counter
+        del record[7][:]
+        record[8] = self.zobrist_pieces
+        record[9] = self.side_to_move
+        record[10] = self.eval_score
+        return record
+
+    def _capture(self, row, col, captured):
+        """
+        Internal helper for make_move. Removes a captured piece and remembers it in the undo record.
+        @param row: row of the captured piece
+        @param col: col of the captured piece
+        @param captured: captured list of the undo record
+        """
+        checker = self.board[row][col]
+        captured.append(row)
+        captured.append(col)
+        captured.append(checker.is_king)
+        kind = (checker.color == "W") + 2 * checker.is_king
+        self.zobrist_pieces ^= self.zobrist_keys.piece[row][col][kind]
+        self.eval_score -= self.eval_table.piece[row][col][kind]
+        if checker.color == "W":
+            self.white_count -= 1
+        else:
+            self.black_count -= 1
+        checker.color = "."
+        checker.is_king = False
 
-        temp_saved_move[0] = copy.deepcopy(move) #self.saved_move[0] = copy.deepcopy(move)
-        temp_saved_move[1] = saved_enemy_position #self.saved_move[1] = saved_enemy_position
-        self.saved_move.append(temp_saved_move)
     def is_in_board(self,pos_x,pos_y):
         """
         Checks if the coordinate provided is in board. Is an internal function
@@ -276,9 +434,21 @@ class Board:
     def is_win(self,turn):
         """
         this function tracks if any player has won
-        @param :
-        @param :
-        @return :
+        @param turn: the player who just moved, 1/2 or 'B'/'W'
+        @return : 1 or 2 for the winner, -1 for a tie, 0 if the game goes on
+        @raise :
+        """
+        return self.game_state(turn)[0]
+
+    def game_state(self,turn):
+        """
+        this function returns the result is_win gives together with the moves of the player to move, so a caller
+        that goes on playing does not have to generate them again. It generates the moves of one side only; the
+        other side is only checked for having any move when needed, and pieces are counted with black_count and
+        white_count instead of scanning the board.
+        @param turn: the player who just moved, 1/2 or 'B'/'W'
+        @return result, moves: result as is_win returns it, and get_all_possible_moves of the player to move
+                               ([] for a tie)
         @raise :
         """
         if turn == "W":
@@ -286,39 +456,53 @@ class Board:
         elif turn == "B":
             turn =  1
         if self.tie_counter >= self.tie_max:
-            return -1
-        W_has_move = True
-        B_has_move = True
-        if len(self.get_all_possible_moves(1)) == 0:
-            if turn != 1:
-                B_has_move = False
-        elif len(self.get_all_possible_moves(2)) == 0:
-            if turn != 2:
-                W_has_move = False
-
-        if W_has_move and not B_has_move:
-            return 2
-        elif not W_has_move and B_has_move:
-            return 1
-
-        W = True
-        B = True
-
+            return -1, []
+        moves = self.get_all_possible_moves(3 - turn)
+        if not moves:
+            if turn == 2:
+                return 2, moves
+            # white is stuck, but it only loses if black can still move
+            if self.has_any_move(1):
+                return 1, moves
+        if self.white_count == 0:
+            return 2, moves
+        elif self.black_count == 0:
+            return 1, moves
+        return 0, moves
+
+    def has_any_move(self,color):
+        """
+        this function tells if a player has at least one legal move, stopping at the first one found
+        @param color: color of the player, 1/2 or 'B'/'W'
+        @return : True if get_all_possible_moves(color) would not be empty
+        @raise :
+        """
+        if type(color) is int:
+            if color == 1:
+                color = 'B'
+            elif color == 2:
+                color = 'W'
+        opponent = self.opponent[color]
+        board = self.board
         for row in range(self.row):
             for col in range(self.col):
-                checker = self.board[row][col]
-                if checker.color == 'W':
-                    W = False
-                elif checker.color == 'B':
-                    B = False
-                if not W and not B:
-                    return 0
-        if W:
-            return 2
-        elif B:
-            return 1
-        else:
-            return 0
+                checker = board[row][col]
+                if checker.color != color:
+                    continue
+                steps = self.geometry.steps_at[row][col]
+                jumps = self.geometry.jumps_at[row][col]
+                for d in Geometry.KING_DIRECTIONS[color] if checker.is_king else Geometry.MAN_DIRECTIONS[color]:
+                    target = steps[d]
+                    if target is None:
+                        continue
+                    target_color = board[target[0]][target[1]].color
+                    if target_color == '.':
+                        return True
+                    if target_color == opponent and jumps[d] is not None:
+                        land = jumps[d][1]
+                        if board[land[0]][land[1]].color == '.':
+                            return True
+        return False
 
     def show_board(self,fh=None):
         """
@@ -380,39 +564,36 @@ class Board:
             raise InvalidParameterError("N*P is odd -- must be even")
 
     def undo(self):
-        if self.saved_move != []:
-            temp_saved_move = self.saved_move[-1]
-            original_point = temp_saved_move[0][0]
-            target_point = temp_saved_move[0][-1]
-
-            
- #           original_point = self.saved_move[0][0]
- #           target_point = self.saved_move[0][-1]
-            self.board[original_point[0]][original_point[1]].color = self.board[target_point[0]][target_point[1]].color
-            if temp_saved_move[2]: #self.saved_move[2]: #if became king in that move, cancel that
-                self.board[original_point[0]][original_point[1]].is_king = False
-            else:
-                self.board[original_point[0]][original_point[1]].is_king = self.board[target_point[0]][target_point[1]].is_king
-            if target_point != original_point:
-                self.board[target_point[0]][target_point[1]].color = "."
-                self.board[target_point[0]][target_point[1]].is_king = False
-            for saved_enemy in temp_saved_move[1]:#self.saved_move[1]:
-                x,y,c,k = saved_enemy
-                self.board[x][y].color = c
-                self.board[x][y].is_king = k
-            self.tie_counter -= 1
-            self.saved_move.pop(-1)
-        else:
+        """
+        Undoes the last move made with make_move or make_move_fast
+        @return :
+        @raise Exception: if there is no move to undo
+        """
+        if self.undo_top == 0:
             raise Exception("Cannot undo operation")
-        self.black_count = 0
-        self.white_count = 0
-        for i in range(self.row):
-            for j in range(self.col):
-                if self.board[i][j].color=="W":
-                    self.white_count += 1
-                elif self.board[i][j].color == "B":
-                    self.black_count += 1
-
+        self.undo_top -= 1
+        (start_row, start_col, end_row, end_col, was_king, promoted, tie_counter, captured, zobrist_pieces,
+         side_to_move, eval_score) = self.undo_stack[self.undo_top]
+        end_checker = self.board[end_row][end_col]
+        color = end_checker.color
+        end_checker.color = "."
+        end_checker.is_king = False
+        start_checker = self.board[start_row][start_col]
+        start_checker.color = color
+        start_checker.is_king = was_king
+        enemy = "B" if color == "W" else "W"
+        for i in range(0, len(captured), 3):
+            checker = self.board[captured[i]][captured[i + 1]]
+            checker.color = enemy
+            checker.is_king = captured[i + 2]
+        if enemy == "W":
+            self.white_count += len(captured) // 3
+        else:
+            self.black_count += len(captured) // 3
+        self.tie_counter = tie_counter
+        self.zobrist_pieces = zobrist_pieces
+        self.side_to_move = side_to_move
+        self.eval_score = eval_score
 
 
 
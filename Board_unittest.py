@@ -0,0 +1,201 @@
+import random
+import unittest
+from BoardClasses import Board, InvalidMoveError
+from Move import Move
+from Perft import load_position
+
+
+def snapshot(board):
+    grid = [[(piece.color, piece.is_king) for piece in row] for row in board.board]
+    return grid, board.tie_counter, board.black_count, board.white_count
+
+
+class TestMakeUndo(unittest.TestCase):
+
+    def test_fast_path_matches_make_move(self):
+        """Ensure make_move_fast leaves the same position as make_move and undo restores both exactly."""
+        for seed in range(10):
+            rng = random.Random(seed)
+            board = Board(8, 8, 3)
+            fast = Board(8, 8, 3)
+            board.initialize_game()
+            fast.initialize_game()
+            history = []
+            turn = 1
+            for _ in range(200):
+                moves = board.get_all_possible_moves(turn)
+                if not moves:
+                    break
+                move = rng.choice(rng.choice(moves))
+                history.append(snapshot(board))
+                board.make_move(move, turn)
+                fast.make_move_fast(move, turn)
+                self.assertEqual(snapshot(board), snapshot(fast))
+                turn = 3 - turn
+            while history:
+                board.undo()
+                fast.undo()
+                expected = history.pop()
+                self.assertEqual(snapshot(board), expected)
+                self.assertEqual(snapshot(fast), expected)
+
+    def test_make_undo_reuses_records(self):
+        board = Board(8, 8, 2)
+        board.initialize_game()
+        checkers = [piece for row in board.board for piece in row]
+        record = board.undo_stack[0]
+        board.make_move_fast(Move([(1, 2), (2, 3)]), 1)
+        board.undo()
+        self.assertIs(board.undo_stack[0], record)
+        self.assertEqual([piece for row in board.board for piece in row], checkers)
+
+    def test_invalid_capture_chain_is_rolled_back(self):
+        """Ensure a move that fails half way through a capture chain restores the captured piece."""
+        board = Board(8, 8, 2)
+        board.initialize_game()
+        for move, turn in ((Move([(1, 2), (2, 3)]), 1), (Move([(6, 5), (5, 4)]), 2),
+                           (Move([(2, 3), (3, 4)]), 1), (Move([(5, 4), (4, 3)]), 2)):
+            board.make_move(move, turn)
+        before = snapshot(board)
+        with self.assertRaises(InvalidMoveError):
+            board.make_move(Move([(3, 4), (5, 2), (7, 4)]), 1)
+        self.assertEqual(snapshot(board), before)
+
+
+class TestZobrist(unittest.TestCase):
+
+    def test_transpositions_share_a_key(self):
+        first = Board(8, 8, 2)
+        second = Board(8, 8, 2)
+        first.initialize_game()
+        second.initialize_game()
+        for move, turn in ((Move([(1, 0), (2, 1)]), 1), (Move([(6, 1), (5, 2)]), 2), (Move([(1, 2), (2, 3)]), 1)):
+            first.make_move(move, turn)
+        for move, turn in ((Move([(1, 2), (2, 3)]), 1), (Move([(6, 1), (5, 2)]), 2), (Move([(1, 0), (2, 1)]), 1)):
+            second.make_move(move, turn)
+        self.assertEqual(first.zobrist, second.zobrist)
+        self.assertEqual(first.zobrist, first.compute_zobrist() ^ first.zobrist_keys.white_to_move)
+
+    def test_key_covers_kings_and_side_to_move(self):
+        board = Board(8, 8, 2)
+        board.initialize_game()
+        start = board.zobrist
+        board.make_move(Move([(1, 0), (2, 1)]), 1)
+        moved = board.zobrist
+        board.side_to_move = "B"
+        self.assertNotEqual(board.zobrist, moved)
+        board.side_to_move = "W"
+        board.board[2][1].become_king()
+        board.compute_zobrist()
+        self.assertNotEqual(board.zobrist, moved)
+        board.undo()
+        self.assertEqual(board.zobrist, start)
+
+
+class TestEvaluation(unittest.TestCase):
+
+    def test_move_delta_matches_made_move(self):
+        """Ensure evaluate_move predicts the change of evaluate for every legal move, captures and promotions included."""
+        for seed in range(5):
+            rng = random.Random(seed)
+            board = Board(8, 8, 3)
+            board.initialize_game()
+            turn = 1
+            for _ in range(120):
+                moves = [m for checker_moves in board.get_all_possible_moves(turn) for m in checker_moves]
+                if not moves:
+                    break
+                before = board.evaluate(turn)
+                for move in moves:
+                    delta = board.evaluate_move(move, turn)
+                    board.make_move_fast(move, turn)
+                    self.assertEqual(board.evaluate(turn) - before, delta)
+                    board.undo()
+                board.make_move(rng.choice(moves), turn)
+                turn = 3 - turn
+
+    def test_incremental_score_matches_full_count(self):
+        board = Board(8, 8, 3)
+        board.initialize_game()
+        start = board.eval_score
+        rng = random.Random(1)
+        turn = 1
+        plies = 0
+        for _ in range(100):
+            moves = board.get_all_possible_moves(turn)
+            if not moves:
+                break
+            board.make_move(rng.choice(rng.choice(moves)), turn)
+            plies += 1
+            score = board.eval_score
+            self.assertEqual(board.compute_evaluation(), score)
+            turn = 3 - turn
+        for _ in range(plies):
+            board.undo()
+        self.assertEqual(board.eval_score, start)
+
+
+class TestCaptureSequences(unittest.TestCase):
+
+    def setUp(self):
+        # a black man that promotes half way through a capture, with one more capture open to a king
+        self.board = Board(8, 8, 3)
+        load_position(self.board, "......../......../......../......../......../b......./.w.w..../........")
+        self.checker = self.board.board[5][0]
+
+    def test_promotion_ends_the_capture(self):
+        before = snapshot(self.board)
+        sequences = self.checker.capture_sequences(self.board)
+        self.assertEqual([move.seq for move in sequences], [[(5, 0), (7, 2)]])
+        self.assertEqual(snapshot(self.board), before)
+        moves, is_capture = self.checker.get_possible_moves(self.board)
+        self.assertTrue(is_capture)
+        self.assertEqual([move.seq for move in moves], [[(5, 0), (7, 2)]])
+
+    def test_promoted_man_can_keep_capturing(self):
+        sequences = self.checker.capture_sequences(self.board, promotion_stops=False)
+        self.assertEqual([move.seq for move in sequences], [[(5, 0), (7, 2), (5, 4)]])
+
+    def test_traversal_wrapper(self):
+        load_position(self.board, "......../......../..w.w.../...B..../..w.w.../......../......../........")
+        king = self.board.board[3][3]
+        multiple_jump = []
+        king.binary_tree_traversal(3, 3, multiple_jump, self.board, (2, 3, 0, 1), [], "B")
+        self.assertEqual(multiple_jump, [move.seq[1:] for move in king.capture_sequences(self.board)])
+        self.assertEqual(len(multiple_jump), 4)
+
+
+class TestGameState(unittest.TestCase):
+
+    def test_returns_the_moves_of_the_player_to_move(self):
+        board = Board(8, 8, 3)
+        board.initialize_game()
+        board.make_move(Move([(2, 1), (3, 0)]), 1)
+        result, moves = board.game_state(1)
+        self.assertEqual(result, 0)
+        self.assertEqual([[m.seq for m in ms] for ms in moves],
+                         [[m.seq for m in ms] for ms in board.get_all_possible_moves(2)])
+
+    def test_stuck_player_loses(self):
+        board = Board(8, 8, 3)
+        # the white man on row 0 cannot move, the black man can
+        load_position(board, ".w....../......../......../......../...b..../......../......../........")
+        self.assertEqual(board.game_state(1), (1, []))
+        self.assertFalse(board.has_any_move(2))
+        self.assertTrue(board.has_any_move(1))
+
+    def test_both_players_stuck(self):
+        board = Board(8, 8, 3)
+        load_position(board, ".w....../......../......../......../......../......../......../b.......")
+        self.assertEqual(board.game_state(1), (0, []))
+        self.assertEqual(board.is_win(2), 2)
+
+    def test_tie(self):
+        board = Board(8, 8, 3)
+        board.initialize_game()
+        board.tie_counter = board.tie_max
+        self.assertEqual(board.game_state(2), (-1, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
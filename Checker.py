@@ -7,8 +7,55 @@ We are following the javadoc docstring format which is:
 @raise tag describes the errors this function can raise
 """
 from Move import Move
-from copy import deepcopy
-from copy import copy
+from Geometry import MAN_DIRECTIONS, KING_DIRECTIONS
+
+
+def capture_paths(board, origin, direction, color, promotion_row=-1, promotion_stops=True):
+    """
+    Generates every maximal capture sequence of a piece without recursion and without touching the board.
+    The search keeps an explicit stack of (square, captured mask, directions, path) states; captured pieces count
+    as removed as soon as they are jumped and the origin square counts as empty, like the old recursive version.
+    Sequences come out in the same depth first order, one at a time.
+    @param board: Board the piece is on
+    @param origin: square index (row * col + column) the piece starts from
+    @param direction: direction indexes (see Geometry.DIRECTIONS) the piece may jump in
+    @param color: 'B' or 'W', color of the piece
+    @param promotion_row: row where the piece gets promoted, -1 for a king
+    @param promotion_stops: if a sequence ends on the promotion row, else the piece goes on jumping as a king
+    @return : a generator of tuples of square indexes, origin first
+    """
+    geometry = board.geometry
+    coords = geometry.coords
+    jump = geometry.jump
+    grid = board.board
+    opponent = board.opponent[color]
+    vacated = 1 << origin
+    stack = [(origin, 0, direction, (origin,))]
+    while stack:
+        sq, captured, dirs, path = stack.pop()
+        children = []
+        for d in dirs:
+            pair = jump[sq][d]
+            if pair is None:
+                continue
+            over, land = pair
+            r, c = coords[over]
+            if grid[r][c].color != opponent or captured >> over & 1:
+                continue
+            r, c = coords[land]
+            if grid[r][c].color != '.' and not (captured | vacated) >> land & 1:
+                continue
+            next_dirs = dirs
+            if r == promotion_row:
+                next_dirs = () if promotion_stops else KING_DIRECTIONS[color]
+            children.append((land, captured | 1 << over, next_dirs, path + (land,)))
+        if children:
+            # pushed in reverse so the first direction is explored first
+            stack.extend(reversed(children))
+        elif len(path) > 1:
+            yield path
+
+
 class Checker():
     def __init__(self, color, location):
         """
@@ -34,67 +81,58 @@ class Checker():
         # and 2,2. explore_direction will be [(1,-1), (1, 1)]
         if self.color == '.':
             return []
-        directions = {"W":[(-1,-1),(-1,1)],"B":[(1,-1),(1,1)]}
-        result = []
-        multiple_jump = []
-        board = copy(board)
-        is_capture = False
-        explore_direction = directions[self.color]
-        if self.is_king:
-            explore_direction.extend(directions[board.opponent[self.color]])
-            # a king can go all directions
-            # but do we allow fly king?
+        result = list(self.capture_sequences(board))
+        if result:
+            return result, True
+        # a king can go all directions, but do we allow fly king?
+        explore_direction = KING_DIRECTIONS[self.color] if self.is_king else MAN_DIRECTIONS[self.color]
+        steps = board.geometry.steps_at[self.row][self.col]
         for i in explore_direction:
-            pos_x,pos_y = self.row+i[0],self.col+i[1]
-            if board.is_in_board(pos_x,pos_y):
-                if board.board[pos_x][pos_y].color == '.':
-                    result.append(Move([(self.row,self.col),(pos_x,pos_y)]))
-        # save_color = board.board[self.row][self.col].color
-        save_color = board.board[self.row][self.col].color
-        board.board[self.row][self.col].color = "."
-        self.binary_tree_traversal(self.row,self.col,multiple_jump, board, explore_direction, [],save_color)
-        # filter out those at margins
-        if multiple_jump != []:
-            is_capture = True
-            result = []
-        for jump in multiple_jump:
-            jump.insert(0,(self.row,self.col))
-            result.append(Move(jump))
-        board.board[self.row][self.col].color = save_color
-        return result, is_capture
+            target = steps[i]
+            if target is not None and board.board[target[0]][target[1]].color == '.':
+                result.append(Move([(self.row,self.col),target]))
+        return result, False
+
+    def capture_sequences(self, board, promotion_stops=True):
+        """
+        Generates the maximal capture sequences of this checker lazily, in the order binary_tree_traversal used to
+        find them. The board is not modified, see capture_paths.
+        @param board: has the current state of the board
+        @param promotion_stops: if a man that reaches its promotion row in the middle of a capture ends its move
+                                there, which is the rule of this game. If False it keeps capturing as a king.
+        @return : a generator of Move objects
+        """
+        if self.color == '.':
+            return
+        if self.is_king:
+            directions, promotion_row = KING_DIRECTIONS[self.color], -1
+        else:
+            directions = MAN_DIRECTIONS[self.color]
+            promotion_row = board.row - 1 if self.color == 'B' else 0
+        coords = board.geometry.coords
+        for path in capture_paths(board, self.row * board.col + self.col, directions, self.color,
+                                  promotion_row, promotion_stops):
+            yield Move([coords[sq] for sq in path])
 
     def binary_tree_traversal(self,pos_x,pos_y,multiple_jump,board,direction,move,self_color):
         """
         Internal helper function for get_possible_moves. Students should not use this.
-        This function handles the move chain if multiple jumps are possible for this checker piece
+        This function handles the move chain if multiple jumps are possible for this checker piece.
+        It is kept for older callers, the jumps are now found by capture_paths.
         @param pos_x: x coordinate of the checker piece whose move is being explored
         @param pos_y: y coordinate of the checker piece whose move is being explored
         @param multiple_jump: a list of the current multiple jump moves found
         @param board: current state of the board
-        @param direction: current direction to explore in
+        @param direction: direction indexes (see Geometry.DIRECTIONS) to explore in
         @param move: current move chain being explored
         """
-        for i in direction:
-            temp_x, temp_y = pos_x + i[0], pos_y + i[1]
-            if board.is_in_board(temp_x,temp_y) and \
-                    board.board[temp_x][temp_y].color == board.opponent[self_color] \
-                    and board.is_in_board(temp_x+i[0],temp_y+i[1]) and board.board[temp_x + i[0]][temp_y+ i[1]].color == '.':
-                break
-        else:
-            if move != []:
-                multiple_jump.append(move)
-            return
-        for i in direction:
-            temp_x,temp_y = pos_x + i[0],pos_y + i[1]
-            if board.is_in_board(temp_x,temp_y) and board.board[temp_x][temp_y].color == board.opponent[self_color]:
-
-                if board.is_in_board(pos_x + i[0]+i[0],pos_y + i[1]+i[1]) and board.board[pos_x + i[0] + i[0]][pos_y + i[1] + i[1]].color == '.':
-                    backup = board.board[pos_x + i[0]][pos_y + i[1]].color
-                    board.board[pos_x + i[0]][pos_y + i[1]].color = "."
-                    move.append((pos_x + i[0]+i[0],pos_y + i[1]+i[1]))
-                    self.binary_tree_traversal(pos_x + i[0] + i[0],pos_y + i[1] + i[1],multiple_jump,board,direction,list(move),self_color)
-                    move.pop()
-                    board.board[pos_x + i[0]][pos_y + i[1]].color = backup
+        coords = board.geometry.coords
+        found = False
+        for path in capture_paths(board, pos_x * board.col + pos_y, direction, self_color):
+            found = True
+            multiple_jump.append(list(move) + [coords[sq] for sq in path[1:]])
+        if not found and move != []:
+            multiple_jump.append(move)
     # def get_valid_moves(self, board):
     #     """
     #
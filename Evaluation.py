@@ -0,0 +1,73 @@
+"""
+This module has the evaluation tables used by Board and BitBoard to score positions.
+
+A position is scored as the sum of one value per (square, piece kind) on the board: material, plus bonuses for
+men that advanced towards promotion, men still guarding their own back row, and pieces on the central squares.
+Black pieces count positive and white pieces negative, so the boards keep a single running score that
+make_move/undo update for the squares a move touches, and a move can be scored before it is played from the
+squares it empties and fills.
+The piece kind indexes are the ones of Zobrist.piece_kind.
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+from SharedTable import SharedTable
+
+MAN_VALUE = 100
+KING_VALUE = 150
+ADVANCE_VALUE = 2  # per row a man has moved towards its promotion row
+BACK_RANK_VALUE = 10  # for a man still on its own back row
+CENTER_VALUE = 5  # for a piece on the central squares
+
+
+class EvaluationTable(SharedTable):
+    """
+    This class holds the square values of one board size
+    """
+    def __init__(self, col, row):
+        """
+        Computes the values
+        @param col: number of columns in the board
+        @param row: number of rows in the board
+        """
+        self.col = col
+        self.row = row
+        self.piece = tuple(tuple(tuple(self._value(col, row, r, c, kind) for kind in range(4)) for c in range(col))
+                           for r in range(row))
+
+    @staticmethod
+    def _value(col, row, r, c, kind):
+        """
+        Internal helper. Returns the value of one piece, positive for black and negative for white
+        @param col: number of columns in the board
+        @param row: number of rows in the board
+        @param r: row of the piece
+        @param c: col of the piece
+        @param kind: piece kind index
+        @return value: an int
+        """
+        white = kind & 1
+        if kind >= 2:
+            value = KING_VALUE
+        else:
+            # black men start at row 0 and promote on the last row, white men the other way round
+            advanced = row - 1 - r if white else r
+            value = MAN_VALUE + ADVANCE_VALUE * advanced
+            if advanced == 0:
+                value += BACK_RANK_VALUE
+        if row // 4 <= r < row - row // 4 and col // 4 <= c < col - col // 4:
+            value += CENTER_VALUE
+        return -value if white else value
+
+
+def get_table(col, row):
+    """
+    Returns the evaluation table of a board size, computing it the first time the size is seen
+    @param col: number of columns in the board
+    @param row: number of rows in the board
+    @return table: EvaluationTable object
+    """
+    return EvaluationTable.shared(col, row)
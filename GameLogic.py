@@ -1,28 +1,40 @@
 from BoardClasses import *
+from BitBoard import BitBoard
 import sys
 sys.path.append("./AI_Extensions/")
 from AI_Extensions import *
 #from StudentAI import StudentAI
 from StudentAI import StudentAI
 from ManualAI import ManualAI
+from GameRecord import GameRecordWriter, engine_id
 
 class GameLogic:
 
-    def __init__(self,col,row,p,mode,debug):
+    def __init__(self,col,row,p,mode,debug,bitboard=False,ponder=True,record=None):
         self.col = col
         self.row = row
         self.p = p
         self.mode = mode
         self.debug = debug
+        self.bitboard = bitboard # use BitBoard instead of Board for the referee board and StudentAI
+        self.ponder = ponder # let StudentAI search while the opponent thinks in tournament mode
+        self.record = record # path of a GameRecord file every game played by gameloop is appended to
         self.ai_list = []
 
     def gameloop(self,fh=None):
         player = 1
         winPlayer = 0
         move = Move([])
-        board = Board(self.col,self.row,self.p)
+        if self.bitboard:
+            board = BitBoard(self.col,self.row,self.p)
+        else:
+            board = Board(self.col,self.row,self.p)
         board.initialize_game()
         board.show_board(fh)
+        writer = None
+        if self.record is not None:
+            writer = GameRecordWriter(self.record)
+            writer.start_game(self.col,self.row,self.p,engine_id(self.ai_list[0]),engine_id(self.ai_list[1]))
         while True:
             try:
                 move = self.ai_list[player-1].get_move(move)
@@ -44,7 +56,9 @@ class GameLogic:
                 else:
                     winPlayer = 1
                 break
-            winPlayer = board.is_win(player)
+            if writer is not None:
+                writer.add_move(move)
+            winPlayer, _ = board.game_state(player)
             board.show_board(fh)
             if(winPlayer != 0):
                 if self.mode == 'n':#Communate with peer to tell the result.
@@ -59,6 +73,9 @@ class GameLogic:
                 player = 2
             else:
                 player = 1
+        if writer is not None:
+            writer.end_game(winPlayer)
+            writer.close()
         if winPlayer == -1:
             print("Tie",file=fh)
         else:
@@ -67,14 +84,23 @@ class GameLogic:
             for AI in self.ai_list:
                 if type(AI) is IOAI:
                     AI.close()
+        for AI in self.ai_list:
+            if type(AI) is StudentAI:
+                AI.close() # terminates its process pool, if it searched in parallel
         return winPlayer
 
     def TournamentInterface(self):
-        ai = StudentAI(self.col,self.row,self.p)
-        while True:
-            move = Move.from_str(input().rstrip())
-            result = ai.get_move(move)
-            print(result)
+        ai = StudentAI(self.col,self.row,self.p,bitboard=self.bitboard)
+        try:
+            while True:
+                move = Move.from_str(input().rstrip())
+                ai.stop_pondering() # keeps the subtree searched for the opponent's move
+                result = ai.get_move(move)
+                print(result, flush=True)
+                if self.ponder:
+                    ai.start_pondering() # search on the opponent's time until its move arrives
+        finally:
+            ai.close()
 
     '''
     The parameters should be changed DURING/AFTER the implementation of Board.
@@ -101,24 +127,24 @@ class GameLogic:
                 self.ai_list.append(
                     ManualAI(self.col, self.row, self.p))
                 self.ai_list.append(
-                    StudentAI(self.col, self.row, self.p))
+                    StudentAI(self.col, self.row, self.p, bitboard=self.bitboard))
             else:
                 self.ai_list.append(
-                    StudentAI(self.col, self.row, self.p))
+                    StudentAI(self.col, self.row, self.p, bitboard=self.bitboard))
                 self.ai_list.append(
                     ManualAI(self.col, self.row, self.p))
             self.gameloop(fh)
         elif self.mode == 's' or self.mode == 'self':
             if kwargs['order'] == '1':
                 self.ai_list.append(
-                    StudentAI(self.col, self.row, self.p))
+                    StudentAI(self.col, self.row, self.p, bitboard=self.bitboard))
                 self.ai_list.append(
-                    StudentAI(self.col, self.row, self.p))
+                    StudentAI(self.col, self.row, self.p, bitboard=self.bitboard))
             else:
                 self.ai_list.append(
-                    StudentAI(self.col, self.row, self.p))
+                    StudentAI(self.col, self.row, self.p, bitboard=self.bitboard))
                 self.ai_list.append(
-                    StudentAI(self.col, self.row, self.p))
+                    StudentAI(self.col, self.row, self.p, bitboard=self.bitboard))
             self.gameloop(fh)
         elif self.mode == 'l' or self.mode == 'local' :
             self.ai_list.append(
@@ -0,0 +1,223 @@
+"""
+This module has the binary game record format: GameRecord, the GameRecordWriter that the gameloop gives every
+move as it is played and that appends each game to a file when it ends, and read_records, which iterates over
+the games of a file.
+
+A record file starts with the 5 bytes MAGIC and then holds one record per game:
+    'G'  col  row  p  flags                        5 unsigned bytes, flags bit 0: squares take 2 bytes
+    len  black engine id   len  white engine id    1 length byte + UTF-8 each
+    per move: n  square * n                        n squares visited, square = row * col + column
+    0                                              end of the moves
+    result                                         signed byte: 1 or 2 for the winner, -1 for a tie, 0 unknown
+Squares are 1 byte on boards up to 256 squares (2 bytes little endian above), so a typical move takes 3 bytes.
+The writer keeps the game it is recording in memory (a few hundred bytes) and appends it with a single write
+once the result is known, so a game that is interrupted never leaves half a record in front of the games
+appended after it by a later run. Only a crash during that write can cut off the last record of a file, and the
+reader ignores a record cut off at the end of the file. read_records reads the file in order and keeps only the
+game it is on, so files with millions of games can be scanned with constant memory.
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+import struct
+from Move import Move
+
+MAGIC = b"CKGR\x01"
+RECORD_TAG = b"G"
+WIDE_SQUARES = 1  # flags bit
+_header = struct.Struct("<4B")
+
+
+def engine_id(ai):
+    """
+    Returns the id of an AI object stored in records
+    @param ai: AI object, e.g. StudentAI or IOAI
+    @return : the executable path of an IOAI, else "module:Class"
+    """
+    if hasattr(ai, "ai_path"):
+        return ai.ai_path
+    return type(ai).__module__ + ":" + type(ai).__name__
+
+
+class GameRecord:
+    """
+    This class describes one recorded game
+    """
+    def __init__(self, col, row, p, black, white, squares=None, result=0):
+        """
+        @param col: number of columns in the board
+        @param row: number of rows in the board
+        @param p: number of rows filled with checker pieces at the start
+        @param black: id of the engine playing black (player 1)
+        @param white: id of the engine playing white (player 2)
+        @param squares: list of moves, every move a tuple of square indexes
+        @param result: 1 or 2 for the winner, -1 for a tie, 0 unknown
+        @return :
+        """
+        self.col = col
+        self.row = row
+        self.p = p
+        self.black = black
+        self.white = white
+        self.squares = squares if squares is not None else []
+        self.result = result
+
+    @property
+    def moves(self):
+        """
+        The moves of the game as Move objects, black's first
+        @return : a list of Move objects
+        """
+        col = self.col
+        return [Move([(sq // col, sq % col) for sq in move]) for move in self.squares]
+
+    def __repr__(self):
+        return "GameRecord(%s vs %s, %d moves, result %d)" % (self.black, self.white, len(self.squares),
+                                                              self.result)
+
+
+class GameRecordWriter:
+    """
+    This class appends games to a record file. A game is given move by move between start_game and end_game and
+    buffered, then written with a single write when it ends (see the module docstring). Only one writer may have
+    a file open at a time: games played in other processes are sent to the writer's process and written there, as
+    MatchRunner does.
+    """
+    def __init__(self, path):
+        """
+        Opens the file for appending, writing MAGIC first if it is empty
+        @param path: record file
+        @return :
+        """
+        self.fh = open(path, "ab")
+        if self.fh.tell() == 0:
+            self.fh.write(MAGIC)
+            self.fh.flush()
+        self.buffer = None
+        self.square = None
+        self.col = None
+
+    def start_game(self, col, row, p, black, white):
+        """
+        Starts recording a game
+        @param col: number of columns in the board
+        @param row: number of rows in the board
+        @param p: number of rows filled with checker pieces at the start
+        @param black: id of the engine playing black
+        @param white: id of the engine playing white
+        @return :
+        """
+        wide = col * row > 256
+        self.square = struct.Struct("<H" if wide else "<B")
+        self.col = col
+        self.buffer = bytearray(RECORD_TAG)
+        self.buffer += _header.pack(col, row, p, WIDE_SQUARES if wide else 0)
+        for name in (black, white):
+            data = name.encode()[:255]
+            self.buffer.append(len(data))
+            self.buffer += data
+
+    def add_move(self, move):
+        """
+        Records the next move of the game
+        @param move: Move object
+        @return :
+        @raise ValueError: if no game was started
+        """
+        if self.buffer is None:
+            raise ValueError("no game started")
+        self.buffer.append(len(move.seq))
+        for r, c in move.seq:
+            self.buffer += self.square.pack(r * self.col + c)
+
+    def end_game(self, result):
+        """
+        Writes the game to the file
+        @param result: 1 or 2 for the winner, -1 for a tie, 0 unknown
+        @return :
+        @raise ValueError: if no game was started
+        """
+        if self.buffer is None:
+            raise ValueError("no game started")
+        self.buffer.append(0)
+        self.buffer += struct.pack("<b", result)
+        self.fh.write(self.buffer)
+        self.fh.flush()
+        self.buffer = None
+
+    def write(self, record):
+        """
+        Writes a whole GameRecord
+        @param record: GameRecord object
+        @return :
+        """
+        self.start_game(record.col, record.row, record.p, record.black, record.white)
+        col = record.col
+        for move in record.squares:
+            self.add_move(Move([(sq // col, sq % col) for sq in move]))
+        self.end_game(record.result)
+
+    def close(self):
+        """
+        Closes the file, a game that did not end is dropped
+        @return :
+        """
+        self.fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_records(path):
+    """
+    Iterates over the games of a record file
+    @param path: record file, or a binary file object positioned at its start
+    @return : a generator of GameRecord objects, in file order
+    @raise ValueError: if the file does not start with MAGIC
+    """
+    fh = open(path, "rb") if isinstance(path, str) else path
+    try:
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise ValueError("not a game record file")
+        read = fh.read
+        while True:
+            tag = read(1)
+            if tag != RECORD_TAG:
+                return  # end of the file, or a record that was cut off
+            header = read(_header.size)
+            if len(header) < _header.size:
+                return
+            col, row, p, flags = _header.unpack(header)
+            names = []
+            for _ in range(2):
+                size = read(1)
+                if not size:
+                    return
+                names.append(read(size[0]).decode(errors="replace"))
+            width = 2 if flags & WIDE_SQUARES else 1
+            fmt = "<%d" + ("H" if width == 2 else "B")
+            squares = []
+            while True:
+                count = read(1)
+                if not count:
+                    return
+                count = count[0]
+                if count == 0:
+                    break
+                data = read(count * width)
+                if len(data) < count * width:
+                    return
+                squares.append(struct.unpack(fmt % count, data))
+            result = read(1)
+            if not result:
+                return
+            yield GameRecord(col, row, p, names[0], names[1], squares, struct.unpack("<b", result)[0])
+    finally:
+        if isinstance(path, str):
+            fh.close()
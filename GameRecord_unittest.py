@@ -0,0 +1,70 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+from AI_Extensions.RandomAI import StudentAI as RandomAI
+from BoardClasses import Board
+from GameLogic import GameLogic
+from GameRecord import MAGIC, GameRecord, GameRecordWriter, read_records
+from Move import Move
+
+
+class TestGameRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "games.ckr")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_round_trip(self):
+        games = [GameRecord(8, 8, 2, "a", "b", [(9, 16), (50, 41), (16, 34, 52)], 1),
+                 GameRecord(20, 20, 3, "c", "d", [(21, 42), (379, 358)], -1),
+                 GameRecord(7, 7, 2, "e", "f", [], 2)]
+        with GameRecordWriter(self.path) as writer:
+            for game in games[:2]:
+                writer.write(game)
+        with GameRecordWriter(self.path) as writer:
+            writer.write(games[2])
+        records = list(read_records(self.path))
+        self.assertEqual([(r.col, r.row, r.p, r.black, r.white, r.squares, r.result) for r in records],
+                         [(g.col, g.row, g.p, g.black, g.white, g.squares, g.result) for g in games])
+        self.assertEqual(records[0].moves[2].seq, [(2, 0), (4, 2), (6, 4)])
+        # header, 5 + 2 + 2 header bytes per game, 1 + squares bytes per move, terminator and result
+        self.assertEqual(os.path.getsize(self.path), len(MAGIC) + 9 + 10 + 2 + 9 + 10 + 2 + 9 + 2)
+
+    def test_cut_off_game_is_ignored(self):
+        with GameRecordWriter(self.path) as writer:
+            writer.write(GameRecord(8, 8, 2, "a", "b", [(9, 16)], 1))
+            writer.write(GameRecord(8, 8, 2, "a", "b", [(9, 16), (50, 41)], 2))
+        with open(self.path, "rb+") as fh:
+            fh.truncate(os.path.getsize(self.path) - 3)
+        self.assertEqual(len(list(read_records(self.path))), 1)
+
+    def test_not_a_record_file(self):
+        with self.assertRaises(ValueError):
+            list(read_records(io.BytesIO(b"hello")))
+
+    def test_gameloop_writes_records(self):
+        random.seed(4)
+        game = GameLogic(8, 8, 2, 's', False, record=self.path)
+        for _ in range(2):
+            game.ai_list = [RandomAI(8, 8, 2), RandomAI(8, 8, 2)]
+            winner = game.gameloop(io.StringIO())
+        records = list(read_records(self.path))
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[1].result, winner)
+        self.assertEqual(records[1].black, "AI_Extensions.RandomAI:StudentAI")
+        board = Board(8, 8, 2)
+        board.initialize_game()
+        player = 1
+        for move in records[1].moves:
+            board.make_move(move, player)
+            player = 3 - player
+        self.assertEqual(board.is_win(3 - player), winner)
+
+
+if __name__ == '__main__':
+    unittest.main()
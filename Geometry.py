@@ -0,0 +1,83 @@
+"""
+This module has the Geometry Class, the neighbour and jump tables of one board size.
+
+Squares are numbered row-major (square = row * col + column). For every square the tables give the square one
+step away and the (jumped over, landing) pair of a jump in each of the four diagonal directions, or nothing
+when that leaves the board, so move generation never does bounds arithmetic. The same tables are also kept
+per (row, col) for the Board/Checker code that works with coordinates, and as per direction bitmasks for
+BitBoard. They are built the first time a size is seen and shared by every board of that size.
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+from SharedTable import SharedTable
+
+# direction index -> (row delta, col delta)
+DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+# direction indexes each piece may use, in the same order Checker.get_possible_moves explores them
+MAN_DIRECTIONS = {"B": (2, 3), "W": (0, 1)}
+KING_DIRECTIONS = {"B": (2, 3, 0, 1), "W": (0, 1, 2, 3)}
+
+
+class Geometry(SharedTable):
+    """
+    This class holds the lookup tables of one board size
+    """
+    def __init__(self, col, row):
+        """
+        Builds the tables
+        @param col: number of columns in the board
+        @param row: number of rows in the board
+        """
+        self.col = col
+        self.row = row
+        size = col * row
+        self.coords = tuple((sq // col, sq % col) for sq in range(size))
+        step = []
+        jump = []
+        step_src = [0, 0, 0, 0]
+        jump_src = [0, 0, 0, 0]
+        for sq, (r, c) in enumerate(self.coords):
+            steps = []
+            jumps = []
+            for d, (dr, dc) in enumerate(DIRECTIONS):
+                if 0 <= r + dr < row and 0 <= c + dc < col:
+                    steps.append((r + dr) * col + c + dc)
+                    step_src[d] |= 1 << sq
+                else:
+                    steps.append(-1)
+                if 0 <= r + 2 * dr < row and 0 <= c + 2 * dc < col:
+                    jumps.append(((r + dr) * col + c + dc, (r + 2 * dr) * col + c + 2 * dc))
+                    jump_src[d] |= 1 << sq
+                else:
+                    jumps.append(None)
+            step.append(tuple(steps))
+            jump.append(tuple(jumps))
+        # square index tables: step[sq][d] is a square or -1, jump[sq][d] is (over, landing) or None
+        self.step = tuple(step)
+        self.jump = tuple(jump)
+        # bitmasks of the squares that have a step/jump in each direction, and the square offset of a step
+        self.step_src = tuple(step_src)
+        self.jump_src = tuple(jump_src)
+        self.shift = tuple(dr * col + dc for dr, dc in DIRECTIONS)
+        self.full = (1 << size) - 1
+        # the same tables with (row, col) coordinates: steps_at[r][c][d] is a coordinate or None and
+        # jumps_at[r][c][d] is (over, landing) coordinates or None
+        coords = self.coords
+        self.steps_at = tuple(tuple(tuple(None if t < 0 else coords[t] for t in step[r * col + c])
+                                    for c in range(col)) for r in range(row))
+        self.jumps_at = tuple(tuple(tuple(None if j is None else (coords[j[0]], coords[j[1]]) for j in jump[r * col + c])
+                                    for c in range(col)) for r in range(row))
+
+
+def get_geometry(col, row):
+    """
+    Returns the tables of a board size, building them the first time the size is seen
+    @param col: number of columns in the board
+    @param row: number of rows in the board
+    @return geometry: Geometry object
+    """
+    return Geometry.shared(col, row)
@@ -0,0 +1,43 @@
+import copy
+import pickle
+import unittest
+from BoardClasses import Board
+from BitBoard import BitBoard
+from Geometry import get_geometry
+
+
+class TestGeometry(unittest.TestCase):
+
+    def test_tables_are_shared_per_size(self):
+        board = Board(8, 8, 3)
+        self.assertIs(board.geometry, get_geometry(8, 8))
+        self.assertIs(BitBoard(8, 8, 3).geometry, board.geometry)
+        copied = copy.deepcopy(board)
+        self.assertIs(copied.geometry, board.geometry)
+        self.assertIs(copied.zobrist_keys, board.zobrist_keys)
+        self.assertIs(copied.eval_table, board.eval_table)
+        unpickled = pickle.loads(pickle.dumps(board))
+        self.assertIs(unpickled.geometry, board.geometry)
+        self.assertIs(unpickled.zobrist_keys, board.zobrist_keys)
+        self.assertIs(unpickled.eval_table, board.eval_table)
+        self.assertLess(len(pickle.dumps(board.geometry)), 200)
+        self.assertIsNot(Board(7, 7, 2).geometry, board.geometry)
+
+    def test_corner_square(self):
+        geometry = get_geometry(8, 8)
+        self.assertEqual(geometry.step[0], (-1, -1, -1, 9))
+        self.assertEqual(geometry.jump[0], (None, None, None, (9, 18)))
+        self.assertEqual(geometry.steps_at[0][0], (None, None, None, (1, 1)))
+        self.assertEqual(geometry.jumps_at[0][0], (None, None, None, ((1, 1), (2, 2))))
+
+    def test_non_square_board(self):
+        geometry = get_geometry(5, 7)
+        # square 11 is row 2, col 1
+        self.assertEqual(geometry.coords[11], (2, 1))
+        self.assertEqual(geometry.step[11], (5, 7, 15, 17))
+        self.assertEqual(geometry.jump[11], (None, (7, 3), None, (17, 23)))
+        self.assertEqual(geometry.jumps_at[2][1][1], ((1, 2), (0, 3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
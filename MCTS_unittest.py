@@ -1,7 +1,10 @@
+import time
 import unittest
 from BoardClasses import Board, InvalidMoveError
-from StudentAI import StudentAI
+from StudentAI import StudentAI, MCTSNode
 from Move import Move
+import ParallelMCTS
+from Perft import load_position
 
 
 class TestOpponentMoveApplication(unittest.TestCase):
@@ -25,8 +28,6 @@ class TestOpponentMoveApplication(unittest.TestCase):
         self.assertIsNotNone(new_state.board[3][2], "Opponent’s piece did not move correctly.")
         self.assertIsNone(new_state.board[2][1], "Opponent’s old position was not cleared.")
 
-if __name__ == '__main__':
-    unittest.main()
 
 class TestMCTSMoveGeneration(unittest.TestCase):
 
@@ -41,9 +42,6 @@ class TestMCTSMoveGeneration(unittest.TestCase):
         valid_moves = [m.seq for sublist in self.ai.board.get_all_possible_moves(self.ai.color) for m in sublist]
         self.assertIn(best_move.seq, valid_moves, f"MCTS generated an invalid move: {best_move}")
 
-if __name__ == '__main__':
-    unittest.main()
-
 
 class TestAIMoveApplication(unittest.TestCase):
 
@@ -65,6 +63,192 @@ class TestAIMoveApplication(unittest.TestCase):
         self.assertIsNotNone(new_state.board[move.seq[-1][0]][move.seq[-1][1]], "AI's piece did not move correctly.")
         self.assertIsNone(new_state.board[move.seq[0][0]][move.seq[0][1]], "AI's old position was not cleared.")
 
+
+class TestRootParallelMCTS(unittest.TestCase):
+
+    def setUp(self):
+        """Initialize an AI searching with two worker processes."""
+        self.ai = StudentAI(8, 8, 2, workers=2)
+        self.ai.seed = 1
+
+    def tearDown(self):
+        self.ai.close()
+
+    def test_root_parallel_returns_legal_move(self):
+        """Ensure the merged root statistics pick a legal move."""
+        self.ai.color = 1
+        best_move = self.ai.mcts_search(self.ai.board, time_limit=1)
+
+        valid_moves = [m.seq for sublist in self.ai.board.get_all_possible_moves(self.ai.color) for m in sublist]
+        self.assertIn(best_move.seq, valid_moves, f"Root parallel MCTS generated an invalid move: {best_move}")
+
+
+class TestTreeParallelMCTS(unittest.TestCase):
+
+    def setUp(self):
+        """Initialize an AI with two threads sharing one tree."""
+        self.ai = StudentAI(8, 8, 2, workers=2, parallel="tree")
+        self.ai.seed = 1
+
+    def tearDown(self):
+        self.ai.close()
+
+    def test_tree_parallel_returns_legal_move(self):
+        """Ensure the shared tree search picks a legal move."""
+        self.ai.color = 1
+        best_move = self.ai.mcts_search(self.ai.board, time_limit=1)
+
+        valid_moves = [m.seq for sublist in self.ai.board.get_all_possible_moves(self.ai.color) for m in sublist]
+        self.assertIn(best_move.seq, valid_moves, f"Tree parallel MCTS generated an invalid move: {best_move}")
+
+    def test_virtual_loss_is_taken_back(self):
+        """Ensure no virtual visits are left on the root once the search ends."""
+        self.ai.color = 1
+        root = ParallelMCTS.tree_parallel_run(self.ai, self.ai.board, 1)
+
+        self.assertGreater(root.visits, 0)
+        self.assertEqual(root.visits, sum(child.visits for child in root.children))
+        self.assertEqual(list(root.child_visits[:len(root.children)]), [child.visits for child in root.children])
+        self.assertEqual(list(root.child_wins[:len(root.children)]), [child.wins for child in root.children])
+        leaves = [child for child in root.children if not child.children]
+        self.assertTrue(all(leaf.child_visits is None and leaf.child_wins is None for leaf in leaves))
+
+    def test_close_terminates_the_pool(self):
+        """Ensure close shuts the rollout workers down and a later search starts new ones."""
+        self.ai.color = 1
+        self.ai.mcts_search(self.ai.board, time_limit=0.2)
+        self.assertIsNotNone(self.ai.pool)
+        self.ai.close()
+        self.assertIsNone(self.ai.pool)
+        self.ai.rollout_batch = 4
+        best_move = self.ai.mcts_search(self.ai.board, time_limit=0.2)
+        valid_moves = [m.seq for sublist in self.ai.board.get_all_possible_moves(self.ai.color) for m in sublist]
+        self.assertIn(best_move.seq, valid_moves)
+
+
+class TestTreeReuse(unittest.TestCase):
+
+    def setUp(self):
+        """Initialize an AI playing black with a small tree grown without rollouts."""
+        self.ai = StudentAI(8, 8, 2)
+        self.ai.color = 1
+        self.ai.root = MCTSNode(current_player=1, remaining_pieces=24)
+        self.ai.root_key = self.ai.board.zobrist
+        for _ in range(12):
+            node, _ = self.ai.select_and_expand(self.ai.root, self.ai.board)
+            self.ai.rewind(self.ai.board, node, self.ai.root)
+            self.ai.backpropagate(node, 1, 1)
+
+    def test_tree_follows_both_moves(self):
+        """Ensure the kept tree descends through our move and the opponent's reply and is searched again."""
+        ours = next(child for child in self.ai.root.children if child.children)
+        reply = ours.children[0]
+        self.ai.board.make_move(ours.move, 1)
+        self.ai.advance_tree(ours.move)
+        self.ai.board.make_move(reply.move, 2)
+        self.ai.advance_tree(reply.move)
+
+        self.assertIs(self.ai.reusable_root(self.ai.board), reply)
+        visits = reply.visits
+        self.ai.mcts_search(self.ai.board, time_limit=0.1)
+        self.assertIs(self.ai.root, reply)
+        self.assertIsNone(reply.parent)
+        self.assertGreater(reply.visits, visits)
+
+    def test_nodes_replay_on_one_board(self):
+        """Ensure nodes keep no board and every iteration leaves the working board where it started."""
+        start = self.ai.board.zobrist
+        for _ in range(5):
+            node, _ = self.ai.select_and_expand(self.ai.root, self.ai.board)
+            self.assertNotEqual(self.ai.board.zobrist, start)
+            self.ai.rewind(self.ai.board, node, self.ai.root)
+            self.assertEqual(self.ai.board.zobrist, start)
+        self.assertFalse(hasattr(self.ai.root.children[0], "board"))
+
+    def test_moves_are_expanded_once(self):
+        """Ensure expansion takes every legal move once and then marks the node fully expanded."""
+        moves = [m.seq for sublist in self.ai.board.get_all_possible_moves(1) for m in sublist]
+
+        self.assertEqual(sorted(child.move.seq for child in self.ai.root.children), sorted(moves))
+        self.assertTrue(self.ai.root.is_fully_expanded())
+
+    def test_unexpanded_move_starts_fresh(self):
+        """Ensure a reply the tree never expanded drops the tree."""
+        ours = next(child for child in self.ai.root.children if child.children)
+        self.ai.board.make_move(ours.move, 1)
+        self.ai.advance_tree(ours.move)
+        expanded = [child.move.seq for child in ours.children]
+        moves = [m for sublist in self.ai.board.get_all_possible_moves(2) for m in sublist]
+        unexpanded = next(m for m in moves if m.seq not in expanded)
+        self.ai.board.make_move(unexpanded, 2)
+        self.ai.advance_tree(unexpanded)
+
+        self.assertIsNone(self.ai.root)
+        self.assertIsNone(self.ai.reusable_root(self.ai.board))
+
+
+class TestBatchRollouts(unittest.TestCase):
+
+    def test_leaf_runs_a_batch(self):
+        """Ensure every rollout adds rollout_batch visits and the search still picks a legal move."""
+        ai = StudentAI(8, 8, 2, bitboard=True)
+        ai.color = 1
+        ai.rollout_batch = 16
+        root = ai.run_mcts(ai.board, 0.5)
+
+        self.assertGreater(root.visits, 0)
+        self.assertEqual(root.visits % 16, 0)
+        self.assertEqual(root.visits, sum(child.visits for child in root.children))
+        best_move = ai.mcts_search(ai.board, time_limit=0.2)
+        valid_moves = [m.seq for sublist in ai.board.get_all_possible_moves(1) for m in sublist]
+        self.assertIn(best_move.seq, valid_moves)
+
+
+class TestForcedMoves(unittest.TestCase):
+
+    def setUp(self):
+        """Initialize an AI playing black in a position where its only move is a capture."""
+        self.ai = StudentAI(8, 8, 2)
+        self.ai.simulation_time = 0.3
+        load_position(self.ai.board, "/".join([".b......", "..w....."] + ["........"] * 4 + ["...w....", "......W."]))
+
+    def test_forced_move_banks_its_time(self):
+        move = self.ai.get_move(Move([]))
+
+        self.assertEqual(move.seq, [(0, 1), (2, 3)])
+        self.assertLess(self.ai.time_manager.used, 0.2)
+        self.assertIsNone(self.ai.root)
+
+    def test_forced_move_ponders_the_reply(self):
+        self.ai.forced_moves = "ponder"
+        move = self.ai.get_move(Move([]))
+
+        self.assertEqual(move.seq, [(0, 1), (2, 3)])
+        self.assertEqual(self.ai.root.current_player, 2)
+        self.assertEqual(self.ai.root_key, self.ai.board.zobrist)
+        self.assertGreater(self.ai.root.visits, 0)
+
+
+class TestPondering(unittest.TestCase):
+
+    def test_opponent_move_keeps_the_pondered_subtree(self):
+        """Ensure pondering grows the tree for the opponent's replies and the actual reply's subtree is kept."""
+        ai = StudentAI(8, 8, 2)
+        ai.simulation_time = 0.2
+        ai.get_move(Move([]))
+        ai.start_pondering()
+        time.sleep(0.5)
+        ai.stop_pondering()
+
+        self.assertIsNone(ai.pondering)
+        self.assertEqual(ai.root.current_player, 2)
+        self.assertEqual(ai.root_key, ai.board.zobrist)
+        reply = max(ai.root.children, key=lambda child: child.visits)
+        self.assertGreater(reply.visits, 0)
+        ai.board.make_move(reply.move, 2)
+        ai.advance_tree(reply.move)
+        self.assertIs(ai.reusable_root(ai.board), reply)
+
+
 if __name__ == '__main__':
     unittest.main()
-
@@ -0,0 +1,586 @@
+"""
+This module has the match runner, which plays games between two AIs inside Python processes.
+
+Instead of starting AI_Runner.py (and through it two more interpreters talking over pipes) for every game, the
+AI classes are imported and called directly, by one gameloop per worker of a process pool. The loop follows
+GameLogic.gameloop: black moves first, a crash or an invalid move loses the game, and Board.game_state decides
+the result after every move; nothing is printed. The engines swap colors every game, and every game gets its own
+seed from the match seed, so a match can be replayed. Results come back as GameResult/MatchResult objects, with
+the moves of every game; with a record file the parent process appends the games to it as their results come in.
+run_sprt plays until a sequential probability ratio test (see SPRT) decides the match instead of a fixed number
+of games.
+
+Command line: python3 MatchRunner.py {engine 1} {engine 2} [--games N] [--workers N] [--col C --row R --p P]
+              [--sprt --elo0 E0 --elo1 E1 --alpha A --beta B] [--record FILE]
+An engine is "module" (its StudentAI class) or "module:Class", e.g. StudentAI or AI_Extensions.RandomAI, or
+the path of an executable AI, which is played through IOAI like in GameLogic's local mode.
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import math
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+import numpy as np
+from BoardClasses import Board, InvalidMoveError
+from BitBoard import BitBoard
+from Move import Move
+from AI_Extensions.IOAI import IOAI, get_prefix
+from GameRecord import GameRecordWriter
+from TimeManager import GAME_TIME
+
+
+class Engine:
+    """
+    This class describes one player of a match: which AI class to build and how to configure it
+    """
+    def __init__(self, target, name=None, options=None, attributes=None):
+        """
+        @param target: AI class, its import path as "module" (class StudentAI) or "module:Class", or the path of
+                       an executable AI (.py, .pyc, .exe or .jar, see IOAI.get_prefix) played through IOAI
+        @param name: name used in the results, the import path or class name when None
+        @param options: keyword arguments of the AI constructor besides col, row and p, e.g. bitboard=True or
+                        total_time=60. For an executable only time, its clock in seconds (GAME_TIME when
+                        missing), is used.
+        @param attributes: attributes set on the AI once it is built, e.g. simulation_time=1
+        @return :
+        """
+        if isinstance(target, str):
+            self.path = target
+        else:
+            self.path = target.__module__ + ":" + target.__name__
+        self.executable = get_prefix(self.path) != self.path
+        self.name = name if name is not None else self.path
+        self.options = dict(options or {})
+        self.attributes = dict(attributes or {})
+
+    def load(self):
+        """
+        Imports the AI class
+        @return cls: the class
+        @raise ImportError: if the module cannot be imported
+        @raise AttributeError: if the module has no such class
+        """
+        module, _, cls = self.path.partition(":")
+        return getattr(importlib.import_module(module), cls or "StudentAI")
+
+    def create(self, col, row, p):
+        """
+        Builds a fresh AI for one game
+        @param col: number of columns in the board
+        @param row: number of rows in the board
+        @param p: number of rows filled with checker pieces at the start
+        @return ai: the AI object
+        """
+        if self.executable:
+            return IOAI(col, row, p, ai_path=self.path, time=self.options.get("time", GAME_TIME))
+        ai = self.load()(col, row, p, **self.options)
+        for key, value in self.attributes.items():
+            setattr(ai, key, value)
+        return ai
+
+    def __repr__(self):
+        return "Engine(%r)" % self.name
+
+
+class GameResult:
+    """
+    This class describes the outcome of one game
+    """
+    def __init__(self, game, black, white, winner, reason, plies, seconds, seed, error=None, moves=None):
+        """
+        @param game: index of the game in its match
+        @param black: name of the engine playing black (player 1)
+        @param white: name of the engine playing white (player 2)
+        @param winner: 1 or 2 for the winning player, -1 for a tie
+        @param reason: "result" when the board decided the game, "crash" or "invalid" when a player lost by error
+        @param plies: number of moves played
+        @param seconds: wall time of the game
+        @param seed: seed the game was played with
+        @param error: message of the crash or invalid move, else None
+        @param moves: the moves played as strings, e.g. '(2,1)-(3,2)', black's first
+        @return :
+        """
+        self.game = game
+        self.black = black
+        self.white = white
+        self.winner = winner
+        self.reason = reason
+        self.plies = plies
+        self.seconds = seconds
+        self.seed = seed
+        self.error = error
+        self.moves = moves if moves is not None else []
+
+    def score(self, name):
+        """
+        Returns the score of an engine in this game
+        @param name: engine name
+        @return score: 1 for a win, 0.5 for a tie, 0 for a loss
+        """
+        if self.winner == -1:
+            return 0.5
+        return 1.0 if (self.black, self.white)[self.winner - 1] == name else 0.0
+
+    def to_dict(self):
+        """
+        Returns the result as a dict of plain values, e.g. to store it as JSON
+        @return : a dict with one key per constructor parameter
+        """
+        return dict(game=self.game, black=self.black, white=self.white, winner=self.winner, reason=self.reason,
+                    plies=self.plies, seconds=self.seconds, seed=self.seed, error=self.error, moves=self.moves)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds a result stored with to_dict
+        @param data: the dict
+        @return result: GameResult object
+        """
+        return cls(**data)
+
+    def __repr__(self):
+        return "GameResult(%d: %s vs %s, winner %d)" % (self.game, self.black, self.white, self.winner)
+
+
+class MatchResult:
+    """
+    This class describes the games of a match between engines a and b, seen from a
+    """
+    def __init__(self, a, b, games, sprt=None):
+        """
+        @param a: name of the first engine
+        @param b: name of the second engine
+        @param games: list of GameResult, in game order
+        @param sprt: SPRT the match was run with, None for a fixed number of games
+        @return :
+        """
+        self.a = a
+        self.b = b
+        self.games = games
+        self.sprt = sprt
+        self.wins = sum(1 for game in games if game.score(a) == 1)
+        self.losses = sum(1 for game in games if game.score(a) == 0)
+        self.draws = len(games) - self.wins - self.losses
+
+    @property
+    def score(self):
+        """
+        Average score of a, ties counting half
+        @return : a float between 0 and 1, 0.5 for an empty match
+        """
+        if not self.games:
+            return 0.5
+        return (self.wins + 0.5 * self.draws) / len(self.games)
+
+    def __repr__(self):
+        return "MatchResult(%s vs %s: +%d -%d =%d)" % (self.a, self.b, self.wins, self.losses, self.draws)
+
+
+def elo_to_score(elo):
+    """
+    Returns the expected score of a player that is elo points stronger than its opponent
+    @param elo: Elo difference
+    @return score: a float between 0 and 1
+    """
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def score_to_elo(score):
+    """
+    Returns the Elo difference that gives an expected score, the inverse of elo_to_score
+    @param score: a float between 0 and 1, clamped away from 0 and 1 so the difference stays finite
+    @return elo: Elo difference
+    """
+    score = min(max(score, 1e-6), 1.0 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+class SPRT:
+    """
+    This class describes a sequential probability ratio test of H0: elo = elo0 against H1: elo = elo1.
+
+    Games are counted in pairs where both engines had both colors, so the color advantage cancels inside each
+    sample. A pair scores 0, 0.5, 1, 1.5 or 2 for engine a; the five counts are the pentanomial. The
+    log-likelihood ratio is the usual normal approximation of the generalized SPRT:
+    LLR = N (s1 - s0) (2 mean - s0 - s1) / (2 variance), with the per game score mean and variance of the pairs
+    and s0, s1 the scores of elo0 and elo1. The test stops once the LLR leaves [log(beta / (1 - alpha)),
+    log((1 - beta) / alpha)]. Draws need no special case: a pair of two draws is the middle cell, and so is a
+    pair where each engine won with the same color.
+    """
+    def __init__(self, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05):
+        """
+        @param elo0: Elo difference of the null hypothesis, a is not better
+        @param elo1: Elo difference of the alternative hypothesis, a is better
+        @param alpha: probability of accepting H1 when H0 holds
+        @param beta: probability of accepting H0 when H1 holds
+        @return :
+        @raise ValueError: if elo1 is not above elo0 or alpha/beta are not between 0 and 1
+        """
+        if elo1 <= elo0:
+            raise ValueError("elo1 must be larger than elo0")
+        if not (0 < alpha < 1 and 0 < beta < 1):
+            raise ValueError("alpha and beta must be between 0 and 1")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self.pentanomial = [0, 0, 0, 0, 0]
+
+    def add_pair(self, score):
+        """
+        Counts a pair of color-swapped games
+        @param score: points of engine a in the two games, 0, 0.5, 1, 1.5 or 2
+        @return :
+        """
+        self.pentanomial[int(round(2 * score))] += 1
+
+    @property
+    def pairs(self):
+        """
+        Number of pairs counted
+        @return : an int
+        """
+        return sum(self.pentanomial)
+
+    def _stats(self, prior=0.5):
+        """
+        Internal helper. Per game score mean and per pair variance of the pairs. prior pairs are added to every
+        cell of the pentanomial, which keeps the variance of short one-sided runs from collapsing to 0.
+        @param prior: pairs added to every cell
+        @return mean, variance, pairs:
+        """
+        counts = [count + prior for count in self.pentanomial]
+        total = sum(counts)
+        mean = sum(i / 4.0 * count for i, count in enumerate(counts)) / total
+        variance = sum((i / 4.0 - mean) ** 2 * count for i, count in enumerate(counts)) / total
+        return mean, variance, total
+
+    def llr(self):
+        """
+        Returns the log-likelihood ratio of H1 against H0, computed with half a pair of prior in every cell
+        @return : a float, 0 before any pair was counted
+        """
+        if not self.pairs:
+            return 0.0
+        mean, variance, pairs = self._stats()
+        s0, s1 = elo_to_score(self.elo0), elo_to_score(self.elo1)
+        return pairs * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+    def status(self):
+        """
+        Returns the decision of the test
+        @return : "H1" if a is better (elo >= elo1 accepted), "H0" if it is not (elo <= elo0 accepted), None while
+                  the test goes on
+        """
+        llr = self.llr()
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
+
+    def elo(self, confidence=0.95):
+        """
+        Estimates the Elo difference of a over b from the pairs
+        @param confidence: probability covered by the interval
+        @return elo, low, high: the estimate and the bounds of its confidence interval
+        """
+        if not self.pairs:
+            return 0.0, -math.inf, math.inf
+        mean, _, pairs = self._stats(prior=0)
+        _, variance, _ = self._stats()
+        margin = statistics.NormalDist().inv_cdf(0.5 + confidence / 2) * math.sqrt(variance / pairs)
+        return score_to_elo(mean), score_to_elo(mean - margin), score_to_elo(mean + margin)
+
+    def __repr__(self):
+        return "SPRT(elo0=%g, elo1=%g, llr=%.2f [%.2f, %.2f])" % (self.elo0, self.elo1, self.llr(), self.lower,
+                                                                   self.upper)
+
+
+def seed_game(seed):
+    """
+    Seeds the random modules the AIs use
+    @param seed: an int
+    @return :
+    """
+    random.seed(seed)
+    np.random.seed(seed % 2 ** 32)
+
+
+def play_game(black, white, col, row, p, seed=None, game=0, bitboard=False, quiet=True):
+    """
+    Plays one game, the same way GameLogic.gameloop does
+    @param black: Engine playing player 1
+    @param white: Engine playing player 2
+    @param col: number of columns in the board
+    @param row: number of rows in the board
+    @param p: number of rows filled with checker pieces at the start
+    @param seed: seed of the random modules, not seeded when None
+    @param game: index of the game in its match
+    @param bitboard: use BitBoard for the referee board
+    @param quiet: hide whatever the AIs print
+    @return result: GameResult object
+    """
+    start = time.time()
+    if seed is not None:
+        seed_game(seed)
+    board = BitBoard(col, row, p) if bitboard else Board(col, row, p)
+    board.initialize_game()
+    player = 1
+    plies = 0
+    move = Move([])
+    reason = "result"
+    error = None
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    ais = []
+    moves = []
+    with output:
+        try:
+            for engine in (black, white):
+                ai = engine.create(col, row, p)
+                if seed is not None and getattr(ai, "seed", False) is None:
+                    ai.seed = seed  # StudentAI seeds its search workers from it
+                ais.append(ai)
+            while True:
+                try:
+                    move = ais[player - 1].get_move(move)
+                except Exception as e:
+                    winner, reason, error = 3 - player, "crash", "%s: %s" % (type(e).__name__, e)
+                    break
+                try:
+                    board.make_move(move, player)
+                except InvalidMoveError:
+                    winner, reason, error = 3 - player, "invalid", str(move)
+                    break
+                plies += 1
+                moves.append(str(move))
+                winner, _ = board.game_state(player)
+                if winner != 0:
+                    break
+                player = 3 - player
+        finally:
+            for ai in ais:
+                if hasattr(ai, "close"):
+                    ai.close()  # StudentAI terminates its process pool, IOAI its child process
+    return GameResult(game, black.name, white.name, winner, reason, plies, time.time() - start, seed, error,
+                      moves)
+
+
+def _play_worker(args):
+    """
+    Plays one scheduled game in a worker process
+    @param args: the play_game arguments as a tuple
+    @return result: GameResult object
+    """
+    return play_game(*args)
+
+
+def schedule(a, b, games, col, row, p, seed=0, bitboard=False):
+    """
+    Lists the games of a match. Colors alternate: a is black in the even games and white in the odd ones, so every
+    pair of games is played from both sides.
+    @param a: first Engine
+    @param b: second Engine
+    @param games: number of games
+    @param col: number of columns in the board
+    @param row: number of rows in the board
+    @param p: number of rows filled with checker pieces at the start
+    @param seed: match seed, game i is played with seed + i
+    @param bitboard: use BitBoard for the referee board
+    @return jobs: list of play_game argument tuples
+    """
+    jobs = []
+    for game in range(games):
+        black, white = (a, b) if game % 2 == 0 else (b, a)
+        jobs.append((black, white, col, row, p, seed + game, game, bitboard, True))
+    return jobs
+
+
+def run_jobs(jobs, workers=None, callback=None):
+    """
+    Plays scheduled games, in a process pool when there is more than one worker
+    @param jobs: list of play_game argument tuples
+    @param workers: number of processes, one per CPU when None, 1 plays in this process
+    @param callback: function called with every GameResult as soon as its game ends. If it returns True the
+                     games that did not end yet are abandoned.
+    @return results: list of GameResult in the order of jobs, only the games that ended
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    results = []
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            results.append(_play_worker(job))
+            if callback is not None and callback(results[-1]):
+                break
+    else:
+        # leaving the with block terminates the pool, which stops the games still being played
+        with multiprocessing.Pool(min(workers, len(jobs))) as pool:
+            for result in pool.imap_unordered(_play_worker, jobs):
+                results.append(result)
+                if callback is not None and callback(result):
+                    break
+    order = {job[6]: i for i, job in enumerate(jobs)}
+    results.sort(key=lambda result: order[result.game])
+    return results
+
+
+def _recorded(callback, record, col, row, p):
+    """
+    Internal helper for run_match and run_sprt. Wraps a run_jobs callback so every result is appended to a record
+    file first. The writing happens in the process that runs the jobs, so pool workers never touch the file.
+    @param callback: run_jobs callback, may be None
+    @param record: path of a GameRecord file, None to not record the games
+    @param col: number of columns in the board
+    @param row: number of rows in the board
+    @param p: number of rows filled with checker pieces at the start
+    @return writer, callback: the open GameRecordWriter (a null context when record is None) and the callback
+    """
+    if record is None:
+        return contextlib.nullcontext(), callback
+    writer = GameRecordWriter(record)
+
+    def save(result):
+        writer.start_game(col, row, p, result.black, result.white)
+        for move in result.moves:
+            writer.add_move(Move.from_str(move))
+        writer.end_game(result.winner)
+        return callback is not None and callback(result)
+
+    return writer, save
+
+
+def run_match(a, b, games=100, col=8, row=8, p=2, workers=None, seed=0, bitboard=False, callback=None,
+              record=None):
+    """
+    Plays a match between two engines
+    @param a: first Engine
+    @param b: second Engine
+    @param games: number of games, even numbers give both engines the same number of games with black
+    @param col: number of columns in the board
+    @param row: number of rows in the board
+    @param p: number of rows filled with checker pieces at the start
+    @param workers: number of processes, see run_jobs
+    @param seed: match seed, see schedule
+    @param bitboard: use BitBoard for the referee board
+    @param callback: function called with every GameResult as soon as its game ends
+    @param record: path of a GameRecord file the games are appended to, None to not record them
+    @return result: MatchResult seen from a
+    @raise ValueError: if both engines have the same name, results could not tell them apart
+    """
+    if a.name == b.name:
+        raise ValueError("both engines are named %s" % a.name)
+    jobs = schedule(a, b, games, col, row, p, seed, bitboard)
+    writer, callback = _recorded(callback, record, col, row, p)
+    with writer:
+        return MatchResult(a.name, b.name, run_jobs(jobs, workers, callback))
+
+
+def run_sprt(a, b, sprt=None, max_games=20000, col=8, row=8, p=2, workers=None, seed=0, bitboard=False,
+             callback=None, record=None):
+    """
+    Plays a match between two engines until an SPRT decides it, or max_games were played. Games are scheduled
+    like run_match, so games 2k and 2k + 1 are a color-swapped pair.
+    @param a: first Engine, the candidate
+    @param b: second Engine, the baseline
+    @param sprt: SPRT to count the pairs in, SPRT() when None
+    @param max_games: most games to play
+    @param col: number of columns in the board
+    @param row: number of rows in the board
+    @param p: number of rows filled with checker pieces at the start
+    @param workers: number of processes, see run_jobs
+    @param seed: match seed, see schedule
+    @param bitboard: use BitBoard for the referee board
+    @param callback: function called with every GameResult as soon as its game ends
+    @param record: path of a GameRecord file the games are appended to, None to not record them
+    @return result: MatchResult seen from a, with the SPRT as result.sprt
+    @raise ValueError: if both engines have the same name
+    """
+    if a.name == b.name:
+        raise ValueError("both engines are named %s" % a.name)
+    if sprt is None:
+        sprt = SPRT()
+    unpaired = {}
+
+    def count(result):
+        if callback is not None:
+            callback(result)
+        other = unpaired.pop(result.game // 2, None)
+        if other is None:
+            unpaired[result.game // 2] = result
+            return False
+        sprt.add_pair(result.score(a.name) + other.score(a.name))
+        return sprt.status() is not None
+
+    jobs = schedule(a, b, max_games - max_games % 2, col, row, p, seed, bitboard)
+    writer, count = _recorded(count, record, col, row, p)
+    with writer:
+        return MatchResult(a.name, b.name, run_jobs(jobs, workers, count), sprt)
+
+
+def main(argv=None):
+    """
+    Runs a match from the command line and prints its results
+    @param argv: command line arguments, sys.argv[1:] when None
+    @return result: MatchResult
+    """
+    parser = argparse.ArgumentParser(description="Play a match between two AIs")
+    parser.add_argument("engine_a")
+    parser.add_argument("engine_b")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--col", type=int, default=8)
+    parser.add_argument("--row", type=int, default=8)
+    parser.add_argument("--p", type=int, default=2)
+    parser.add_argument("--record", default=None, help="GameRecord file the games are appended to")
+    parser.add_argument("--sprt", action="store_true", help="stop once an SPRT decides, --games is the maximum")
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=10.0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    args = parser.parse_args(argv)
+    a, b = Engine(args.engine_a), Engine(args.engine_b)
+    if a.name == b.name:
+        a.name, b.name = a.name + " (1)", b.name + " (2)"
+    games = args.games
+
+    def progress(result):
+        print("Game %d/%d: %s vs %s, %s" % (result.game + 1, games, result.black, result.white,
+                                          "tie" if result.winner == -1 else "player %d wins" % result.winner),
+              flush=True)
+
+    if args.sprt:
+        sprt = SPRT(args.elo0, args.elo1, args.alpha, args.beta)
+        result = run_sprt(a, b, sprt, games, args.col, args.row, args.p, args.workers, args.seed, callback=progress,
+                          record=args.record)
+    else:
+        result = run_match(a, b, games, args.col, args.row, args.p, args.workers, args.seed, callback=progress,
+                           record=args.record)
+    print("%s: %d wins, %d losses, %d ties, score %.1f%%" % (a.name, result.wins, result.losses, result.draws,
+                                                           100 * result.score))
+    if result.sprt is not None:
+        elo, low, high = result.sprt.elo()
+        print("Pentanomial %s, LLR %.2f [%.2f, %.2f]: %s" % (result.sprt.pentanomial, result.sprt.llr(),
+                                                             result.sprt.lower, result.sprt.upper,
+                                                             result.sprt.status() or "undecided"))
+        print("Elo %.1f, 95%% confidence interval [%.1f, %.1f]" % (elo, low, high))
+    return result
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
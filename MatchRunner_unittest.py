@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from BoardClasses import Board
+from GameRecord import read_records
+from MatchRunner import Engine, GameResult, SPRT, elo_to_score, play_game, run_match, run_sprt, schedule, score_to_elo
+
+RANDOM_AI = "AI_Extensions.RandomAI"
+
+
+class CrashingAI:
+    def __init__(self, col, row, p):
+        pass
+
+    def get_move(self, move):
+        raise RuntimeError("no move")
+
+
+class TestMatchRunner(unittest.TestCase):
+
+    def test_schedule_alternates_colors(self):
+        a, b = Engine(RANDOM_AI, "a"), Engine(RANDOM_AI, "b")
+        jobs = schedule(a, b, 4, 8, 8, 2, seed=10)
+        self.assertEqual([(job[0].name, job[1].name) for job in jobs], [("a", "b"), ("b", "a")] * 2)
+        self.assertEqual([job[5] for job in jobs], [10, 11, 12, 13])
+
+    def test_seeded_match_replays(self):
+        a, b = Engine(RANDOM_AI, "a"), Engine(RANDOM_AI, "b")
+        first = run_match(a, b, games=4, workers=2, seed=3)
+        second = run_match(a, b, games=4, workers=1, seed=3)
+        self.assertEqual([(g.winner, g.plies) for g in first.games], [(g.winner, g.plies) for g in second.games])
+        self.assertEqual([g.game for g in first.games], [0, 1, 2, 3])
+        self.assertEqual(first.wins + first.losses + first.draws, 4)
+
+    def test_crash_loses(self):
+        result = play_game(Engine(CrashingAI), Engine(RANDOM_AI), 8, 8, 2, seed=0)
+        self.assertEqual((result.winner, result.reason, result.plies), (2, "crash", 0))
+        self.assertEqual(result.score(RANDOM_AI), 1.0)
+        self.assertEqual(GameResult.from_dict(result.to_dict()).to_dict(), result.to_dict())
+
+    def test_parallel_match_is_recorded(self):
+        a, b = Engine(RANDOM_AI, "a"), Engine(RANDOM_AI, "b")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.ckr")
+            result = run_match(a, b, games=4, workers=2, seed=5, record=path)
+            records = list(read_records(path))
+        self.assertEqual(sorted((r.black, r.white, r.result, [str(move) for move in r.moves]) for r in records),
+                         sorted((g.black, g.white, g.winner, g.moves) for g in result.games))
+        board = Board(8, 8, 2)
+        board.initialize_game()
+        player = 1
+        for move in records[0].moves:
+            board.make_move(move, player)
+            player = 3 - player
+        self.assertEqual(board.is_win(3 - player), records[0].result)
+
+    def test_engines_need_different_names(self):
+        with self.assertRaises(ValueError):
+            run_match(Engine(RANDOM_AI), Engine(RANDOM_AI), games=2, workers=1)
+
+
+class TestSPRT(unittest.TestCase):
+
+    def test_elo_conversion(self):
+        self.assertAlmostEqual(elo_to_score(0), 0.5)
+        self.assertAlmostEqual(score_to_elo(elo_to_score(120)), 120)
+        self.assertAlmostEqual(elo_to_score(-400), 1 / 11)
+
+    def test_balanced_pairs_are_even(self):
+        sprt = SPRT()
+        for score in (0, 0.5, 1, 1, 1, 1.5, 2):
+            sprt.add_pair(score)
+        self.assertEqual(sprt.pentanomial, [1, 1, 3, 1, 1])
+        elo, low, high = sprt.elo()
+        self.assertAlmostEqual(elo, 0)
+        self.assertAlmostEqual(low, -high)
+        self.assertLess(sprt.llr(), 0)
+        self.assertIsNone(sprt.status())
+
+    def test_decisions(self):
+        better, worse = SPRT(0, 20), SPRT(0, 20)
+        for _ in range(200):
+            better.add_pair(1.5)
+            worse.add_pair(0.5)
+        self.assertEqual(better.status(), "H1")
+        self.assertEqual(worse.status(), "H0")
+        self.assertGreater(better.elo()[1], 0)
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            SPRT(elo0=5, elo1=0)
+
+    def test_match_stops_when_decided(self):
+        result = run_sprt(Engine(RANDOM_AI), Engine(CrashingAI), SPRT(0, 50), max_games=400, workers=1)
+        self.assertEqual(result.sprt.status(), "H1")
+        self.assertLess(len(result.games), 400)
+        self.assertEqual(result.sprt.pairs * 2, len(result.games))
+        self.assertEqual(result.losses, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+This module has the parallel MCTS modes of StudentAI.
+
+Root parallelism: the AI's process pool runs StudentAI.workers independent searches from the same position,
+each with its own random seed, and the visit/win counts of the root children are summed before picking the
+move. The workers share nothing while they search, so the only cost is sending the AI and the board to them.
+
+Tree parallelism: StudentAI.workers threads share a single tree. Selection and expansion happen under a lock,
+and every node on the selected path gets a virtual loss (extra visits without wins) until its rollout comes
+back, so the other threads are steered towards different leaves. The rollouts themselves run in the process
+pool, which is where the CPU time goes; the threads mostly wait on it, so the GIL is not a bottleneck and the
+tree exists only once however many workers there are. A rollout job carries the leaf board and the playout
+settings, not the AI, and the board's per size tables are pickled as their size only (see SharedTable).
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+import copy
+import itertools
+import multiprocessing
+import random
+import threading
+import time
+from BatchRollout import BatchRollout
+
+_batch_engines = {}  # BatchRollout of every board size, built once by each worker process
+
+
+def get_pool(ai):
+    """
+    Returns the process pool of an AI, starting it on first use
+    @param ai: StudentAI
+    @return pool: multiprocessing.Pool with ai.workers processes
+    """
+    if ai.pool is None:
+        ai.pool = multiprocessing.Pool(ai.workers)
+    return ai.pool
+
+
+def _root_worker(args):
+    """
+    Runs one independent search in a worker process
+    @param args: (ai, board, time_limit, seed)
+    @return stats: list of (move sequence, visits, wins) for every root child
+    """
+    ai, board, time_limit, seed = args
+    random.seed(seed)
+    root = ai.run_mcts(board, time_limit)
+    return [(tuple(child.move.seq), child.visits, child.wins) for child in root.children]
+
+
+def merge_root_stats(results):
+    """
+    Sums the root child statistics of several searches
+    @param results: lists returned by the workers
+    @return stats: dict of move sequence -> [visits, wins]
+    """
+    stats = {}
+    for result in results:
+        for seq, visits, wins in result:
+            total = stats.setdefault(seq, [0, 0])
+            total[0] += visits
+            total[1] += wins
+    return stats
+
+
+def root_parallel_search(ai, board, time_limit):
+    """
+    Runs ai.workers searches from board in parallel and picks the move with the best merged win rate
+    @param ai: StudentAI, its color is the player to move
+    @param board: position to search
+    @param time_limit: seconds every worker searches for
+    @return move: a Move object from board.get_all_possible_moves, None if no worker expanded anything
+    """
+    seed = ai.seed if ai.seed is not None else random.getrandbits(32)
+    jobs = [(ai, board, time_limit, seed + i) for i in range(ai.workers)]
+    stats = merge_root_stats(get_pool(ai).map(_root_worker, jobs))
+    legal = {tuple(m.seq): m for moves in board.get_all_possible_moves(ai.color) for m in moves}
+    candidates = [seq for seq in stats if seq in legal]
+    if not candidates:
+        return None
+    # same choice as best_child(exploration_weight=0), on the merged counts
+    best = max(candidates, key=lambda seq: stats[seq][1] / (stats[seq][0] + 1))
+    return legal[best]
+
+
+def _rollout_worker(args):
+    """
+    Runs the rollouts of one leaf in a worker process, the way StudentAI.rollout does
+    @param args: (leaf board, player to move, color the wins count for, Playout, rollout_batch, seed)
+    @return (visits, wins): see StudentAI.run_rollouts
+    """
+    from StudentAI import run_rollouts
+
+    board, player, color, playout, batch, seed = args
+    random.seed(seed)
+    engine = None
+    if batch > 0:
+        engine = _batch_engines.get((board.col, board.row))
+        if engine is None:
+            engine = _batch_engines[board.col, board.row] = BatchRollout(board.col, board.row)
+    return run_rollouts(board, player, color, playout, batch, engine)
+
+
+def add_virtual_loss(node, amount):
+    """
+    Adds visits without wins to a node and its ancestors, or takes them back with a negative amount
+    @param node: deepest node of the path
+    @param amount: number of visits
+    @return :
+    """
+    while node:
+        node.update(amount, 0)
+        node = node.parent
+
+
+def tree_parallel_run(ai, board, time_limit, root=None):
+    """
+    Grows one tree from board with ai.workers threads, running the rollouts in the AI's process pool
+    @param ai: StudentAI, its color is the player to move
+    @param board: position to search
+    @param time_limit: seconds to search for
+    @param root: tree kept from the previous move to continue, a new tree is started when it is None
+    @return root: root of the tree
+    @raise : the first exception raised by a worker thread
+    """
+    from StudentAI import MCTSNode
+
+    if root is None:
+        root = MCTSNode(current_player=ai.color, remaining_pieces=board.black_count + board.white_count)
+    board = copy.deepcopy(board)  # working board, only touched under the lock
+    pool = get_pool(ai)
+    lock = threading.Lock()
+    visits_at_start = root.visits
+    start = time.time()
+    deadline = start + time_limit
+    stopped = []
+    seeds = itertools.count(ai.seed if ai.seed is not None else random.getrandbits(32))
+    errors = []
+
+    def worker():
+        try:
+            while time.time() < deadline and not stopped:
+                with lock:
+                    node, winner = ai.select_and_expand(root, board)
+                    if node is None:
+                        continue
+                    # the rollout runs outside the lock, so it gets its own copy of the leaf position
+                    leaf = copy.deepcopy(board) if winner is None else None
+                    ai.rewind(board, node, root)
+                    if winner is not None:
+                        ai.backpropagate(node, 1, ai.counts_as_win(winner))
+                        continue
+                    add_virtual_loss(node, ai.virtual_loss)
+                    job = (leaf, node.current_player, ai.color, ai.playout, ai.rollout_batch, next(seeds))
+                visits, wins = pool.apply(_rollout_worker, (job,))
+                with lock:
+                    add_virtual_loss(node, -ai.virtual_loss)
+                    ai.backpropagate(node, visits, wins)
+                    if ai.stop_early and ai.time_manager.can_stop(root, visits_at_start, time.time() - start,
+                                                                  time_limit):
+                        stopped.append(True)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(ai.workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return root
@@ -0,0 +1,174 @@
+"""
+This module has the perft (performance test) move generation benchmark.
+
+perft counts the leaf nodes of the full game tree to a fixed depth. The counts only depend on the rules, so
+they are checked against the golden file (perft_golden.json) to catch move generation bugs, and the time it
+takes gives a nodes/second throughput number for every board engine.
+
+Usage:
+    python3 Perft.py                          # check every config/position against the golden file
+    python3 Perft.py --engine bitboard        # same, using BitBoard
+    python3 Perft.py --config 8x8/2 --depth 5 # limit to one config and a maximum depth
+    python3 Perft.py --update                 # rewrite the golden counts (only after a deliberate rules change)
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from BoardClasses import Board
+from BitBoard import BitBoard
+import Checker
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perft_golden.json")
+ENGINES = {"board": Board, "bitboard": BitBoard}
+
+
+def perft(board, color, depth):
+    """
+    Counts the leaf nodes of the game tree below the current position
+    @param board: Board or BitBoard to search, it is restored before returning
+    @param color: player to move, 1 (black) or 2 (white)
+    @param depth: number of plies to search
+    @return nodes: number of positions reached after exactly depth plies
+    """
+    if depth == 0:
+        return 1
+    moves = board.get_all_possible_moves(color)
+    if depth == 1:
+        return sum(len(checker_moves) for checker_moves in moves)
+    nodes = 0
+    for checker_moves in moves:
+        for move in checker_moves:
+            board.make_move_fast(move, color)
+            nodes += perft(board, 3 - color, depth - 1)
+            board.undo()
+    return nodes
+
+
+def load_position(board, position):
+    """
+    Replaces the pieces of a board with a stored position
+    @param board: Board or BitBoard to fill
+    @param position: rows separated by '/', one character per square: '.', 'b', 'w' (men) or 'B', 'W' (kings)
+    @return :
+    """
+    rows = position.split("/")
+    if isinstance(board, BitBoard):
+        board.black = board.white = board.kings = 0
+    board.black_count = board.white_count = 0
+    for r, line in enumerate(rows):
+        for c, square in enumerate(line):
+            color = square.upper()
+            if isinstance(board, BitBoard):
+                bit = 1 << (r * board.col + c)
+                if color == "B":
+                    board.black |= bit
+                elif color == "W":
+                    board.white |= bit
+                if square in "BW":
+                    board.kings |= bit
+            else:
+                checker = Checker.Checker(color, [r, c])
+                checker.is_king = square in "BW"
+                board.board[r][c] = checker
+            if color == "B":
+                board.black_count += 1
+            elif color == "W":
+                board.white_count += 1
+    board.compute_zobrist()
+    board.compute_evaluation()
+
+
+def position_string(board):
+    """
+    Returns the stored position format of a board, the inverse of load_position
+    @param board: Board or BitBoard
+    @return : position string
+    """
+    rows = []
+    for row in board.board:
+        rows.append("".join(piece.color if piece.is_king else piece.color.lower() for piece in row))
+    return "/".join(rows)
+
+
+def new_board(engine, config, position=None):
+    """
+    Builds a board for a golden file config
+    @param engine: Board or BitBoard class
+    @param config: dict with col, row and p
+    @param position: optional stored position, the initial position is used when it is None
+    @return board: the new board
+    """
+    board = engine(config["col"], config["row"], config["p"])
+    board.initialize_game()
+    if position is not None:
+        load_position(board, position)
+    return board
+
+
+def run(engine, golden, config_name=None, max_depth=None, update=False, fh=None):
+    """
+    Runs perft for every config/position of the golden file and compares the counts
+    @param engine: Board or BitBoard class
+    @param golden: parsed golden file
+    @param config_name: only run the config with this name (e.g. '8x8/2') when given
+    @param max_depth: do not search deeper than this when given
+    @param update: store the computed counts in golden instead of comparing them
+    @param fh: file object for the report, stdout by default
+    @return ok: True if every count matched
+    """
+    ok = True
+    total_nodes = 0
+    total_time = 0.0
+    for config in golden["configs"]:
+        if config_name is not None and config["name"] != config_name:
+            continue
+        for entry in config["positions"]:
+            depth = entry["depth"] if max_depth is None else min(entry["depth"], max_depth)
+            counts = []
+            for d in range(1, depth + 1):
+                board = new_board(engine, config, entry.get("position"))
+                start = time.perf_counter()
+                nodes = perft(board, entry["turn"], d)
+                elapsed = time.perf_counter() - start
+                counts.append(nodes)
+                total_nodes += nodes
+                total_time += elapsed
+                expected = entry["counts"][d - 1] if d <= len(entry["counts"]) else None
+                status = "" if update else ("ok" if nodes == expected else "FAIL (expected %s)" % expected)
+                ok = ok and (update or nodes == expected)
+                print("%-7s %-10s depth %d %12d nodes %8.3fs %12.0f nodes/s %s" % (
+                    config["name"], entry["name"], d, nodes, elapsed, nodes / elapsed if elapsed else 0, status),
+                    file=fh)
+            if update:
+                entry["counts"] = counts
+    if total_time:
+        print("total %d nodes in %.3fs: %.0f nodes/s" % (total_nodes, total_time, total_nodes / total_time), file=fh)
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="perft move generation benchmark")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="board")
+    parser.add_argument("--config", help="only run this config, e.g. 8x8/2")
+    parser.add_argument("--depth", type=int, help="maximum depth")
+    parser.add_argument("--golden", default=GOLDEN_PATH)
+    parser.add_argument("--update", action="store_true", help="rewrite the golden counts")
+    args = parser.parse_args()
+
+    with open(args.golden) as f:
+        golden = json.load(f)
+    passed = run(ENGINES[args.engine], golden, args.config, args.depth, args.update)
+    if args.update:
+        with open(args.golden, "w") as f:
+            json.dump(golden, f, indent=2)
+            f.write("\n")
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,38 @@
+import json
+import unittest
+from BoardClasses import Board
+from BitBoard import BitBoard
+from Perft import GOLDEN_PATH, new_board, perft, position_string
+
+
+class TestPerftGolden(unittest.TestCase):
+
+    def setUp(self):
+        with open(GOLDEN_PATH) as f:
+            self.golden = json.load(f)
+
+    def check_engine(self, engine, max_depth):
+        for config in self.golden["configs"]:
+            for entry in config["positions"]:
+                for depth in range(1, min(entry["depth"], max_depth) + 1):
+                    board = new_board(engine, config, entry["position"])
+                    self.assertEqual(perft(board, entry["turn"], depth), entry["counts"][depth - 1],
+                                     "%s %s depth %d" % (config["name"], entry["name"], depth))
+
+    def test_board_matches_golden(self):
+        self.check_engine(Board, 3)
+
+    def test_bitboard_matches_golden(self):
+        self.check_engine(BitBoard, 5)
+
+    def test_perft_restores_position(self):
+        """Ensure perft leaves the board exactly as it found it."""
+        for engine in (Board, BitBoard):
+            board = new_board(engine, self.golden["configs"][1], None)
+            before = position_string(board)
+            perft(board, 1, 3)
+            self.assertEqual(position_string(board), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
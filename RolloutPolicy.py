@@ -0,0 +1,158 @@
+"""
+This module has the rollout policies of the MCTS engines and the Playout Class that runs a rollout with one.
+
+A policy only picks one move out of the legal moves of a position. Playout plays the policy's moves until the
+game ends or max_depth plies were played; a truncated game is scored by the board's evaluation, turned into a
+win probability by a logistic curve, so short rollouts still tell a winning position from a losing one.
+Rollouts are played on the board they are given with make_move_fast and undone at the end, nothing is copied.
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+import math
+import random
+
+
+class RandomPolicy:
+    """
+    This class describes the uniform random policy
+    """
+    def choose(self, board, moves, player, rng):
+        """
+        Picks a move
+        @param board: position the moves are legal in
+        @param moves: flat list of legal Move objects, not empty
+        @param player: player to move, 1 or 2
+        @param rng: random.Random or the random module
+        @return move: one of moves
+        """
+        return rng.choice(moves)
+
+
+class CaptureFirstPolicy:
+    """
+    This class describes the policy taking the move that captures the most pieces. Captures are already
+    mandatory, so this only chooses between capture sequences; quiet moves are picked at random.
+    """
+    def choose(self, board, moves, player, rng):
+        """
+        Picks a move, see RandomPolicy.choose
+        """
+        first = moves[0].seq
+        if abs(first[0][0] - first[1][0]) != 2:
+            return rng.choice(moves)
+        longest = max(len(move.seq) for move in moves)
+        return rng.choice([move for move in moves if len(move.seq) == longest])
+
+
+class GreedyPolicy:
+    """
+    This class describes the policy taking the move with the best board.evaluate_move, ties broken at random
+    """
+    def choose(self, board, moves, player, rng):
+        """
+        Picks a move, see RandomPolicy.choose
+        """
+        gains = [board.evaluate_move(move, player) for move in moves]
+        best = max(gains)
+        return rng.choice([move for move, gain in zip(moves, gains) if gain == best])
+
+
+class EpsilonGreedyPolicy(GreedyPolicy):
+    """
+    This class describes the greedy policy that plays a random move instead with probability epsilon
+    """
+    def __init__(self, epsilon=0.1):
+        """
+        @param epsilon: probability of a random move
+        @return :
+        """
+        self.epsilon = epsilon
+
+    def choose(self, board, moves, player, rng):
+        """
+        Picks a move, see RandomPolicy.choose
+        """
+        if rng.random() < self.epsilon:
+            return rng.choice(moves)
+        return GreedyPolicy.choose(self, board, moves, player, rng)
+
+
+POLICIES = {
+    "random": RandomPolicy,
+    "capture": CaptureFirstPolicy,
+    "greedy": GreedyPolicy,
+    "epsilon": EpsilonGreedyPolicy,
+}
+
+
+def get_policy(name, **options):
+    """
+    Builds a policy by name
+    @param name: one of POLICIES
+    @param options: constructor arguments of the policy, e.g. epsilon
+    @return policy: the policy object
+    @raise ValueError: if the name is unknown
+    """
+    if name not in POLICIES:
+        raise ValueError("unknown rollout policy: %s" % name)
+    return POLICIES[name](**options)
+
+
+class Playout:
+    """
+    This class describes how rollouts are played: the policy, where they stop, and how results are scored
+    """
+    def __init__(self, policy=None, max_depth=1000, cutoff_scale=200.0, draw_value=0.5):
+        """
+        @param policy: policy object picking the moves, GreedyPolicy when None
+        @param max_depth: plies played before the position is scored with the evaluation instead
+        @param cutoff_scale: evaluation lead that gives a win probability of about 73% at the cutoff
+        @param draw_value: value of a drawn game
+        @return :
+        """
+        self.policy = policy if policy is not None else GreedyPolicy()
+        self.max_depth = max_depth
+        self.cutoff_scale = cutoff_scale
+        self.draw_value = draw_value
+
+    def run(self, board, player, color, rng=random):
+        """
+        Plays one rollout
+        @param board: Board or BitBoard, restored before returning
+        @param player: player to move, 1 or 2
+        @param color: player the result is for
+        @param rng: random.Random or the random module, passed to the policy
+        @return value: 1 for a win of color, 0 for a loss, draw_value for a draw, the win probability of color
+                       if the rollout was cut off
+        """
+        played = 0
+        try:
+            while played < self.max_depth:
+                result, moves = board.game_state(3 - player)
+                if result == -1:
+                    return self.draw_value
+                if result:
+                    return 1.0 if result == color else 0.0
+                moves = [m for checker_moves in moves for m in checker_moves]
+                if not moves:
+                    return 0.0 if player == color else 1.0
+                board.make_move_fast(self.policy.choose(board, moves, player, rng), player)
+                played += 1
+                player = 3 - player
+            return self.win_probability(board, color)
+        finally:
+            for _ in range(played):
+                board.undo()
+
+    def win_probability(self, board, color):
+        """
+        Turns the evaluation of a position into a win probability
+        @param board: position to score
+        @param color: player the probability is for
+        @return probability: a float between 0 and 1
+        """
+        return 1.0 / (1.0 + math.exp(-board.evaluate(color) / self.cutoff_scale))
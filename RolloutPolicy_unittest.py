@@ -0,0 +1,86 @@
+import random
+import unittest
+from BoardClasses import Board
+from Move import Move
+from Perft import load_position, position_string
+from RolloutPolicy import (RandomPolicy, CaptureFirstPolicy, GreedyPolicy, EpsilonGreedyPolicy, Playout,
+                           get_policy)
+
+
+def position(rows):
+    board = Board(8, 8, 2)
+    board.initialize_game()
+    load_position(board, "/".join(rows))
+    return board
+
+
+def legal_moves(board, player):
+    return [m for checker_moves in board.get_all_possible_moves(player) for m in checker_moves]
+
+
+class TestPolicies(unittest.TestCase):
+
+    def test_capture_first_takes_the_longest_capture(self):
+        board = position(["........", ".b...b..", "..w...w.", "........", "......w.", "........", "........",
+                          "........"])
+        moves = legal_moves(board, 1)
+        self.assertEqual(sorted(len(m.seq) for m in moves), [2, 3])
+        choice = CaptureFirstPolicy().choose(board, moves, 1, random.Random(0))
+        self.assertEqual(choice.seq, [(1, 5), (3, 7), (5, 5)])
+
+    def test_greedy_takes_the_best_move(self):
+        board = Board(8, 8, 3)
+        board.initialize_game()
+        moves = legal_moves(board, 1)
+        choice = GreedyPolicy().choose(board, moves, 1, random.Random(0))
+        self.assertEqual(board.evaluate_move(choice, 1), max(board.evaluate_move(m, 1) for m in moves))
+
+    def test_epsilon_greedy_extremes(self):
+        board = Board(8, 8, 3)
+        board.initialize_game()
+        moves = legal_moves(board, 1)
+        best = max(board.evaluate_move(m, 1) for m in moves)
+        rng = random.Random(0)
+        greedy = EpsilonGreedyPolicy(epsilon=0)
+        self.assertTrue(all(board.evaluate_move(greedy.choose(board, moves, 1, rng), 1) == best for _ in range(20)))
+        explorer = EpsilonGreedyPolicy(epsilon=1)
+        self.assertEqual(len({str(explorer.choose(board, moves, 1, rng)) for _ in range(200)}), len(moves))
+
+    def test_get_policy(self):
+        self.assertIsInstance(get_policy("random"), RandomPolicy)
+        self.assertEqual(get_policy("epsilon", epsilon=0.3).epsilon, 0.3)
+        with self.assertRaises(ValueError):
+            get_policy("minimax")
+
+
+class TestPlayout(unittest.TestCase):
+
+    def test_finished_games_are_scored_exactly(self):
+        stuck = position(["W......."] + ["........"] * 6 + ["b......."])
+        self.assertEqual(Playout().run(stuck, 1, 1), 0.0)
+        self.assertEqual(Playout().run(stuck, 1, 2), 1.0)
+        tied = position(["B......."] + ["........"] * 6 + [".......W"])
+        tied.tie_counter = tied.tie_max
+        self.assertEqual(Playout(draw_value=0.25).run(tied, 1, 1), 0.25)
+
+    def test_cutoff_gives_a_win_probability(self):
+        board = Board(8, 8, 3)
+        board.initialize_game()
+        self.assertEqual(Playout(max_depth=0).run(board, 1, 1), 0.5)
+        board.make_move(Move([(2, 1), (3, 2)]), 1)
+        ahead = Playout(max_depth=0).run(board, 2, 1)
+        self.assertGreater(ahead, 0.5)
+        self.assertAlmostEqual(ahead + Playout(max_depth=0).run(board, 2, 2), 1.0)
+
+    def test_board_is_restored(self):
+        board = Board(8, 8, 3)
+        board.initialize_game()
+        before = position_string(board), board.zobrist, board.tie_counter
+        for name in ("random", "capture", "greedy", "epsilon"):
+            value = Playout(get_policy(name), max_depth=30).run(board, 1, 1, random.Random(1))
+            self.assertTrue(0.0 <= value <= 1.0)
+            self.assertEqual((position_string(board), board.zobrist, board.tie_counter), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
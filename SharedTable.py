@@ -0,0 +1,42 @@
+"""
+This module has the SharedTable Class, the base of the lookup tables kept per board size: Geometry,
+Zobrist.ZobristKeys and Evaluation.EvaluationTable.
+
+Each of those tables is built once per board size by SharedTable.shared (called by its module's get function),
+never changes afterwards, and is held by every board of that size. Deep copying a board (MCTS and the parallel
+searches copy boards often) keeps sharing it, and pickling a board sends only the table's class and size: the
+receiving process rebuilds it, or takes it from its own cache, with shared. The tables are deterministic, so
+every process gets the same values.
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+_tables = {}
+
+
+class SharedTable:
+    """
+    This class is the base of the immutable per board size tables. Subclasses are built as cls(col, row) and keep
+    col and row as attributes.
+    """
+    @classmethod
+    def shared(cls, col, row):
+        """
+        Returns the table of a board size, building it the first time the size is seen in this process
+        @param col: number of columns in the board
+        @param row: number of rows in the board
+        @return table: the cls object
+        """
+        key = (cls, col, row)
+        if key not in _tables:
+            _tables[key] = cls(col, row)
+        return _tables[key]
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return type(self).shared, (self.col, self.row)
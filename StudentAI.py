@@ -2,8 +2,16 @@
 import copy
 import math 
 import random
+import threading
 import time
+import numpy as np
+from BatchRollout import BatchRollout
+from RolloutPolicy import Playout, GreedyPolicy
+from TimeManager import TimeManager, GAME_TIME
 from BoardClasses import Board, InvalidMoveError, InvalidParameterError
+from BitBoard import BitBoard
+from AlphaBeta import AlphaBetaSearch
+import ParallelMCTS
 from Move import Move
 
 # Commands 
@@ -22,62 +30,167 @@ from Move import Move
 
 # Black is player 1, White is player 2 
 
+def run_rollouts(board, player, color, playout, batch=0, batch_engine=None):
+    """
+    Runs the rollouts of a leaf and returns (visits, wins): batch games on batch_engine, or one playout when batch
+    is 0. Wins are counted for color, draws count as wins. Used by StudentAI.rollout and the tree parallel workers.
+    """
+    if batch > 0:
+        winners = batch_engine.play(board, player, batch, max_plies=playout.max_depth,
+                                    rng=np.random.default_rng(random.getrandbits(32)))
+        return len(winners), int(np.count_nonzero((winners == color) | (winners == 0)))
+    return 1, playout.run(board, player, color)
+
+
 # Monte Carlo Tree Search Node
 class MCTSNode:
-    """Represents a node in the Monte Carlo Tree Search (MCTS) Tree."""
-
-    def __init__(self, board, move=None, parent=None, current_player=1):
-        self.board = copy.deepcopy(board)
+    """
+    Represents a node in the Monte Carlo Tree Search (MCTS) Tree.
+    Nodes hold no board: the position of a node is reached by replaying the moves on its path from the root
+    on the search's working board, and undoing them afterwards.
+    The visits/wins of the children are also kept in two arrays on the parent so UCB1 is scored over all
+    children at once; update keeps them in step with the children's own counters. The arrays are allocated when
+    the first child is added, leaves (most of the tree) have none.
+    The legal moves of a node are generated once, the first time it is expanded, into the untried queue that
+    expansion pops from, so no move gets two children.
+    """
+    __slots__ = ("move", "parent", "children", "visits", "wins", "current_player", "remaining_pieces",
+                 "index", "child_visits", "child_wins", "untried")
+
+    def __init__(self, move=None, parent=None, current_player=1, remaining_pieces=None):
         self.move = move
         self.parent = parent
         self.children = []
         self.visits = 0
         self.wins = 0
         self.current_player = current_player
+        self.remaining_pieces = remaining_pieces  # pieces left on the board at this node, None if unknown
+        self.index = 0  # position of this node in parent.children
+        self.child_visits = None  # allocated by add_child
+        self.child_wins = None
+        self.untried = None  # moves not expanded yet, best last; None until the moves are generated
+
+    def add_child(self, child):
+        """Appends child, allocating the statistic arrays for the first child and growing them when they are full."""
+        child.index = len(self.children)
+        if self.child_visits is None:
+            self.child_visits = np.zeros(4)
+            self.child_wins = np.zeros(4)
+        elif child.index == len(self.child_visits):
+            self.child_visits = np.concatenate((self.child_visits, np.zeros(child.index)))
+            self.child_wins = np.concatenate((self.child_wins, np.zeros(child.index)))
+        self.children.append(child)
+        self.child_visits[child.index] = child.visits
+        self.child_wins[child.index] = child.wins
+
+    def update(self, visits, wins):
+        """Adds visits and wins to this node and to its slot in the parent's arrays."""
+        self.visits += visits
+        self.wins += wins
+        if self.parent is not None:
+            self.parent.child_visits[self.index] += visits
+            self.parent.child_wins[self.index] += wins
 
     def is_fully_expanded(self):
         """Returns True if all possible moves have been explored."""
-        valid_moves = self.board.get_all_possible_moves(self.current_player)
-        return len(self.children) >= sum(len(moves) for moves in valid_moves)
+        return self.untried is not None and not self.untried
 
     def best_child(self, exploration_weight=1.4):
         """Selects the best child node using UCB1 formula."""
-        remaining_pieces = sum(
-            1 for row in self.board.board for piece in row if piece
-        )
-        # Reduce exploration weight in endgame
-        if remaining_pieces <= 6:
+        # Reduce exploration weight in endgame, the final choice (weight 0) stays a pure win rate comparison
+        if exploration_weight > 0 and self.remaining_pieces is not None and self.remaining_pieces <= 6:
             exploration_weight = 0.5
-        return max(
-            self.children,
-            key=lambda node: (node.wins / (node.visits + 1)) +
-            exploration_weight * math.sqrt(math.log(self.visits + 1) / (node.visits + 1))
-        )
+        count = len(self.children)
+        visits = self.child_visits[:count] + 1
+        scores = self.child_wins[:count] / visits + exploration_weight * np.sqrt(math.log(self.visits + 1) / visits)
+        return self.children[int(np.argmax(scores))]
 
 
 class StudentAI:
-    def __init__(self, col, row, p):
+    def __init__(self, col, row, p, bitboard=False, engine="mcts", workers=1, parallel="root", total_time=GAME_TIME):
         self.col = col
         self.row = row
         self.p = p
-        self.board = Board(col, row, p)
+        # bitboard=True swaps in the bitboard engine, which has the same API but much faster move generation
+        self.board = BitBoard(col, row, p) if bitboard else Board(col, row, p)
         self.board.initialize_game()
         self.color = 2
         self.opponent = {1: 2, 2: 1}
-        self.simulation_time = 10  # Default simulation time
+        self.simulation_time = 10  # Longest a move may search, the time manager may give it less
+        # splits the game clock of total_time seconds into per-move budgets and ends searches that cannot change
+        # their move
+        self.time_manager = TimeManager(total_time)
+        self.stop_early = True
+        # a move that is the only legal one is played at once; "bank" leaves the time it saved on the clock for
+        # later moves, "ponder" spends an ordinary move's budget growing the tree for the opponent's reply
+        self.forced_moves = "bank"
+        # background search on the opponent's time, see start_pondering
+        self.ponder_slice = 0.1  # seconds between checks for the opponent's move
+        self.pondering = None  # (thread, stop event, errors) while pondering
         self.move_cache = {}  # Cache for move evaluations
+        # "mcts" or "alphabeta": the alpha-beta engine deepens iteratively within the move's budget
+        self.engine = engine
+        if engine == "alphabeta":
+            self.searcher = AlphaBetaSearch()
+        elif engine != "mcts":
+            raise ValueError("unknown engine: %s" % engine)
+        # workers > 1 searches in parallel: "root" runs that many independent MCTS searches in a process pool
+        # and merges their root stats, "tree" has that many threads share one tree and farm rollouts out to it
+        if parallel not in ("root", "tree"):
+            raise ValueError("unknown parallel mode: %s" % parallel)
+        self.workers = workers
+        self.parallel = parallel
+        self.virtual_loss = 1  # visits added along a path while its rollout is pending in tree mode
+        self.seed = None  # base seed of the worker RNGs, random when None
+        self.pool = None
+        # keep the search tree between moves and continue from the subtree of the actual position
+        self.reuse_tree = True
+        self.root = None
+        self.root_key = None  # Zobrist key of the position at self.root
+        # how single rollouts pick their moves and where they are cut off and scored, see RolloutPolicy;
+        # draws count as wins, as in counts_as_win
+        self.playout = Playout(GreedyPolicy(), max_depth=1000, draw_value=1)
+        # games a leaf's rollout plays at once on the NumPy batch engine, 0 plays one playout
+        self.rollout_batch = 0
+        self.batch_engine = None
+
+    def __getstate__(self):
+        # the pool is not picklable, and workers need neither it nor the kept tree
+        state = self.__dict__.copy()
+        state["pool"] = None
+        state["root"] = None
+        state["pondering"] = None
+        return state
+
+    def close(self):
+        """Stops pondering and terminates the process pool; a later parallel search starts a new pool."""
+        try:
+            self.stop_pondering()
+        finally:
+            if self.pool is not None:
+                self.pool.terminate()
+                self.pool = None
 
     def board_signature(self, board):
-        """Generates a unique hash signature for a board state."""
-        return ''.join(str(piece) if piece else '.' for row in board.board for piece in row)
+        """Returns the board's Zobrist key (pieces, kings and side to move)."""
+        return board.zobrist
 
     def get_move(self, move):
         """Determines the AI's move using MCTS."""
+        self.time_manager.start_move()
+        try:
+            return self.choose_move(move)
+        finally:
+            self.time_manager.end_move()
+
+    def choose_move(self, move):
+        """Applies the opponent's move, searches within the time manager's budget and plays the result."""
         if len(move) != 0:
             try:
                 self.board.make_move(move, self.opponent[self.color])
             except InvalidMoveError:
                 return Move([(0, 0)])  # Safe fallback move
+            self.advance_tree(move)
         else:
             self.color = 1  # First move, set AI to Player 1
 
@@ -86,7 +199,14 @@ class StudentAI:
         if not legal_moves:
             return Move([(0, 0)])
 
-        best_move = self.mcts_search(self.board, self.simulation_time)
+        if len(legal_moves) == 1:
+            return self.play_forced_move(legal_moves[0])
+
+        time_limit = self.time_manager.budget(self.board, len(legal_moves), self.simulation_time)
+        if self.engine == "alphabeta":
+            best_move = self.searcher.search(self.board, self.color, time_limit)
+        else:
+            best_move = self.mcts_search(self.board, time_limit)
 
         if best_move is None or best_move.seq not in [m.seq for m in legal_moves]:
             best_move = random.choice(legal_moves) if legal_moves else Move([(0, 0)])  # Safe fallback
@@ -95,95 +215,205 @@ class StudentAI:
             self.board.make_move(best_move, self.color)
         except InvalidMoveError:
             return Move([(0, 0)])
+        self.advance_tree(best_move)
 
         return best_move
 
+    def play_forced_move(self, move):
+        """Plays the only legal move at once, then banks the time it saved or ponders on it, see forced_moves."""
+        self.board.make_move(move, self.color)
+        self.advance_tree(move)
+        if self.forced_moves == "ponder" and self.can_ponder():
+            # the budget an ordinary move would get here
+            self.ponder(self.time_manager.budget(self.board, 2, self.simulation_time))
+        return move
+
+    def can_ponder(self):
+        """Returns True if the engine keeps a single tree that pondering can grow."""
+        return self.engine == "mcts" and self.reuse_tree and not (self.workers > 1 and self.parallel == "root")
+
+    def pondering_root(self):
+        """Returns the kept tree of the current position, where the opponent is to move, or a new one."""
+        root = self.root
+        if root is None or self.root_key != self.board.zobrist:
+            root = MCTSNode(current_player=self.opponent[self.color],
+                            remaining_pieces=self.board.black_count + self.board.white_count)
+        self.root = root
+        self.root_key = self.board.zobrist
+        return root
+
+    def ponder(self, time_limit):
+        """Grows the kept tree below the current position, where the opponent is to move."""
+        self.grow_tree(self.board, time_limit, self.pondering_root())
+
+    def start_pondering(self):
+        """Keeps growing the tree below the current position on a background thread until stop_pondering."""
+        if self.pondering is not None or not self.can_ponder():
+            return
+        root = self.pondering_root()
+        stop = threading.Event()
+        errors = []
+
+        def worker():
+            try:
+                while not stop.is_set():
+                    self.grow_tree(self.board, self.ponder_slice, root)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=worker, daemon=True)
+        self.pondering = (thread, stop, errors)
+        thread.start()
+
+    def stop_pondering(self):
+        """Stops the pondering thread, leaving the tree it grew in self.root for advance_tree."""
+        if self.pondering is None:
+            return
+        thread, stop, errors = self.pondering
+        self.pondering = None
+        stop.set()
+        thread.join()
+        if errors:
+            raise errors[0]
+
+    def advance_tree(self, move):
+        """Moves the kept search tree down to the child reached by move, or drops it if move was never expanded."""
+        if self.root is not None:
+            for child in self.root.children:
+                if child.move.seq == move.seq:
+                    child.parent = None
+                    self.root = child
+                    self.root_key = self.board.zobrist
+                    return
+        self.root = None
+
+    def reusable_root(self, board):
+        """Returns the kept tree if it was searched from board with us to move, otherwise None."""
+        root = self.root
+        if root is None or root.current_player != self.color or self.root_key != board.zobrist:
+            return None
+        return root
+
     def mcts_search(self, board, time_limit=10):
         """Performs Monte Carlo Tree Search to determine the best move."""
-        root = MCTSNode(copy.deepcopy(board), current_player=self.color)
+        if self.workers > 1 and self.parallel == "root":
+            self.root = None  # every worker grows its own tree, there is no single tree to keep
+            return ParallelMCTS.root_parallel_search(self, board, time_limit)
+        root = self.grow_tree(board, time_limit, self.reusable_root(board) if self.reuse_tree else None)
+        self.root = root if self.reuse_tree else None
+        self.root_key = board.zobrist
+        if not root.children:
+            return None
+        return root.best_child(exploration_weight=0).move
+
+    def grow_tree(self, board, time_limit, root=None):
+        """Grows one tree from board, with threads in tree-parallel mode, and returns its root."""
+        if self.workers > 1:
+            return ParallelMCTS.tree_parallel_run(self, board, time_limit, root)
+        return self.run_mcts(board, time_limit, root)
+
+    def run_mcts(self, board, time_limit, root=None):
+        """Grows a search tree from board for time_limit seconds and returns its root, continuing root if given."""
+        if root is None:
+            root = MCTSNode(current_player=self.color, remaining_pieces=board.black_count + board.white_count)
+        board = copy.deepcopy(board)  # the one working board every iteration replays its path on
+        visits_at_start = root.visits
         start_time = time.time()
 
         while time.time() - start_time < time_limit:
-            node = root
-
-            # Selection: Traverse the tree
-            while node.is_fully_expanded() and node.children:
-                node = node.best_child()
-
-            # Expansion: Expand unexplored child nodes
-            possible_moves = node.board.get_all_possible_moves(node.current_player)
-
-            # Force captures if available
-            jump_moves = [m for sublist in possible_moves for m in sublist if len(m.seq) > 1]
-            if jump_moves:
-                possible_moves = [jump_moves]
-
-            flattened_moves = [m for sublist in possible_moves for m in sublist]
-            if not flattened_moves:
-                return random.choice(flattened_moves) if flattened_moves else Move([])
-
-            move = max(flattened_moves, key=lambda m: self.evaluate_board_with_move(node.board, m, node.current_player))
-
-            # Apply move and create a new node
-            new_board = copy.deepcopy(node.board)
-            try:
-                new_board.make_move(move, node.current_player)
-                new_node = MCTSNode(new_board, move, node, current_player=self.opponent[node.current_player])
-                node.children.append(new_node)
-                node = new_node
-            except InvalidMoveError:
+            node, winner = self.select_and_expand(root, board)
+            if node is None:
                 continue  # Skip invalid moves
 
             # Simulation: Run biased rollouts
-            winner = self.simulate_random_game(new_board, node.current_player)
+            if winner is None:
+                visits, wins = self.rollout(board, node.current_player)
+            else:
+                visits, wins = 1, self.counts_as_win(winner)
+            self.rewind(board, node, root)
 
             # Backpropagation: Update node statistics
-            while node:
-                node.visits += 1
-                if winner == self.color or winner == 0:  # 0 means draw
-                    node.wins += 1
-                node = node.parent
-
-        best_child = root.best_child(exploration_weight=0)
-        return best_child.move if best_child and best_child.move else random.choice(flattened_moves)
-
-    def simulate_random_game(self, board, current_player):
-        """Simulates a biased game rollout."""
-        sim_board = copy.deepcopy(board)
-
-        for _ in range(1000):
-            result = sim_board.is_win("B" if current_player == 1 else "W")
-            if result != 0:
-                return 0 if result == -1 else result  # -1 is tie, return 0
-
-            possible_moves_nested = sim_board.get_all_possible_moves(current_player)
-            possible_moves = [m for sublist in possible_moves_nested for m in sublist]
-
-            if not possible_moves:
-                return self.opponent[current_player]  # If no moves, opponent wins
-
-            move = max(possible_moves, key=lambda m: self.evaluate_board_with_move(sim_board, m, current_player))
-
-            try:
-                sim_board.make_move(move, current_player)
-            except InvalidMoveError:
-                continue  # Skip and retry
-            
-            current_player = self.opponent[current_player]
-
-        return 0  # If no decisive outcome, count as a tie
-
-    def evaluate_board_with_move(self, board, move, player):
-        """Applies a move to a temporary board and evaluates it."""
-        new_board = copy.deepcopy(board)
+            self.backpropagate(node, visits, wins)
+
+            if self.stop_early and self.time_manager.can_stop(root, visits_at_start, time.time() - start_time,
+                                                              time_limit):
+                break
+
+        return root
+
+    def select_and_expand(self, root, board):
+        """
+        Runs the selection and expansion steps of one iteration, playing the moves of the path on board.
+        Returns (new child, None) when a child was added and needs a rollout, (node, winner) when selection
+        ended on a terminal node, or (None, None) when the chosen move turned out to be invalid.
+        Unless the move was invalid, board is left at the returned node's position and rewind takes it back.
+        """
+        node = root
+
+        # Selection: Traverse the tree
+        while node.children and node.is_fully_expanded():
+            node = node.best_child()
+            board.make_move_fast(node.move, node.parent.current_player)
+
+        # Expansion: Expand unexplored child nodes
+        if node.untried is None:
+            node.untried = self.untried_moves(board, node.current_player)
+        if not node.untried:
+            # Terminal node: the player to move has lost
+            return node, self.opponent[node.current_player]
+        move = node.untried.pop()
+
+        # Apply move and create a new node
         try:
-            new_board.make_move(move, player)
-            return self.evaluate_board(new_board, player)
+            board.make_move(move, node.current_player)
         except InvalidMoveError:
-            return -float("inf")  # Assign a very low score to invalid moves
+            self.rewind(board, node, root)
+            return None, None
+        new_node = MCTSNode(move, node, self.opponent[node.current_player], board.black_count + board.white_count)
+        node.add_child(new_node)
+        return new_node, None
+
+    def untried_moves(self, board, player):
+        """Returns the legal moves of player ordered for expansion, the best evaluated move last."""
+        possible_moves = board.get_all_possible_moves(player)
+
+        # Force captures if available
+        jump_moves = [m for sublist in possible_moves for m in sublist if len(m.seq) > 1]
+        if jump_moves:
+            possible_moves = [jump_moves]
+
+        flattened_moves = [m for sublist in possible_moves for m in sublist]
+        # stable sort, so among equally evaluated moves the first one generated is expanded first
+        ordered = sorted(flattened_moves, key=lambda m: self.evaluate_board_with_move(board, m, player), reverse=True)
+        ordered.reverse()
+        return ordered
+
+    def rewind(self, board, node, root):
+        """Undoes the moves select_and_expand played to reach node from root."""
+        while node is not root:
+            board.undo()
+            node = node.parent
+
+    def counts_as_win(self, winner):
+        """Returns 1 if a game result counts as a win for us (draws do), else 0."""
+        return 1 if winner == self.color or winner == 0 else 0  # 0 means draw
+
+    def backpropagate(self, node, visits, wins):
+        """Adds the results of visits simulations, wins of them won, to node and all its ancestors."""
+        while node:
+            node.update(visits, wins)
+            node = node.parent
+
+    def rollout(self, board, player):
+        """Runs the rollouts of a leaf and returns (visits, wins): rollout_batch batched games or one playout."""
+        if self.rollout_batch > 0 and self.batch_engine is None:
+            self.batch_engine = BatchRollout(self.col, self.row)
+        return run_rollouts(board, player, self.color, self.playout, self.rollout_batch, self.batch_engine)
+
+    def evaluate_board_with_move(self, board, move, player):
+        """Scores the position after a move from the board's evaluation and the move's delta, without playing it."""
+        return board.evaluate(player) + board.evaluate_move(move, player)
 
     def evaluate_board(self, board, color):
-        """Calculates material and king advantage."""
-        my_pieces = sum(1 for row in board.board for piece in row if piece and piece.color == color)
-        opponent_pieces = sum(1 for row in board.board for piece in row if piece and piece.color == self.opponent[color])
-        return my_pieces - opponent_pieces
+        """Returns the board's incrementally kept evaluation for color."""
+        return board.evaluate(color)
@@ -0,0 +1,123 @@
+"""
+This module has the TimeManager Class, which splits the game clock into per-move search budgets.
+
+The referee gives every AI one clock for the whole game (GAME_TIME seconds in main.py, counted by
+Communicator.accumulated_time), and the owner of the manager passes that clock in. The manager keeps its own
+copy of that clock by timing every get_move, guesses how many moves are left from the number of pieces on the
+board (the estimate of Vincent_StudentAI.get_estimated_remaining_moves), and gives every move an equal share of
+what is left after a safety margin. Forced moves get no time at all, and a search may stop before its budget
+when the move it is going to play can no longer change.
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+import time
+
+GAME_TIME = 1200 # seconds on each player's clock in the games main.py runs
+
+
+class TimeManager:
+    """
+    This class describes the clock of one player
+    """
+    def __init__(self, total_time, safety_margin=10, moves_per_piece=3, min_moves=10, min_move_time=0.05):
+        """
+        Intializes the clock
+        @param total_time: seconds on the player's clock for the whole game, e.g. GAME_TIME
+        @param safety_margin: seconds never handed out, covering the referee's communication overhead
+        @param moves_per_piece: moves expected per piece left on the board
+        @param min_moves: fewest moves the rest of the game is expected to take
+        @param min_move_time: shortest budget given to a move that is not forced
+        @return :
+        """
+        self.total_time = total_time
+        self.safety_margin = safety_margin
+        self.moves_per_piece = moves_per_piece
+        self.min_moves = min_moves
+        self.min_move_time = min_move_time
+        self.used = 0.0
+        self.move_start = None
+
+    @property
+    def remaining(self):
+        """
+        Seconds left on the clock, counting the move being played
+        @return : a float, can be negative once the clock ran out
+        """
+        used = self.used
+        if self.move_start is not None:
+            used += time.time() - self.move_start
+        return self.total_time - used
+
+    def start_move(self):
+        """
+        Starts timing a move, call it as soon as the opponent's move arrives
+        @return :
+        """
+        self.move_start = time.time()
+
+    def end_move(self):
+        """
+        Stops timing the current move and charges it to the clock
+        @return elapsed: seconds the move took
+        """
+        if self.move_start is None:
+            return 0.0
+        elapsed = time.time() - self.move_start
+        self.used += elapsed
+        self.move_start = None
+        return elapsed
+
+    def estimate_remaining_moves(self, board):
+        """
+        Guesses how many more moves we have to make
+        @param board: current position
+        @return moves: an int, at least min_moves
+        """
+        return max(self.min_moves, (board.black_count + board.white_count) * self.moves_per_piece)
+
+    def budget(self, board, legal_moves, max_time=None):
+        """
+        Returns the search time of the current move
+        @param board: current position
+        @param legal_moves: number of legal moves, a single one is played without searching
+        @param max_time: upper bound for the budget, None for no bound
+        @return seconds: 0 for a forced move, else the move's share of the clock
+        """
+        if legal_moves <= 1:
+            return 0.0
+        share = (self.remaining - self.safety_margin) / self.estimate_remaining_moves(board)
+        share = max(self.min_move_time, share)
+        if max_time is not None:
+            share = min(share, max_time)
+        return share
+
+    def can_stop(self, root, visits_at_start, elapsed, time_limit):
+        """
+        Tells if a search can end early because no child of the root can overtake the best one in the time
+        left, even if every remaining simulation went to one rival and won while the best child lost its own.
+        The best child is the one best_child(exploration_weight=0) picks. Roots with unexpanded moves never stop.
+        @param root: MCTSNode being searched
+        @param visits_at_start: root.visits when this search started
+        @param elapsed: seconds searched so far
+        @param time_limit: budget of the search
+        @return : True if the move can be played now
+        """
+        count = len(root.children)
+        if count == 0 or elapsed <= 0 or not root.is_fully_expanded():
+            return False
+        if count == 1:
+            return True
+        rate = (root.visits - visits_at_start) / elapsed
+        left = rate * max(0.0, time_limit - elapsed)
+        visits = root.child_visits[:count]
+        wins = root.child_wins[:count]
+        scores = wins / (visits + 1)
+        best = int(scores.argmax())
+        worst_best = wins[best] / (visits[best] + 1 + left)
+        rivals = (wins + left) / (visits + left + 1)
+        rivals[best] = -1.0
+        return bool(rivals.max() < worst_best)
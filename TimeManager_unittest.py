@@ -0,0 +1,80 @@
+import time
+import unittest
+from BoardClasses import Board
+from Move import Move
+from Perft import load_position
+from StudentAI import StudentAI, MCTSNode
+from TimeManager import TimeManager, GAME_TIME
+
+
+def root_with_children(stats):
+    root = MCTSNode(current_player=1, remaining_pieces=24)
+    root.untried = []
+    for i, (visits, wins) in enumerate(stats):
+        child = MCTSNode(Move([(0, i), (1, i)]), root, 2, 24)
+        root.add_child(child)
+        child.update(visits, wins)
+        root.visits += visits
+        root.wins += wins
+    return root
+
+
+class TestTimeManager(unittest.TestCase):
+
+    def setUp(self):
+        self.board = Board(8, 8, 3)
+        self.board.initialize_game()
+
+    def test_budget_shares_the_clock(self):
+        clock = TimeManager(total_time=1200, safety_margin=10)
+        self.assertEqual(clock.estimate_remaining_moves(self.board), 72)
+        self.assertAlmostEqual(clock.budget(self.board, 7), 1190 / 72, places=3)
+        self.assertEqual(clock.budget(self.board, 7, max_time=10), 10)
+        self.assertEqual(clock.budget(self.board, 1), 0)
+        clock.used = 1195
+        self.assertEqual(clock.budget(self.board, 7), clock.min_move_time)
+
+    def test_moves_are_charged_to_the_clock(self):
+        clock = TimeManager(total_time=100)
+        clock.start_move()
+        time.sleep(0.05)
+        self.assertLess(clock.remaining, 100 - 0.04)
+        elapsed = clock.end_move()
+        self.assertGreaterEqual(elapsed, 0.04)
+        self.assertAlmostEqual(clock.remaining, 100 - elapsed)
+
+    def test_can_stop_only_when_the_best_child_is_safe(self):
+        clock = TimeManager(GAME_TIME)
+        root = root_with_children([(900, 800), (50, 10), (50, 5)])
+        # 1000 visits in one second: another second could still change the move, a hundredth cannot
+        self.assertFalse(clock.can_stop(root, 0, 1.0, 2.0))
+        self.assertTrue(clock.can_stop(root, 0, 1.0, 1.01))
+        root.untried = [Move([(0, 7), (1, 7)])]
+        self.assertFalse(clock.can_stop(root, 0, 1.0, 1.01))
+
+    def test_endgame_final_choice_has_no_exploration(self):
+        root = root_with_children([(100, 60), (1, 0)])
+        root.remaining_pieces = 6
+        self.assertIs(root.best_child(), root.children[1])  # endgame exploration favors the unvisited move
+        self.assertIs(root.best_child(exploration_weight=0), root.children[0])
+        self.assertTrue(TimeManager(GAME_TIME).can_stop(root, 0, 1.0, 1.01))
+
+    def test_forced_move_is_played_without_searching(self):
+        ai = StudentAI(8, 8, 2)
+        load_position(ai.board, "/".join([".b......", "..w....."] + ["........"] * 5 + ["......W."]))
+        start = time.time()
+        move = ai.get_move(Move([]))
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(move.seq, [(0, 1), (2, 3)])
+        self.assertLess(ai.time_manager.used, 0.5)
+
+    def test_clock_comes_from_the_constructor(self):
+        self.assertEqual(StudentAI(8, 8, 2).time_manager.total_time, GAME_TIME)
+        ai = StudentAI(8, 8, 2, total_time=60)
+        self.assertEqual(ai.time_manager.remaining, 60)
+        clock = ai.time_manager
+        self.assertAlmostEqual(clock.budget(ai.board, 7), (60 - 10) / clock.estimate_remaining_moves(ai.board))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,278 @@
+"""
+This module has the Tournament Class, a round robin between any number of AIs with Elo ratings.
+
+Every pair of engines in the roster plays games_per_pairing games, colors alternating, and all the games of the
+tournament are played by one MatchRunner process pool. Every finished game is appended to a JSON lines file right
+away; a tournament started again on the same file only plays the games that are not in it yet, so an interrupted
+run resumes where it stopped. A game is identified by its black engine, white engine and seed, so engines can be
+added to or removed from the roster between runs.
+
+Ratings are computed the way BayesElo does it: a Bradley-Terry model where the first player gets an advantage
+and draws have their own probability,
+    P(black wins) = f(r_black - r_white + advantage - draw_elo)
+    P(white wins) = f(r_white - r_black - advantage - draw_elo)
+    P(draw) = 1 - P(black wins) - P(white wins),  f(x) = 1 / (1 + 10^(-x / 400))
+plus a prior of virtual draws of every engine against an average opponent, which keeps the ratings of engines
+that won or lost everything finite. Ratings, advantage and draw_elo are the maximum of the posterior, the
+ratings average 0, and the error bars come from the curvature of the posterior.
+
+Command line: python3 Tournament.py {results.jsonl} {engine} {engine} ... [--games N] [--workers N]
+Engines are given as in MatchRunner: "module", "module:Class" or the path of an executable AI.
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import MatchRunner
+from MatchRunner import Engine, GameResult
+
+# starting values of the color advantage and the draw band, the defaults of BayesElo
+ADVANTAGE = 32.8
+DRAW_ELO = 97.3
+# bounds of the fitted values
+MAX_ADVANTAGE = 400.0
+MAX_DRAW_ELO = 400.0
+
+
+class Tournament:
+    """
+    This class describes a round robin tournament stored in a results file
+    """
+    def __init__(self, roster, path, games_per_pairing=2, col=8, row=8, p=2, seed=0, bitboard=False):
+        """
+        @param roster: list of MatchRunner.Engine
+        @param path: JSON lines file the results are appended to
+        @param games_per_pairing: games every pair of engines plays, even numbers give both the same colors
+        @param col: number of columns in the board
+        @param row: number of rows in the board
+        @param p: number of rows filled with checker pieces at the start
+        @param seed: game g of every pairing is played with seed + g
+        @param bitboard: use BitBoard for the referee board
+        @return :
+        @raise ValueError: if two engines have the same name or there are fewer than two
+        """
+        names = [engine.name for engine in roster]
+        if len(set(names)) != len(names):
+            raise ValueError("engine names must be unique")
+        if len(roster) < 2:
+            raise ValueError("a tournament needs at least two engines")
+        self.roster = list(roster)
+        self.path = path
+        self.games_per_pairing = games_per_pairing
+        self.col = col
+        self.row = row
+        self.p = p
+        self.seed = seed
+        self.bitboard = bitboard
+
+    def load_results(self):
+        """
+        Reads the results stored so far, a line that was cut off by an interrupted run is ignored
+        @return results: list of GameResult, in file order
+        """
+        results = []
+        if not os.path.exists(self.path):
+            return results
+        with open(self.path) as fh:
+            for line in fh:
+                try:
+                    results.append(GameResult.from_dict(json.loads(line)))
+                except (ValueError, TypeError):
+                    continue
+        return results
+
+    def schedule(self):
+        """
+        Lists every game of the tournament
+        @return jobs: list of MatchRunner.play_game argument tuples, the game index counting over the whole list
+        """
+        jobs = []
+        for i, a in enumerate(self.roster):
+            for b in self.roster[i + 1:]:
+                for game in MatchRunner.schedule(a, b, self.games_per_pairing, self.col, self.row, self.p,
+                                                 self.seed, self.bitboard):
+                    jobs.append(game[:6] + (len(jobs),) + game[7:])
+        return jobs
+
+    def pending(self):
+        """
+        Lists the games of the tournament that are not in the results file yet
+        @return jobs: list of MatchRunner.play_game argument tuples
+        """
+        done = {(result.black, result.white, result.seed) for result in self.load_results()}
+        return [job for job in self.schedule() if (job[0].name, job[1].name, job[5]) not in done]
+
+    def run(self, workers=None, callback=None):
+        """
+        Plays the pending games, appending every result to the file as soon as its game ends
+        @param workers: number of processes, see MatchRunner.run_jobs
+        @param callback: function called with every GameResult after it was saved
+        @return results: list of GameResult of the games played by this call
+        """
+        with open(self.path, "a+") as fh:
+            if fh.tell():
+                fh.seek(fh.tell() - 1)
+                if fh.read(1) != "\n":
+                    fh.write("\n")  # the last line was cut off, start on a fresh one
+            def save(result):
+                fh.write(json.dumps(result.to_dict()) + "\n")
+                fh.flush()
+                if callback is not None:
+                    callback(result)
+
+            return MatchRunner.run_jobs(self.pending(), workers, save)
+
+    def ratings(self, prior=2.0):
+        """
+        Computes the ratings of the roster from the stored results, see compute_ratings
+        @param prior: number of virtual draws of every engine
+        @return ratings: list of (name, elo, error, games, score) tuples, best first
+        """
+        names = [engine.name for engine in self.roster]
+        results = [result for result in self.load_results() if result.black in names and result.white in names]
+        return compute_ratings(names, results, prior)[0]
+
+
+def _f(x):
+    """
+    Internal helper. Logistic curve of the Elo scale.
+    @param x: Elo difference
+    @return : the probability it gives
+    """
+    return 1.0 / (1.0 + 10.0 ** (-x / 400.0))
+
+
+def _log_posterior(elos, advantage, draw_elo, counts, prior):
+    """
+    Internal helper for compute_ratings. Logarithm of the posterior probability of a set of ratings, up to a
+    constant.
+    @param elos: list of ratings
+    @param advantage: Elo advantage of black, the first player
+    @param draw_elo: Elo width of the draw band
+    @param counts: dict (black index, white index) -> [black wins, draws, white wins]
+    @param prior: number of virtual draws of every engine against an opponent rated 0 without color advantage
+    @return : a float
+    """
+    total = 0.0
+    for (black, white), (wins, draws, losses) in counts.items():
+        delta = elos[black] - elos[white] + advantage
+        black_wins = _f(delta - draw_elo)
+        white_wins = _f(-delta - draw_elo)
+        total += wins * math.log(black_wins) + losses * math.log(white_wins)
+        total += draws * math.log(max(1e-300, 1.0 - black_wins - white_wins))
+    for elo in elos:
+        total += prior * math.log(max(1e-300, 1.0 - _f(elo - draw_elo) - _f(-elo - draw_elo)))
+    return total
+
+
+def compute_ratings(names, results, prior=2.0, iterations=200, tolerance=1e-4):
+    """
+    Computes BayesElo ratings (see the module docstring) by maximizing the posterior one parameter at a time
+    with Newton steps, the derivatives being taken numerically
+    @param names: engine names to rate
+    @param results: list of GameResult between those engines
+    @param prior: number of virtual draws of every engine, 0 for plain maximum likelihood
+    @param iterations: most passes over all parameters
+    @param tolerance: the passes stop once no parameter moves more than this many Elo
+    @return ratings, advantage, draw_elo: ratings is a list of (name, elo, error, games, score) tuples sorted best
+                                          first, error being the 95% margin; advantage and draw_elo as fitted
+    """
+    index = {name: i for i, name in enumerate(names)}
+    counts = {}
+    games = [0] * len(names)
+    points = [0.0] * len(names)
+    for result in results:
+        black, white = index[result.black], index[result.white]
+        cell = counts.setdefault((black, white), [0, 0, 0])
+        cell[{1: 0, -1: 1, 2: 2}[result.winner]] += 1
+        for i, name in ((black, result.black), (white, result.white)):
+            games[i] += 1
+            points[i] += result.score(name)
+    # parameters: one rating per engine, then advantage, then draw_elo
+    params = [0.0] * len(names) + [ADVANTAGE, DRAW_ELO]
+    h = 1.0
+
+    def posterior(values):
+        return _log_posterior(values[:len(names)], values[-2], values[-1], counts, prior)
+
+    def newton(i):
+        # first and second derivative of the posterior along parameter i
+        center = posterior(params)
+        params[i] += h
+        up = posterior(params)
+        params[i] -= 2 * h
+        down = posterior(params)
+        params[i] += h
+        return (up - down) / (2 * h), (up - 2 * center + down) / (h * h)
+
+    for _ in range(iterations):
+        largest = 0.0
+        for i in range(len(params)):
+            gradient, curvature = newton(i)
+            if curvature >= 0:
+                continue
+            step = max(-100.0, min(100.0, -gradient / curvature))
+            if i == len(params) - 2:
+                # one-sided colors would push the advantage (and with it draw_elo) to infinity
+                step = max(-MAX_ADVANTAGE, min(MAX_ADVANTAGE, params[i] + step)) - params[i]
+            elif i == len(params) - 1:
+                step = max(0.0, min(MAX_DRAW_ELO, params[i] + step)) - params[i]
+            params[i] += step
+            largest = max(largest, abs(step))
+        # only differences matter, keep the average rating at 0
+        mean = sum(params[:len(names)]) / len(names)
+        for i in range(len(names)):
+            params[i] -= mean
+        if largest < tolerance:
+            break
+    ratings = []
+    for i, name in enumerate(names):
+        curvature = newton(i)[1]
+        error = 1.96 / math.sqrt(-curvature) if curvature < 0 else math.inf
+        ratings.append((name, params[i], error, games[i], points[i] / games[i] if games[i] else 0.0))
+    ratings.sort(key=lambda rating: -rating[1])
+    return ratings, params[-2], params[-1]
+
+
+def main(argv=None):
+    """
+    Runs or resumes a tournament from the command line and prints the ratings
+    @param argv: command line arguments, sys.argv[1:] when None
+    @return ratings: see Tournament.ratings
+    """
+    parser = argparse.ArgumentParser(description="Play a round robin tournament between AIs")
+    parser.add_argument("results", help="JSON lines file of the results, resumed if it exists")
+    parser.add_argument("engines", nargs="+")
+    parser.add_argument("--games", type=int, default=2, help="games per pairing")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--col", type=int, default=8)
+    parser.add_argument("--row", type=int, default=8)
+    parser.add_argument("--p", type=int, default=2)
+    args = parser.parse_args(argv)
+    tournament = Tournament([Engine(engine) for engine in args.engines], args.results, args.games, args.col,
+                            args.row, args.p, args.seed)
+    pending = len(tournament.pending())
+
+    def progress(result):
+        print("%s vs %s: %s" % (result.black, result.white,
+                                "tie" if result.winner == -1 else "player %d wins" % result.winner), flush=True)
+
+    print("%d games to play" % pending, flush=True)
+    tournament.run(args.workers, progress)
+    ratings = tournament.ratings()
+    print("%-40s %7s %7s %6s %6s" % ("engine", "elo", "+/-", "games", "score"))
+    for name, elo, error, games, score in ratings:
+        print("%-40s %7.1f %7.1f %6d %5.1f%%" % (name, elo, error, games, 100 * score))
+    return ratings
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from MatchRunner import Engine, GameResult
+from MatchRunner_unittest import CrashingAI
+from Tournament import Tournament, compute_ratings
+
+ROSTER = [Engine("AI_Extensions.RandomAI", "random"), Engine(CrashingAI, "crash"),
+          Engine("AI_Extensions.RandomAI", "random 2")]
+
+
+def result(black, white, winner):
+    return GameResult(0, black, white, winner, "result", 10, 0.1, 0)
+
+
+class TestTournament(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "results.jsonl")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_all_pairings_are_scheduled(self):
+        jobs = Tournament(ROSTER, self.path, games_per_pairing=2).schedule()
+        pairs = [(job[0].name, job[1].name) for job in jobs]
+        self.assertEqual(pairs, [("random", "crash"), ("crash", "random"), ("random", "random 2"),
+                                 ("random 2", "random"), ("crash", "random 2"), ("random 2", "crash")])
+        self.assertEqual([job[6] for job in jobs], list(range(6)))
+
+    def test_interrupted_run_resumes(self):
+        Tournament(ROSTER[:2], self.path, games_per_pairing=2).run(workers=1)
+        with open(self.path, "a") as fh:
+            fh.write('{"game": 5, "bla')  # a line cut off by a crash
+        tournament = Tournament(ROSTER, self.path, games_per_pairing=2)
+        self.assertEqual(len(tournament.pending()), 4)
+        played = tournament.run(workers=1)
+        self.assertEqual(len(played), 4)
+        self.assertEqual(tournament.pending(), [])
+        self.assertEqual(len(tournament.load_results()), 6)
+        ratings = tournament.ratings()
+        self.assertEqual(ratings[-1][0], "crash")
+        self.assertEqual(ratings[-1][3:], (4, 0.0))
+
+
+class TestRatings(unittest.TestCase):
+
+    def test_order_and_symmetry(self):
+        results = []
+        for _ in range(5):
+            results += [result("a", "b", 1), result("b", "a", 2), result("b", "c", 1), result("c", "b", 2),
+                        result("a", "c", -1), result("c", "a", 2)]
+        ratings, advantage, draw_elo = compute_ratings(["a", "b", "c"], results)
+        self.assertEqual([rating[0] for rating in ratings], ["a", "b", "c"])
+        self.assertAlmostEqual(sum(rating[1] for rating in ratings), 0, places=3)
+        self.assertTrue(all(0 < rating[2] < 1000 for rating in ratings))
+        self.assertGreater(draw_elo, 0)
+
+    def test_even_results_give_even_ratings(self):
+        results = [result("a", "b", 1), result("b", "a", 1)] * 3
+        ratings = compute_ratings(["a", "b"], results)[0]
+        self.assertAlmostEqual(ratings[0][1], 0, places=2)
+        self.assertAlmostEqual(ratings[1][1], 0, places=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
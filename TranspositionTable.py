@@ -0,0 +1,138 @@
+"""
+This module has the TranspositionTable Class, a fixed-size position cache keyed by Zobrist keys.
+
+The table is a preallocated array of buckets with two slots each. The first slot is depth-preferred: it keeps
+the entry that was searched deepest (unless that entry is left over from an older search). The second slot is
+always-replace, so recent positions are still cached when the first slot holds something more valuable.
+Nothing is ever added past the size chosen from the megabyte budget, so memory use stays flat for the whole
+game however long it runs.
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+# bound types
+EXACT = 0
+LOWER = 1  # the real value is >= the stored value (fail high)
+UPPER = 2  # the real value is <= the stored value (fail low)
+
+# rough size of one slot: 7 list pointers plus the key, value and move objects they point to
+ENTRY_BYTES = 128
+BUCKET_SIZE = 2
+
+
+class TranspositionTable:
+    """
+    This class describes a bounded transposition table
+    """
+    def __init__(self, megabytes=16):
+        """
+        Intializes the table, allocating every slot up front
+        @param megabytes: memory budget of the table
+        @return :
+        @raise ValueError: if the budget is not positive
+        """
+        if megabytes <= 0:
+            raise ValueError("megabytes must be positive")
+        self.buckets = max(1, int(megabytes * 2 ** 20) // (ENTRY_BYTES * BUCKET_SIZE))
+        slots = self.buckets * BUCKET_SIZE
+        self.keys = [None] * slots
+        self.moves = [None] * slots
+        self.values = [0.0] * slots
+        self.visits = [0] * slots
+        self.depths = [0] * slots
+        self.bounds = [EXACT] * slots
+        self.ages = [0] * slots
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self):
+        """
+        Marks the start of a new search, entries stored before it lose their depth priority
+        @return :
+        """
+        self.age += 1
+
+    def clear(self):
+        """
+        Empties the table without giving back its memory
+        @return :
+        """
+        for i in range(len(self.keys)):
+            self.keys[i] = None
+            self.moves[i] = None
+        self.probes = self.hits = 0
+
+    def _slot(self, key):
+        """
+        Internal helper. Returns the slot that holds key, or -1
+        @param key: Zobrist key
+        @return : slot index or -1
+        """
+        first = (key % self.buckets) * BUCKET_SIZE
+        if self.keys[first] == key:
+            return first
+        if self.keys[first + 1] == key:
+            return first + 1
+        return -1
+
+    def probe(self, key):
+        """
+        Looks a position up
+        @param key: Zobrist key of the position
+        @return entry: (move, value, visits, depth, bound) or None if the position is not stored
+        """
+        self.probes += 1
+        slot = self._slot(key)
+        if slot < 0:
+            return None
+        self.hits += 1
+        return self.moves[slot], self.values[slot], self.visits[slot], self.depths[slot], self.bounds[slot]
+
+    def store(self, key, move, value, depth=0, bound=EXACT, visits=0):
+        """
+        Stores a position. An entry already holding the key is updated in place, otherwise the depth-preferred
+        slot is taken when the new entry is at least as deep (or the old one is from an older search) and the
+        always-replace slot is used when it is not.
+        @param key: Zobrist key of the position
+        @param move: best move found for the position (callers may store any move object here)
+        @param value: score of the position
+        @param depth: depth the value was searched to
+        @param bound: EXACT, LOWER or UPPER
+        @param visits: number of simulations/visits behind value
+        @return :
+        """
+        slot = self._slot(key)
+        if slot < 0:
+            first = (key % self.buckets) * BUCKET_SIZE
+            if self.keys[first] is None or depth >= self.depths[first] or self.ages[first] != self.age:
+                slot = first
+            else:
+                slot = first + 1
+        elif move is None:
+            # keep the best move of the position when the new result did not produce one
+            move = self.moves[slot]
+        self.keys[slot] = key
+        self.moves[slot] = move
+        self.values[slot] = value
+        self.visits[slot] = visits
+        self.depths[slot] = depth
+        self.bounds[slot] = bound
+        self.ages[slot] = self.age
+
+    def hit_rate(self):
+        """
+        Returns the share of probes that found their position
+        @return : a float between 0 and 1
+        """
+        return self.hits / self.probes if self.probes else 0.0
+
+    def __len__(self):
+        """
+        Counts the stored positions
+        @return : number of slots holding a key
+        """
+        return sum(1 for key in self.keys if key is not None)
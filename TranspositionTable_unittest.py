@@ -0,0 +1,65 @@
+import random
+import unittest
+from Vincent_StudentAI import StudentAI as VincentAI
+from TranspositionTable import TranspositionTable, EXACT, LOWER, UPPER
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = TranspositionTable(megabytes=0.001)
+
+    def colliding_keys(self, count):
+        """Returns keys that all map to the same bucket."""
+        return [i * self.table.buckets + 3 for i in range(1, count + 1)]
+
+    def test_store_and_probe(self):
+        self.table.store(12345, "move", 0.5, depth=3, bound=LOWER, visits=7)
+        self.assertEqual(self.table.probe(12345), ("move", 0.5, 7, 3, LOWER))
+        self.assertIsNone(self.table.probe(54321))
+        self.assertEqual(self.table.hit_rate(), 0.5)
+
+    def test_size_follows_budget(self):
+        self.assertEqual(len(self.table.keys), self.table.buckets * 2)
+        for key in range(10 * self.table.buckets):
+            self.table.store(key, None, 0.0)
+        self.assertEqual(len(self.table.keys), self.table.buckets * 2)
+        self.assertLessEqual(len(self.table), self.table.buckets * 2)
+
+    def test_depth_preferred_slot_keeps_deep_entry(self):
+        deep, shallow, newer = self.colliding_keys(3)
+        self.table.store(deep, "deep", 1.0, depth=8)
+        self.table.store(shallow, "shallow", 1.0, depth=2)
+        self.table.store(newer, "newer", 1.0, depth=1)
+        self.assertIsNotNone(self.table.probe(deep))
+        self.assertIsNone(self.table.probe(shallow))
+        self.assertIsNotNone(self.table.probe(newer))
+
+    def test_old_search_entries_are_replaced(self):
+        deep, other = self.colliding_keys(2)
+        self.table.store(deep, "deep", 1.0, depth=8)
+        self.table.new_search()
+        self.table.store(other, "other", 1.0, depth=1)
+        self.assertEqual(self.table.probe(other)[0], "other")
+        self.assertEqual(self.table.keys[(other % self.table.buckets) * 2], other)
+
+    def test_update_keeps_best_move(self):
+        self.table.store(99, "best", 0.2, depth=2, bound=EXACT)
+        self.table.store(99, None, 0.1, depth=3, bound=UPPER)
+        self.assertEqual(self.table.probe(99), ("best", 0.1, 0, 3, UPPER))
+
+    def test_rollout_cache_stores_results_only(self):
+        random.seed(2)
+        ai = VincentAI(8, 8, 2, tt_megabytes=1)
+        for _ in range(20):
+            ai.simulate_random_game(ai.board, 1)
+        table = ai.move_cache
+        stored = [slot for slot, key in enumerate(table.keys) if key is not None]
+        self.assertGreater(len(stored), 20)
+        self.assertTrue(all(table.moves[slot] is None for slot in stored))
+        self.assertTrue(all(table.values[slot] in (-1, 0, 1, 2) for slot in stored))
+        self.assertGreater(table.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
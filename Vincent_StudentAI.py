@@ -4,6 +4,7 @@ import random
 import time
 from BoardClasses import Board, InvalidMoveError, InvalidParameterError
 from Move import Move
+from TranspositionTable import TranspositionTable
 
 # MCTSNode Class for Monte Carlo Tree Search
 class MCTSNode:
@@ -39,7 +40,7 @@ class MCTSNode:
 
 
 class StudentAI:
-    def __init__(self, col, row, p):
+    def __init__(self, col, row, p, tt_megabytes=32):
         self.col = col
         self.row = row
         self.p = p
@@ -50,19 +51,13 @@ class StudentAI:
         self.current_player = 1
         self.base_time = 480
         self.simulation_time = self.base_time / 60 
-        # Added cache for board moves to speed up simulation
-        self.move_cache = {}
+        # Bounded cache of game results to speed up simulation: an entry's value is game_state's result for the
+        # position, no moves are stored and they are generated again on a hit that is not a finished game
+        self.move_cache = TranspositionTable(tt_megabytes)
 
     def board_signature(self, board):
-        """Generates a unique string signature for the board state."""
-        sig = []
-        for row in board.board:
-            for cell in row:
-                if cell is None:
-                    sig.append("X")
-                else:
-                    sig.append(cell.get_color())
-        return ''.join(sig)
+        """Returns the board's Zobrist key, which covers kings and side to move."""
+        return board.zobrist
 
     def get_move(self, move):
         """Determines the AI's move using MCTS"""
@@ -177,19 +172,24 @@ class StudentAI:
         sim_board = copy.deepcopy(board)
         # Increased simulation length from 10 to 20 moves.
         for _ in range(20):
-            result = sim_board.is_win("B" if current_player == 1 else "W")
-            if result != 0:
-                return 0 if result == -1 else result  # -1 is tie, return 0
+            if sim_board.tie_counter >= sim_board.tie_max:
+                return 0  # tie
+            # Use the cached game state if available, the key covers everything but the tie counter
+            sig = self.board_signature(sim_board)
+            entry = self.move_cache.probe(sig)
+            if entry is not None:
+                result = entry[1]
+                if result != 0:
+                    return result
+                possible_moves_nested = sim_board.get_all_possible_moves(current_player)
+            else:
+                result, possible_moves_nested = sim_board.game_state(self.opponent[current_player])
+                self.move_cache.store(sig, None, result)
+                if result != 0:
+                    return result
             # Early stopping: if AI leads by 3 pieces, assume AI will win
             if self.evaluate_board(sim_board, self.color) >= 3:
                 return self.color
-            # Use cached moves if available
-            sig = self.board_signature(sim_board) + "_" + str(current_player)
-            if sig in self.move_cache:
-                possible_moves_nested = self.move_cache[sig]
-            else:
-                possible_moves_nested = sim_board.get_all_possible_moves(current_player)
-                self.move_cache[sig] = possible_moves_nested
             possible_moves = [move for sublist in possible_moves_nested for move in sublist]
             if not possible_moves:
                 return self.opponent[current_player]  # If no moves, opponent wins
@@ -0,0 +1,62 @@
+"""
+This module has the Zobrist keys used by Board and BitBoard to hash positions.
+
+A position key is the XOR of one random 64-bit number per (square, piece kind) on the board, plus a number for
+white to move and, optionally, one for the tie_counter bucket. Moving a piece only XORs a few numbers in and
+out, so the boards keep the key up to date in make_move/undo instead of rebuilding it.
+The keys are generated from a fixed seed per board size, so every process agrees on them.
+
+We are following the javadoc docstring format which is:
+@param tag describes the input parameters of the function
+@return tag describes what the function returns
+@raise tag describes the errors this function can raise
+"""
+
+import random
+from SharedTable import SharedTable
+
+# piece kind indexes of ZobristKeys.piece[row][col]
+BLACK_MAN = 0
+WHITE_MAN = 1
+BLACK_KING = 2
+WHITE_KING = 3
+TIE_BUCKETS = 64
+
+
+def piece_kind(color, is_king):
+    """
+    Returns the piece kind index of a piece
+    @param color: 'B' or 'W'
+    @param is_king: if the piece is a king
+    @return : one of BLACK_MAN, WHITE_MAN, BLACK_KING, WHITE_KING
+    """
+    return (color == "W") + 2 * bool(is_king)
+
+
+class ZobristKeys(SharedTable):
+    """
+    This class holds the random numbers of one board size
+    """
+    def __init__(self, col, row):
+        """
+        Generates the keys
+        @param col: number of columns in the board
+        @param row: number of rows in the board
+        """
+        self.col = col
+        self.row = row
+        rng = random.Random(col * 1000 + row)
+        self.piece = tuple(tuple(tuple(rng.getrandbits(64) for _ in range(4)) for _ in range(col))
+                           for _ in range(row))
+        self.white_to_move = rng.getrandbits(64)
+        self.tie = tuple(rng.getrandbits(64) for _ in range(TIE_BUCKETS))
+
+
+def get_keys(col, row):
+    """
+    Returns the keys of a board size, generating them the first time the size is seen
+    @param col: number of columns in the board
+    @param row: number of rows in the board
+    @return keys: ZobristKeys object
+    """
+    return ZobristKeys.shared(col, row)